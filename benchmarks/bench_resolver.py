@@ -0,0 +1,132 @@
+"""
+Dependency-resolution benchmark.
+
+Resolves synthetic books of equity and FX positions three ways: from Position
+objects (DependencyResolver.resolve), from NumPy columns (resolve_columns) and
+from a DataFrame (resolve_frame). It reports the wall time and throughput of
+each. Building Position objects for very large books takes several GB, so the
+object path only runs up to --object-limit positions.
+
+Usage:
+    python benchmarks/bench_resolver.py [--sizes 1000000 10000000]
+"""
+
+import argparse
+import json
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from skans.domain.instruments import EquityForward, FXForward
+from skans.domain.portfolio import Position
+from skans.domain.types.enums import Currency
+from skans.market.resolver import DependencyResolver
+
+MATURITY = date(2026, 1, 1)
+CURRENCIES = np.array([c.value for c in Currency], dtype=object)
+
+
+def synthetic_book(
+    n_positions: int, n_underlyings: int, fx_share: float, seed: int
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    is_fx = rng.random(n_positions) < fx_share
+
+    names = np.array([f"EQ{i:05d}" for i in range(n_underlyings)], dtype=object)
+    underlying = names[rng.integers(0, n_underlyings, n_positions)]
+    underlying[is_fx] = None
+
+    pairs = rng.integers(0, len(CURRENCIES), (2, n_positions))
+    base = CURRENCIES[pairs[0]]
+    quote = CURRENCIES[
+        (pairs[0] + 1 + pairs[1] % (len(CURRENCIES) - 1)) % len(CURRENCIES)
+    ]
+    base[~is_fx] = None
+    quote[~is_fx] = None
+    return pd.DataFrame(
+        {"underlying_id": underlying, "base_currency": base, "quote_currency": quote}
+    )
+
+
+def to_positions(frame: pd.DataFrame) -> List[Position]:
+    positions = []
+    rows = zip(
+        frame["underlying_id"].tolist(),
+        frame["base_currency"].tolist(),
+        frame["quote_currency"].tolist(),
+    )
+    for i, (underlying, base, quote) in enumerate(rows):
+        inst = (
+            EquityForward(underlying, 100.0, MATURITY, Currency.USD)
+            if isinstance(underlying, str)
+            else FXForward(Currency(base), Currency(quote), 18.0, MATURITY)
+        )
+        positions.append(Position(f"P{i}", inst))
+    return positions
+
+
+def timed(n: int, fn: Callable[[], object]) -> Dict[str, float]:
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "positions_per_second": n / seconds}
+
+
+def run_size(
+    n: int, n_underlyings: int, fx_share: float, object_limit: int, seed: int
+) -> Dict[str, Dict[str, float]]:
+    frame = synthetic_book(n, n_underlyings, fx_share, seed)
+    resolver = DependencyResolver()
+    results: Dict[str, Dict[str, float]] = {}
+
+    if n <= object_limit:
+        positions = to_positions(frame)
+        results["positions"] = timed(n, lambda: resolver.resolve(positions))
+        del positions
+
+    is_equity = frame["underlying_id"].notna().to_numpy()
+    underlying = frame["underlying_id"].to_numpy()[is_equity]
+    base = frame["base_currency"].to_numpy()[~is_equity]
+    quote = frame["quote_currency"].to_numpy()[~is_equity]
+    results["columns"] = timed(
+        n, lambda: resolver.resolve_columns(underlying, base, quote)
+    )
+    results["frame"] = timed(n, lambda: resolver.resolve_frame(frame))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--underlyings", type=int, default=5_000)
+    parser.add_argument("--fx-share", type=float, default=0.3)
+    parser.add_argument("--object-limit", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--json", action="store_true", help="Emit JSON only.")
+    args = parser.parse_args()
+
+    results = {
+        str(n): run_size(
+            n, args.underlyings, args.fx_share, args.object_limit, args.seed
+        )
+        for n in args.sizes
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'positions':>12}{'path':>12}{'seconds':>10}{'M pos/s':>10}")
+    for n, by_path in results.items():
+        for path, r in by_path.items():
+            print(
+                f"{int(n):>12,}{path:>12}{r['seconds']:>10.3f}"
+                f"{r['positions_per_second'] / 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""
+Benchmark suite for the hot paths of the risk engine.
+
+Runs reproducible, seeded scenarios over the SDE kernels, the random number
+generators, dependency resolution, portfolio and trade table indexing, and
+MarketEnvironment construction. Every case runs in a fresh process, so its
+peak RSS is its own. Each case records the best wall time over --repeat runs,
+the peak RSS and the throughput. Results are written as JSON. When a stored
+baseline is given, slower or larger cases are flagged and the exit status is
+non-zero.
+
+Usage:
+    python benchmarks/bench_suite.py --preset nightly --output results.json
+    python benchmarks/bench_suite.py --preset nightly --baseline results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from skans.core.rng import GeneratorRng, SimpleRng
+from skans.core.sde import (
+    correlated_geometric_brownian_motion,
+    geometric_brownian_motion,
+)
+from skans.domain.instruments import EquityForward, FXForward
+from skans.domain.portfolio import Portfolio, Position, Trade
+from skans.domain.table import TradeTable
+from skans.domain.types.enums import Currency, LongShort
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+from skans.market.resolver import DependencyResolver
+
+MATURITY = date(2026, 1, 1)
+CURRENCIES = [c for c in Currency]
+
+# run() is timed; setup work is not. n_items / seconds is the throughput.
+Setup = Callable[..., Tuple[Callable[[], object], int]]
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark at one scale."""
+
+    benchmark: str
+    unit: str
+    sizes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        sizes = ",".join(f"{name}={value}" for name, value in self.sizes.items())
+        return f"{self.benchmark}[{sizes}]"
+
+
+def _gbm(seed: int, paths: int, steps: int) -> Tuple[Callable[[], object], int]:
+    def run() -> object:
+        rng = GeneratorRng(seed=seed)
+        return geometric_brownian_motion(100.0, 0.05, 0.2, 1.0, steps, paths, rng=rng)
+
+    return run, paths * steps
+
+
+def _correlated_gbm(
+    seed: int, paths: int, factors: int, steps: int
+) -> Tuple[Callable[[], object], int]:
+    generator = np.random.default_rng(seed)
+    loadings = generator.standard_normal((factors, 3))
+    covariance = loadings @ loadings.T + np.eye(factors)
+    scale = np.sqrt(np.diag(covariance))
+    correlation = covariance / np.outer(scale, scale)
+    S0, mu, sigma = np.full(factors, 100.0), np.zeros(factors), np.full(factors, 0.2)
+
+    def run() -> object:
+        return correlated_geometric_brownian_motion(
+            S0, mu, sigma, correlation, 1.0, steps, paths, rng=GeneratorRng(seed=seed)
+        )
+
+    return run, paths * steps * factors
+
+
+def _simple_rng(seed: int, paths: int, steps: int) -> Tuple[Callable[[], object], int]:
+    np.random.seed(seed)
+    rng = SimpleRng()
+    return (lambda: rng.generate(paths, steps)), paths * steps
+
+
+def _generator_rng(
+    seed: int, paths: int, steps: int
+) -> Tuple[Callable[[], object], int]:
+    rng = GeneratorRng(seed=seed)
+    return (lambda: rng.generate(paths, steps)), paths * steps
+
+
+def _positions(seed: int, n: int, underlyings: int = 5_000) -> List[Position]:
+    generator = np.random.default_rng(seed)
+    is_fx = generator.random(n) < 0.3
+    names = generator.integers(0, underlyings, n).tolist()
+    pairs = generator.integers(0, len(CURRENCIES), (2, n)).tolist()
+
+    positions = []
+    for i in range(n):
+        if is_fx[i]:
+            base = CURRENCIES[pairs[0][i]]
+            offset = 1 + pairs[1][i] % (len(CURRENCIES) - 1)
+            quote = CURRENCIES[(pairs[0][i] + offset) % len(CURRENCIES)]
+            inst: EquityForward | FXForward = FXForward(base, quote, 18.0, MATURITY)
+        else:
+            inst = EquityForward(f"EQ{names[i]:05d}", 100.0, MATURITY, Currency.USD)
+        positions.append(Position(f"P{i}", inst))
+    return positions
+
+
+def _resolve(seed: int, positions: int) -> Tuple[Callable[[], object], int]:
+    book = _positions(seed, positions)
+    return (lambda: DependencyResolver().resolve(book)), positions
+
+
+def _resolve_columns(seed: int, positions: int) -> Tuple[Callable[[], object], int]:
+    generator = np.random.default_rng(seed)
+    n_fx = positions * 3 // 10
+    names = np.array([f"EQ{i:05d}" for i in range(5_000)], dtype=object)
+    codes = np.array([c.value for c in CURRENCIES], dtype=object)
+    underlying = names[generator.integers(0, len(names), positions - n_fx)]
+    pairs = generator.integers(0, len(codes), (2, n_fx))
+    base = codes[pairs[0]]
+    quote = codes[(pairs[0] + 1 + pairs[1] % (len(codes) - 1)) % len(codes)]
+
+    def run() -> object:
+        return DependencyResolver().resolve_columns(underlying, base, quote)
+
+    return run, positions
+
+
+def _trades(seed: int, n: int) -> Tuple[Trade, ...]:
+    generator = np.random.default_rng(seed)
+    positions = generator.integers(0, max(1, n // 4), n).tolist()
+    counterparties = generator.integers(0, max(1, n // 100), n).tolist()
+    directions = (LongShort.LONG, LongShort.SHORT)
+    return tuple(
+        Trade(f"T{i}", f"P{p}", f"CP{c}", 100.0, directions[i % 2])
+        for i, (p, c) in enumerate(zip(positions, counterparties))
+    )
+
+
+def _lookup_ids(seed: int, trades: int, lookups: int) -> List[str]:
+    rows = np.random.default_rng(seed + 1).integers(0, trades, lookups)
+    return [f"T{row}" for row in rows.tolist()]
+
+
+def _portfolio_index(seed: int, trades: int) -> Tuple[Callable[[], object], int]:
+    book = _trades(seed, trades)
+
+    def run() -> object:
+        portfolio = Portfolio("BENCH", book)
+        portfolio.get_trade(book[0].trade_id)
+        portfolio.counterparty_rows(book[0].counterparty_id)
+        return portfolio.position_rows(book[0].position_id)
+
+    return run, trades
+
+
+def _portfolio_get_trade(
+    seed: int, trades: int, lookups: int
+) -> Tuple[Callable[[], object], int]:
+    portfolio = Portfolio("BENCH", _trades(seed, trades))
+    portfolio.get_trade("T0")
+    ids = _lookup_ids(seed, trades, lookups)
+    return (lambda: [portfolio.get_trade(trade_id) for trade_id in ids]), lookups
+
+
+def _table_columns(
+    seed: int, trades: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    generator = np.random.default_rng(seed)
+    trade_id = np.char.add("T", np.arange(trades).astype(str))
+    position_id = np.char.add(
+        "P", generator.integers(0, max(1, trades // 4), trades).astype(str)
+    )
+    counterparty_id = np.char.add(
+        "CP", generator.integers(0, max(1, trades // 100), trades).astype(str)
+    )
+    direction = np.where(np.arange(trades) % 2 == 0, 1, -1).astype(np.int8)
+    return trade_id, position_id, counterparty_id, np.full(trades, 100.0), direction
+
+
+def _table_index(seed: int, trades: int) -> Tuple[Callable[[], object], int]:
+    columns = _table_columns(seed, trades)
+
+    def run() -> object:
+        table = TradeTable.from_columns(*columns)
+        table.get_trade(str(columns[0][0]))
+        table.counterparty_rows(str(columns[2][0]))
+        return table.position_rows(str(columns[1][0]))
+
+    return run, trades
+
+
+def _table_get_trade(
+    seed: int, trades: int, lookups: int
+) -> Tuple[Callable[[], object], int]:
+    table = TradeTable.from_columns(*_table_columns(seed, trades))
+    table.get_trade("T0")
+    ids = _lookup_ids(seed, trades, lookups)
+    return (lambda: [table.get_trade(trade_id) for trade_id in ids]), lookups
+
+
+def _environment(
+    seed: int, paths: int, factors: int, steps: int, fingerprint: bool
+) -> Tuple[Callable[[], object], int]:
+    schema = RiskFactorSchema({f"F{i}": i for i in range(factors)})
+    tensor = np.random.default_rng(seed).standard_normal((paths, steps + 1, factors))
+
+    def run() -> object:
+        env = MarketEnvironment(schema=schema, state_tensor=tensor, dt=1.0 / steps)
+        return env.fingerprint if fingerprint else env
+
+    return run, int(tensor.size)
+
+
+SETUPS: Dict[str, Setup] = {
+    "sde.gbm": _gbm,
+    "sde.correlated_gbm": _correlated_gbm,
+    "rng.simple": _simple_rng,
+    "rng.generator": _generator_rng,
+    "resolver.resolve": _resolve,
+    "resolver.resolve_columns": _resolve_columns,
+    "portfolio.index_build": _portfolio_index,
+    "portfolio.get_trade": _portfolio_get_trade,
+    "table.index_build": _table_index,
+    "table.get_trade": _table_get_trade,
+    "environment.construct": lambda seed, **sizes: _environment(
+        seed, fingerprint=False, **sizes
+    ),
+    "environment.fingerprint": lambda seed, **sizes: _environment(
+        seed, fingerprint=True, **sizes
+    ),
+}
+
+
+def _cases(benchmark: str, unit: str, *sizes: Dict[str, int]) -> List[Case]:
+    return [Case(benchmark, unit, s) for s in sizes]
+
+
+# Object-based cases stop at 1M rows: 10M Trade or Position objects alone
+# need several GB. The columnar paths cover 10M.
+PRESETS: Dict[str, List[Case]] = {
+    "smoke": [
+        *_cases("sde.gbm", "points", {"paths": 1_000, "steps": 12}),
+        *_cases(
+            "sde.correlated_gbm", "points", {"paths": 1_000, "factors": 5, "steps": 4}
+        ),
+        *_cases("rng.simple", "normals", {"paths": 1_000, "steps": 12}),
+        *_cases("rng.generator", "normals", {"paths": 1_000, "steps": 12}),
+        *_cases("resolver.resolve", "positions", {"positions": 1_000}),
+        *_cases("resolver.resolve_columns", "positions", {"positions": 1_000}),
+        *_cases("portfolio.index_build", "trades", {"trades": 1_000}),
+        *_cases("portfolio.get_trade", "lookups", {"trades": 1_000, "lookups": 1_000}),
+        *_cases("table.index_build", "trades", {"trades": 1_000}),
+        *_cases("table.get_trade", "lookups", {"trades": 1_000, "lookups": 1_000}),
+        *_cases(
+            "environment.construct",
+            "points",
+            {"paths": 1_000, "factors": 2, "steps": 4},
+        ),
+        *_cases(
+            "environment.fingerprint",
+            "points",
+            {"paths": 1_000, "factors": 2, "steps": 4},
+        ),
+    ],
+    "nightly": [
+        *_cases(
+            "sde.gbm",
+            "points",
+            {"paths": 10_000, "steps": 52},
+            {"paths": 100_000, "steps": 52},
+            {"paths": 1_000_000, "steps": 52},
+        ),
+        *_cases(
+            "sde.correlated_gbm",
+            "points",
+            {"paths": 100_000, "factors": 1, "steps": 52},
+            {"paths": 100_000, "factors": 50, "steps": 12},
+            {"paths": 10_000, "factors": 500, "steps": 12},
+        ),
+        *_cases(
+            "rng.simple",
+            "normals",
+            {"paths": 10_000, "steps": 52},
+            {"paths": 1_000_000, "steps": 52},
+        ),
+        *_cases("rng.generator", "normals", {"paths": 1_000_000, "steps": 52}),
+        *_cases(
+            "resolver.resolve",
+            "positions",
+            {"positions": 10_000},
+            {"positions": 1_000_000},
+        ),
+        *_cases("resolver.resolve_columns", "positions", {"positions": 10_000_000}),
+        *_cases(
+            "portfolio.index_build", "trades", {"trades": 10_000}, {"trades": 1_000_000}
+        ),
+        *_cases(
+            "portfolio.get_trade",
+            "lookups",
+            {"trades": 10_000, "lookups": 100_000},
+            {"trades": 1_000_000, "lookups": 100_000},
+        ),
+        *_cases("table.index_build", "trades", {"trades": 10_000_000}),
+        *_cases(
+            "table.get_trade", "lookups", {"trades": 10_000_000, "lookups": 100_000}
+        ),
+        *_cases(
+            "environment.construct",
+            "points",
+            {"paths": 100_000, "factors": 50, "steps": 12},
+        ),
+        *_cases(
+            "environment.fingerprint",
+            "points",
+            {"paths": 100_000, "factors": 50, "steps": 12},
+        ),
+    ],
+}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_case(case: Case, repeat: int, seed: int) -> Dict[str, float]:
+    run, n_items = SETUPS[case.benchmark](seed, **case.sizes)
+
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+
+    best = min(seconds)
+    return {
+        "seconds": best,
+        "throughput": n_items / best,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(case: Case, repeat: int, seed: int) -> Dict[str, float]:
+    """Runs one case in a fresh process so its peak RSS is its own."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, case, repeat, seed).result()
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    time_tolerance: float,
+    rss_tolerance: float,
+) -> Dict[str, List[str]]:
+    """Returns {case key: [regression messages]} for cases slower or larger
+    than the baseline by more than the tolerances."""
+    regressions: Dict[str, List[str]] = {}
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        messages = []
+        time_ratio = current["seconds"] / previous["seconds"]
+        if time_ratio > 1.0 + time_tolerance:
+            messages.append(f"wall time x{time_ratio:.2f}")
+        rss_ratio = current["peak_rss_mb"] / previous["peak_rss_mb"]
+        if rss_ratio > 1.0 + rss_tolerance:
+            messages.append(f"peak RSS x{rss_ratio:.2f}")
+        if messages:
+            regressions[key] = messages
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="smoke")
+    parser.add_argument(
+        "--filter", default="", help="Only run cases whose key contains this."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--output", help="Write the results JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against a stored results file.")
+    parser.add_argument("--time-tolerance", type=float, default=0.2)
+    parser.add_argument("--rss-tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run cases in this process (faster; peak RSS becomes cumulative).",
+    )
+    parser.add_argument("--json", action="store_true", help="Emit JSON only.")
+    args = parser.parse_args()
+
+    runner = run_case if args.in_process else run_isolated
+    results: Dict[str, Dict[str, Any]] = {
+        case.key: {"unit": case.unit, **runner(case, args.repeat, args.seed)}
+        for case in PRESETS[args.preset]
+        if args.filter in case.key
+    }
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "preset": args.preset,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    regressions: Dict[str, List[str]] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(
+            results, baseline, args.time_tolerance, args.rss_tolerance
+        )
+
+    if args.json:
+        print(json.dumps({**report, "regressions": regressions}, indent=2))
+    else:
+        print(f"{'case':<64}{'seconds':>10}{'M items/s':>11}{'RSS MB':>9}")
+        for key, r in results.items():
+            flag = "  << " + ", ".join(regressions[key]) if key in regressions else ""
+            print(
+                f"{key:<64}{r['seconds']:>10.4f}{r['throughput'] / 1e6:>11.2f}"
+                f"{r['peak_rss_mb']:>9.0f}{flag}"
+            )
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Allows `python -m skans` as an alternative to the `skans` console script."""
+
+import sys
+
+from skans.cli import main
+
+sys.exit(main())
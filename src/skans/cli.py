@@ -0,0 +1,455 @@
+"""
+Command-line runner for batch exposure runs.
+
+    skans run --positions positions.csv --trades trades.csv \\
+        --netting-sets netting_sets.csv --config model.json --output ee.csv
+
+Positions, trades and netting sets are CSV or Parquet files in the layouts
+read by skans.io.loaders. The model config is a JSON object:
+
+    {
+        "valuation_date": "2025-01-01",
+        "horizon": 1.0,
+        "rates": {"USD": 0.02},
+        "volatilities": {"AAPL": 0.25},
+        "dividend_yields": {"AAPL": 0.01},
+        "factors": {"AAPL": {"spot": 180.0, "drift": 0.02, "volatility": 0.25}},
+        "correlations": [["AAPL", "MSFT", 0.6]],
+        "quantiles": [0.95, 0.99],
+        "epe_horizon": 1.0
+    }
+
+The run resolves the risk factors, then simulates, prices and nets the paths
+chunk by chunk through an ExposurePipeline and writes one row per netting set
+and time point. Only the standard library is imported at module level, so
+`skans --help` and argument errors return before NumPy, pandas or SciPy load.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, Mapping, Sequence, Tuple
+
+from skans import __version__
+
+if TYPE_CHECKING:
+    from skans.core.instrumentation import StageRecord
+    from skans.exposure.engine import ExposureProfiles
+
+OUTPUT_FORMATS = (".csv", ".parquet", ".pq")
+
+
+@dataclass(frozen=True)
+class FactorModel:
+    """
+    GBM dynamics of one simulated risk factor.
+
+    Attributes:
+        spot: Level at the valuation date.
+        drift: Annualised drift.
+        volatility: Annualised volatility.
+    """
+
+    spot: float
+    drift: float
+    volatility: float
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """
+    Market model and reporting settings of a run, read from the JSON config.
+
+    Attributes:
+        valuation_date: The calendar date of t = 0.
+        horizon: Simulation horizon in years for a uniform time grid.
+        rates: Continuously compounded rate per currency code.
+        volatilities: Pricing volatility per risk factor.
+        dividend_yields: Dividend yield per equity underlying.
+        factors: Simulation dynamics per risk factor.
+        correlations: (factor, factor, correlation) entries; unlisted pairs
+            are uncorrelated.
+        quantiles: PFE confidence levels.
+        epe_horizon: Averaging horizon in years for EPE and EEPE; None
+            averages over the whole grid.
+        reporting_currency: Currency code every position is converted into
+            before netting. None requires each netting set to hold positions
+            of a single pricing currency.
+    """
+
+    valuation_date: date
+    horizon: float
+    rates: Dict[str, float]
+    factors: Dict[str, FactorModel]
+    volatilities: Dict[str, float] = field(default_factory=dict)
+    dividend_yields: Dict[str, float] = field(default_factory=dict)
+    correlations: Tuple[Tuple[str, str, float], ...] = ()
+    quantiles: Tuple[float, ...] = (0.95,)
+    epe_horizon: float | None = 1.0
+    reporting_currency: str | None = None
+
+    @classmethod
+    def from_dict(cls, config: Mapping[str, Any]) -> "ModelConfig":
+        """
+        Raises:
+            ValueError: If a required key is missing or a value is malformed.
+        """
+        try:
+            factors = {
+                name: FactorModel(
+                    float(spec["spot"]),
+                    float(spec["drift"]),
+                    float(spec["volatility"]),
+                )
+                for name, spec in config["factors"].items()
+            }
+            return cls(
+                valuation_date=date.fromisoformat(config["valuation_date"]),
+                horizon=float(config.get("horizon", 1.0)),
+                rates={ccy: float(r) for ccy, r in config["rates"].items()},
+                factors=factors,
+                volatilities={
+                    k: float(v) for k, v in config.get("volatilities", {}).items()
+                },
+                dividend_yields={
+                    k: float(v) for k, v in config.get("dividend_yields", {}).items()
+                },
+                correlations=tuple(
+                    (str(a), str(b), float(rho))
+                    for a, b, rho in config.get("correlations", [])
+                ),
+                quantiles=tuple(float(q) for q in config.get("quantiles", [0.95])),
+                epe_horizon=(
+                    None
+                    if config.get("epe_horizon", 1.0) is None
+                    else float(config.get("epe_horizon", 1.0))
+                ),
+                reporting_currency=(
+                    None
+                    if config.get("reporting_currency") is None
+                    else str(config["reporting_currency"])
+                ),
+            )
+        except KeyError as exc:
+            raise ValueError(f"Model config is missing {exc}.")
+        except (AttributeError, TypeError, ValueError) as exc:
+            raise ValueError(f"Malformed model config: {exc}")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ModelConfig":
+        """
+        Reads a JSON model config.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not valid JSON or not a valid config.
+        """
+        with open(path) as file:
+            try:
+                config = json.load(file)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path} is not valid JSON: {exc}")
+        if not isinstance(config, dict):
+            raise ValueError(f"{path} must hold a JSON object.")
+        return cls.from_dict(config)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="skans", description="Skans Risk Engine batch runner."
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser(
+        "run",
+        help="Run an end-to-end exposure simulation.",
+        description="Resolve, simulate, value and aggregate a portfolio, and "
+        "write the EE, EEE and PFE profiles per netting set.",
+    )
+    run.add_argument("--positions", required=True, help="Position file.")
+    run.add_argument("--trades", required=True, help="Trade file.")
+    run.add_argument("--netting-sets", required=True, help="Netting set file.")
+    run.add_argument("--config", required=True, help="JSON model config.")
+    run.add_argument("--output", required=True, help="Profile file (.csv or .parquet).")
+    run.add_argument("--paths", type=int, default=10_000, help="Simulated paths.")
+    run.add_argument(
+        "--steps", type=int, default=52, help="Steps of the uniform time grid."
+    )
+    run.add_argument(
+        "--grid",
+        choices=("uniform", "maturity"),
+        default="uniform",
+        help="Uniform steps to the config horizon, or a grid through every "
+        "position maturity (ignores --steps).",
+    )
+    run.add_argument(
+        "--chunk-size", type=int, default=4096, help="Paths per pipeline chunk."
+    )
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Simulation worker processes; results do not depend on it.",
+    )
+    run.add_argument("--dtype", choices=("float64", "float32"), default="float64")
+    run.add_argument("--seed", type=int, default=None, help="Random seed.")
+    run.add_argument(
+        "--spill-dir",
+        default=None,
+        help="Keep the per-path exposures needed for PFE in a temporary file "
+        "here instead of in memory.",
+    )
+    run.add_argument(
+        "--stages", default=None, help="Write stage timings as JSON lines here."
+    )
+    run.add_argument(
+        "--verbose", action="store_true", help="Report progress on stderr."
+    )
+    return parser
+
+
+def _check_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    for name in ("paths", "steps", "chunk_size", "workers"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be positive.")
+    suffix = Path(args.output).suffix
+    if suffix not in OUTPUT_FORMATS:
+        parser.error(f"--output must end in one of {', '.join(OUTPUT_FORMATS)}.")
+    # Fail before the run, not after it, when the Parquet writer is missing
+    if suffix != ".csv" and importlib.util.find_spec("pyarrow") is None:
+        parser.error(
+            "Parquet output needs pyarrow; install it with "
+            "`pip install skans[parquet]`."
+        )
+
+
+def _profile_frames(profiles: "ExposureProfiles") -> Any:
+    """Yields one long-format DataFrame per netting set"""
+    import pandas as pd
+
+    for row, netting_set_id in enumerate(profiles.netting_set_ids):
+        frame = pd.DataFrame(
+            {
+                "netting_set_id": netting_set_id,
+                "time": profiles.times,
+                "ee": profiles.ee[row],
+                "eee": profiles.eee[row],
+            }
+        )
+        for index, quantile in enumerate(profiles.quantiles):
+            frame[f"pfe_{quantile:g}"] = profiles.pfe[index, row]
+        frame["epe"] = profiles.epe[row]
+        frame["eepe"] = profiles.eepe[row]
+        yield frame
+
+
+def write_profiles(profiles: "ExposureProfiles", path: str | Path) -> None:
+    """
+    Writes the profiles in long format, one row per netting set and time
+    point, netting set by netting set.
+
+    Raises:
+        ImportError: If Parquet output is asked for and pyarrow is missing.
+        ValueError: If the file extension is not recognised.
+    """
+    path = Path(path)
+    if path.suffix == ".csv":
+        with open(path, "w", newline="") as file:
+            for block, frame in enumerate(_profile_frames(profiles)):
+                frame.to_csv(file, header=block == 0, index=False)
+        return
+
+    if path.suffix in (".parquet", ".pq"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in _profile_frames(profiles):
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    raise ValueError(f"Unsupported output format '{path.suffix}' for {path}.")
+
+
+class _StageLog:
+    """Appends each StageRecord to a JSON lines file as soon as it completes"""
+
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+        self._lock = threading.Lock()
+
+    def __call__(self, record: "StageRecord") -> None:
+        line = json.dumps(record.to_dict()) + "\n"
+        with self._lock:
+            self.file.write(line)
+            self.file.flush()
+
+
+def _report(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    Executes `skans run` for parsed arguments.
+
+    Raises:
+        KeyError: If a column, risk factor, rate or reference is missing.
+        ValueError: If an input file or the model config is invalid.
+        OSError: If a file cannot be read or written.
+    """
+    config = ModelConfig.load(args.config)
+
+    # The numerical stack is only imported once there is work to do
+    import numpy as np
+
+    from skans.core.instrumentation import Instrumentation
+    from skans.core.rng import GeneratorRng
+    from skans.domain.types.enums import Currency
+    from skans.exposure.engine import ExposureEngine
+    from skans.io.loaders import (
+        compile_positions,
+        load_netting_sets,
+        load_trades,
+        read_table,
+    )
+    from skans.market.generator import GBMParameters, MarketGenerator
+    from skans.market.grid import maturity_grid
+    from skans.market.parallel import ParallelMarketGenerator
+    from skans.market.resolver import DependencyResolver
+    from skans.pipeline.runner import ExposurePipeline
+    from skans.valuation.engine import ValuationEngine, ValuationParameters
+
+    stage_file = open(args.stages, "w") if args.stages else None
+    try:
+        instrumentation = (
+            contextlib.nullcontext()
+            if stage_file is None
+            else Instrumentation(callbacks=[_StageLog(stage_file)])
+        )
+        with instrumentation:
+            frame = read_table(args.positions)
+            schema = DependencyResolver().resolve_frame(frame)
+            book = compile_positions(frame, schema, config.valuation_date)
+            trades = load_trades(args.trades, lazy=True)
+            netting_sets = load_netting_sets(args.netting_sets)
+            if args.verbose:
+                _report(
+                    f"Loaded {len(book.position_ids)} positions, {len(trades)} "
+                    f"trades and {len(netting_sets)} netting sets on "
+                    f"{len(schema.factor_indices)} risk factors."
+                )
+
+            correlation = np.eye(len(schema.factor_indices))
+            for a, b, rho in config.correlations:
+                for factor in (a, b):
+                    if factor not in schema.factor_indices:
+                        raise KeyError(f"Correlated factor '{factor}' is not used.")
+                i, j = schema.factor_indices[a], schema.factor_indices[b]
+                correlation[i, j] = correlation[j, i] = rho
+            params = GBMParameters.from_schema(
+                schema,
+                S0={name: f.spot for name, f in config.factors.items()},
+                mu={name: f.drift for name, f in config.factors.items()},
+                sigma={name: f.volatility for name, f in config.factors.items()},
+                correlation=correlation,
+            )
+
+            if args.grid == "maturity":
+                times = maturity_grid(book, config.valuation_date)
+                T, n_steps = float(times[-1]), len(times) - 1
+            else:
+                times, T, n_steps = None, config.horizon, args.steps
+
+            valuation = ValuationEngine(
+                ValuationParameters(
+                    config.valuation_date,
+                    rates={Currency(ccy): rate for ccy, rate in config.rates.items()},
+                    volatilities=config.volatilities,
+                    dividend_yields=config.dividend_yields,
+                )
+            )
+            exposure = ExposureEngine(config.quantiles, config.epe_horizon)
+            reporting_currency = (
+                None
+                if config.reporting_currency is None
+                else Currency(config.reporting_currency)
+            )
+            rng = GeneratorRng(seed=args.seed)
+            dtype = np.dtype(args.dtype)
+            if args.workers > 1:
+                # Shards follow the chunk so every worker has a share of it;
+                # without variance reduction the paths do not depend on it
+                generator: MarketGenerator = ParallelMarketGenerator(
+                    rng,
+                    dtype=dtype,
+                    n_workers=args.workers,
+                    shard_size=-(-args.chunk_size // args.workers),
+                )
+            else:
+                generator = MarketGenerator(rng, dtype=dtype)
+
+            def progress(done: int, total: int) -> None:
+                _report(f"Netted {done}/{total} paths.")
+
+            try:
+                profiles = ExposurePipeline(
+                    generator,
+                    valuation,
+                    exposure,
+                    args.chunk_size,
+                    spill_dir=args.spill_dir,
+                    reporting_currency=reporting_currency,
+                ).run(
+                    book,
+                    trades,
+                    netting_sets,
+                    schema,
+                    params,
+                    T,
+                    n_steps,
+                    args.paths,
+                    times=times,
+                    progress=progress if args.verbose else None,
+                )
+            finally:
+                if isinstance(generator, ParallelMarketGenerator):
+                    generator.close()
+
+        write_profiles(profiles, args.output)
+        if args.verbose:
+            _report(f"Wrote {len(profiles.netting_set_ids)} profiles to {args.output}.")
+    finally:
+        if stage_file is not None:
+            stage_file.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Entry point of the `skans` console script; returns the exit status.
+    Input and model errors are reported on stderr with status 1.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    _check_arguments(parser, args)
+    try:
+        run(args)
+    except (KeyError, ValueError, OSError, ImportError) as exc:
+        message = exc.args[0] if isinstance(exc, KeyError) and exc.args else exc
+        print(f"skans: error: {message}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,273 @@
+"""
+Stage-level instrumentation for the risk pipeline.
+
+The engines wrap their work in `with stage("simulate") as probe:` blocks and
+report the arrays they produce through `probe.array(...)`. While no
+Instrumentation is active, stage() returns a shared no-op probe, so the hooks
+cost one global lookup per call. Activating an Instrumentation records, per
+stage, the wall time, the CPU time of the calling thread, the array shapes
+and sizes, and, with trace_memory=True, the peak bytes allocated
+(tracemalloc) by stages that ran on their own. Records can be read as
+dicts, summarised per stage, streamed to callbacks as they complete or
+written as JSON lines.
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from types import TracebackType
+from typing import IO, Any, Callable, Dict, List, Tuple, Type
+import numpy as np
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    """
+    Measurements of one completed stage.
+
+    Attributes:
+        stage: Stage name, e.g. "resolve", "simulate", "value", "aggregate".
+        wall_seconds: Elapsed wall-clock time.
+        cpu_seconds: CPU time of the thread that ran the stage.
+        peak_allocated_bytes: Peak traced allocation above the level at stage
+            entry; None unless memory tracing is on. tracemalloc keeps a
+            single process-wide peak, so it is also None for a stage that
+            overlapped another (e.g. in concurrent ExposurePipeline stages).
+        shapes: Shapes of the arrays reported by the stage.
+        nbytes: Sizes in bytes of the arrays reported by the stage.
+        thread: Name of the thread that ran the stage.
+    """
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_allocated_bytes: int | None
+    shapes: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    nbytes: Dict[str, int] = field(default_factory=dict)
+    thread: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record["shapes"] = {name: list(s) for name, s in self.shapes.items()}
+        return record
+
+
+class StageProbe:
+    """
+    The context manager returned by stage(). This base class, handed out while
+    instrumentation is off, ignores everything reported to it.
+    """
+
+    def __enter__(self) -> "StageProbe":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    def array(self, name: str, value: np.ndarray) -> None:
+        """Reports an array produced or consumed by the stage"""
+        return None
+
+    def shape(self, name: str, shape: Tuple[int, ...], nbytes: int = 0) -> None:
+        """Reports the shape (and optional size) of any stage input or output"""
+        return None
+
+
+_NULL_PROBE = StageProbe()
+
+
+class _TimedProbe(StageProbe):
+    """Times one stage and collects the arrays reported to it"""
+
+    def __init__(self, instrumentation: "Instrumentation", name: str) -> None:
+        self.instrumentation = instrumentation
+        self.name = name
+        self.shapes: Dict[str, Tuple[int, ...]] = {}
+        self.nbytes: Dict[str, int] = {}
+        self.overlapped = False
+        self._traced_at_entry = 0
+
+    def __enter__(self) -> "_TimedProbe":
+        if self.instrumentation.trace_memory and tracemalloc.is_tracing():
+            self.instrumentation._open_traced(self)
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak = None
+        if self.instrumentation.trace_memory and tracemalloc.is_tracing():
+            peak = self.instrumentation._close_traced(self)
+
+        self.instrumentation._record(
+            StageRecord(
+                stage=self.name,
+                wall_seconds=wall,
+                cpu_seconds=cpu,
+                peak_allocated_bytes=peak,
+                shapes=self.shapes,
+                nbytes=self.nbytes,
+                thread=threading.current_thread().name,
+            )
+        )
+
+    def array(self, name: str, value: np.ndarray) -> None:
+        self.shape(name, value.shape, value.nbytes)
+
+    def shape(self, name: str, shape: Tuple[int, ...], nbytes: int = 0) -> None:
+        self.shapes[name] = tuple(int(n) for n in shape)
+        self.nbytes[name] = int(nbytes)
+
+
+# The instrumentation receiving stage records; None when disabled
+_ACTIVE: "Instrumentation | None" = None
+
+
+def stage(name: str) -> StageProbe:
+    """
+    Returns a context manager measuring the named stage.
+
+    Near free while no Instrumentation is active: a shared no-op probe is
+    returned and nothing is timed or allocated.
+    """
+    if _ACTIVE is None:
+        return _NULL_PROBE
+    return _TimedProbe(_ACTIVE, name)
+
+
+class Instrumentation:
+    """
+    Collects StageRecords from every stage run while it is active.
+
+    Activate it as a context manager. It is process wide, so stages in
+    worker threads (e.g. ExposurePipeline) are recorded too; stages in
+    other processes are not. Only one instance may be active at a time.
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        callbacks: List[Callable[[StageRecord], None]] | None = None,
+    ) -> None:
+        """
+        Args:
+            trace_memory: Measure peak allocations with tracemalloc. Starts
+                tracing on entry if needed, which slows allocation-heavy code.
+                Stages that overlap another stage report no peak.
+            callbacks: Called with each record as soon as its stage ends.
+        """
+        self.trace_memory = trace_memory
+        self.callbacks = list(callbacks or [])
+        self.records: List[StageRecord] = []
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        self._traced: List[_TimedProbe] = []
+
+    def add_callback(self, callback: Callable[[StageRecord], None]) -> None:
+        self.callbacks.append(callback)
+
+    def __enter__(self) -> "Instrumentation":
+        """
+        Raises:
+            RuntimeError: If another Instrumentation is already active.
+        """
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise RuntimeError("Another Instrumentation is already active.")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _ACTIVE = self
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        global _ACTIVE
+        _ACTIVE = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _open_traced(self, probe: _TimedProbe) -> None:
+        """
+        Starts measuring a stage's peak. Resetting the process-wide peak is
+        only safe while no other stage is measuring, so overlapping stages
+        are all marked and later report no peak.
+        """
+        with self._lock:
+            if self._traced:
+                probe.overlapped = True
+                for other in self._traced:
+                    other.overlapped = True
+            else:
+                tracemalloc.reset_peak()
+                probe._traced_at_entry = tracemalloc.get_traced_memory()[0]
+            self._traced.append(probe)
+
+    def _close_traced(self, probe: _TimedProbe) -> int | None:
+        with self._lock:
+            self._traced.remove(probe)
+            if probe.overlapped:
+                return None
+            return max(0, tracemalloc.get_traced_memory()[1] - probe._traced_at_entry)
+
+    def _record(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Every record as a JSON-serialisable dict, in completion order."""
+        return [record.to_dict() for record in self.records]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Totals per stage: calls, wall and CPU seconds, and the largest peak
+        allocation and reported array size seen.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for record in self.records:
+            entry = totals.setdefault(
+                record.stage,
+                {
+                    "calls": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "peak_allocated_bytes": 0,
+                    "max_array_bytes": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["wall_seconds"] += record.wall_seconds
+            entry["cpu_seconds"] += record.cpu_seconds
+            entry["peak_allocated_bytes"] = max(
+                entry["peak_allocated_bytes"], record.peak_allocated_bytes or 0
+            )
+            entry["max_array_bytes"] = max(
+                entry["max_array_bytes"], max(record.nbytes.values(), default=0)
+            )
+        return totals
+
+    def write_jsonl(self, file: IO[str]) -> None:
+        """Writes one JSON object per record to an open text file."""
+        for record in self.to_dicts():
+            file.write(json.dumps(record) + "\n")
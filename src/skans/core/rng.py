@@ -1,5 +1,12 @@
-from typing import Protocol, runtime_checkable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Protocol, Tuple, Type, cast
+from typing import runtime_checkable
+import warnings
 import numpy as np
+from scipy.special import ndtri
+
+if TYPE_CHECKING:
+    from scipy.stats import qmc
 
 
 @runtime_checkable
@@ -13,6 +20,17 @@ class RandomNumberGenerator(Protocol):
         ...
 
 
+@runtime_checkable
+class BufferedRandomNumberGenerator(RandomNumberGenerator, Protocol):
+    """
+    Interface for generators that can write normals into a caller-supplied buffer.
+    """
+
+    def fill(self, out: np.ndarray) -> None:
+        """Fills out (paths * ...) with standard normal random variables"""
+        ...
+
+
 class SimpleRng:
     """
     Implementation of the Standard Mersenne Twister using numpy.
@@ -21,3 +39,263 @@ class SimpleRng:
     def generate(self, n_paths: int, n_steps: int) -> np.ndarray:
         """Returns a 2D matrix of stadard normal random variables (paths * steps)"""
         return np.random.randn(n_paths, n_steps)
+
+
+BIT_GENERATORS: Dict[str, Type[np.random.BitGenerator]] = {
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "Philox": np.random.Philox,
+    "SFC64": np.random.SFC64,
+}
+
+# Upper bound on the number of normals discarded per call when seeking into a block
+_SKIP_CHUNK = 1 << 20
+
+
+def _validate_options(bit_generator: str, block_size: int, n_workers: int) -> None:
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(
+            f"Unsupported bit generator '{bit_generator}'. "
+            f"Available: {list(BIT_GENERATORS.keys())}"
+        )
+    if block_size < 1 or n_workers < 1:
+        raise ValueError("block_size and n_workers must be positive.")
+
+
+class PathStream:
+    """
+    A single reproducible draw of standard normals, addressed by path index.
+
+    The path axis is partitioned into fixed-size blocks and every block draws
+    from its own SeedSequence substream. Row i of the draw therefore depends
+    only on the seed, the block size and i, never on how many workers fill
+    the blocks or how the rows are split across calls.
+
+    Successive generate/fill calls continue with the next paths, so filling a
+    draw in consecutive chunks is bit-identical to filling it in one shot.
+    """
+
+    def __init__(
+        self,
+        seed_sequence: np.random.SeedSequence,
+        bit_generator: str = "PCG64",
+        block_size: int = 1024,
+        n_workers: int = 1,
+        path_offset: int = 0,
+    ) -> None:
+        _validate_options(bit_generator, block_size, n_workers)
+
+        self.seed_sequence = seed_sequence
+        self.bit_generator = bit_generator
+        self.block_size = block_size
+        self.n_workers = n_workers
+        self.position = path_offset
+
+    def seek(self, path_offset: int) -> None:
+        """Moves the cursor so the next call starts at the given path"""
+        self.position = path_offset
+
+    def generate(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Returns a 2D matrix of stadard normal random variables (paths * steps)"""
+        out = np.empty((n_paths, n_steps))
+        self.fill(out)
+        return out
+
+    def fill(self, out: np.ndarray) -> None:
+        """
+        Fills out with the next out.shape[0] paths of the draw.
+
+        The first axis of out is the path axis; all remaining axes are filled
+        in C order. Blocks are filled concurrently when n_workers > 1.
+        """
+        start = self.position
+        stop = start + out.shape[0]
+        self.position = stop
+
+        if stop == start:
+            return
+
+        tasks: List[Tuple[int, int, int]] = [
+            (
+                block,
+                max(start, block * self.block_size),
+                min(stop, (block + 1) * self.block_size),
+            )
+            for block in range(
+                start // self.block_size, (stop - 1) // self.block_size + 1
+            )
+        ]
+
+        def fill_block(task: Tuple[int, int, int]) -> None:
+            block, lo, hi = task
+            self._fill_block(block, lo, out[lo - start : hi - start])
+
+        if self.n_workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+                list(pool.map(fill_block, tasks))
+        else:
+            for task in tasks:
+                fill_block(task)
+
+    def _fill_block(self, block: int, first_path: int, target: np.ndarray) -> None:
+        generator = np.random.Generator(
+            BIT_GENERATORS[self.bit_generator](self._block_seed(block))
+        )
+
+        # Discard the rows of this block that precede the requested paths
+        width = int(np.prod(target.shape[1:], dtype=np.int64))
+        skip = (first_path - block * self.block_size) * width
+        while skip > 0:
+            n = min(skip, _SKIP_CHUNK)
+            generator.standard_normal(n, dtype=target.dtype)
+            skip -= n
+
+        if target.flags.c_contiguous:
+            generator.standard_normal(dtype=target.dtype, out=target)
+        else:
+            target[...] = generator.standard_normal(target.shape, dtype=target.dtype)
+
+    def _block_seed(self, block: int) -> np.random.SeedSequence:
+        # Equivalent to the block-th child of seed_sequence.spawn(), but O(1)
+        return np.random.SeedSequence(
+            entropy=self.seed_sequence.entropy,
+            spawn_key=tuple(self.seed_sequence.spawn_key) + (block,),
+            pool_size=self.seed_sequence.pool_size,
+        )
+
+
+class GeneratorRng:
+    """
+    Seedable, thread-safe generator built on numpy.random.Generator with an
+    explicit bit generator (PCG64 by default, or Philox/PCG64DXSM/SFC64).
+
+    Each generate/fill call opens a new PathStream spawned from the root
+    SeedSequence, so a run is fully reproducible from its seed and the result
+    is bit-identical for any n_workers.
+    """
+
+    def __init__(
+        self,
+        seed: int | np.random.SeedSequence | None = None,
+        bit_generator: str = "PCG64",
+        block_size: int = 1024,
+        n_workers: int = 1,
+    ) -> None:
+        _validate_options(bit_generator, block_size, n_workers)
+
+        self.seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self.bit_generator = bit_generator
+        self.block_size = block_size
+        self.n_workers = n_workers
+
+    @property
+    def entropy(self) -> int:
+        """The root entropy; record it to reproduce a run with an unseeded rng"""
+        return int(self.seed_sequence.entropy)  # type: ignore[arg-type]
+
+    def stream(self) -> PathStream:
+        """Opens the next independent draw as a path-addressable stream"""
+        (child,) = self.seed_sequence.spawn(1)
+        return PathStream(child, self.bit_generator, self.block_size, self.n_workers)
+
+    def generate(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Returns a 2D matrix of stadard normal random variables (paths * steps)"""
+        return self.stream().generate(n_paths, n_steps)
+
+    def fill(self, out: np.ndarray) -> None:
+        """Fills out (paths * ...) with a new draw of standard normals"""
+        self.stream().fill(out)
+
+
+class CommonRandomNumbers:
+    """
+    Records the normals drawn from a wrapped generator and replays them.
+
+    The first pass draws from the wrapped rng and keeps every block in call
+    order; after rewind() the same sequence of requests receives exactly the
+    same normals. Simulations with bumped inputs therefore share their random
+    numbers, so differences between them carry no Monte Carlo noise.
+    """
+
+    def __init__(self, rng: RandomNumberGenerator) -> None:
+        self.rng = rng
+        self._draws: List[np.ndarray] = []
+        self._cursor = 0
+
+    def rewind(self) -> None:
+        """Restarts replay from the first recorded draw"""
+        self._cursor = 0
+
+    def generate(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Returns a 2D matrix of stadard normal random variables (paths * steps)"""
+        return np.array(self._next((n_paths, n_steps)))
+
+    def fill(self, out: np.ndarray) -> None:
+        """Fills out with the next recorded (or newly drawn) normals"""
+        out[...] = self._next(out.shape)
+
+    def _next(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Raises:
+            ValueError: If a replayed request differs in shape from the recording.
+        """
+        if self._cursor == len(self._draws):
+            draw = np.empty(shape)
+            if isinstance(self.rng, BufferedRandomNumberGenerator):
+                self.rng.fill(draw)
+            else:
+                width = int(np.prod(shape[1:], dtype=np.int64))
+                draw[...] = self.rng.generate(shape[0], width).reshape(shape)
+            self._draws.append(draw)
+
+        draw = self._draws[self._cursor]
+        if draw.shape != tuple(shape):
+            raise ValueError(
+                f"Replayed draw {self._cursor} has shape {draw.shape}, "
+                f"requested {tuple(shape)}."
+            )
+        self._cursor += 1
+        return draw
+
+
+class SobolRng:
+    """
+    Quasi-random generator using (optionally scrambled) Sobol sequences mapped
+    to standard normals through the inverse normal CDF.
+
+    Each path is one point of an n_steps-dimensional Sobol sequence, so the
+    leading columns carry the best-distributed coordinates. Pair it with
+    Brownian bridge path construction to put the coarse path structure there.
+    Successive calls with the same n_steps continue the sequence.
+    """
+
+    def __init__(self, seed: int | None = None, scramble: bool = True) -> None:
+        self.seed = seed
+        self.scramble = scramble
+        self._engine: "qmc.Sobol | None" = None
+
+    def generate(self, n_paths: int, n_steps: int) -> np.ndarray:
+        """Returns a 2D matrix of stadard normal random variables (paths * steps)"""
+        if self._engine is None or self._engine.d != n_steps:
+            # scipy.stats is slow to import, so only Sobol users pay for it
+            from scipy.stats import qmc
+
+            self._engine = qmc.Sobol(d=n_steps, scramble=self.scramble, seed=self.seed)
+            if not self.scramble:
+                # The unscrambled sequence starts at the origin, which has no
+                # finite normal image and would make path 0 an outlier
+                self._engine.fast_forward(1)
+
+        with warnings.catch_warnings():
+            # Balance properties favour powers of two but any n_paths is valid
+            warnings.simplefilter("ignore", UserWarning)
+            uniforms = self._engine.random(n_paths)
+
+        # Guard the transform against points landing exactly on the boundary
+        eps = np.finfo(np.float64).eps
+        np.clip(uniforms, eps, 1.0 - eps, out=uniforms)
+        return cast(np.ndarray, ndtri(uniforms, out=uniforms))
@@ -1,6 +1,251 @@
-from typing import cast
-from skans.core.rng import RandomNumberGenerator, SimpleRng
+from collections import deque
+from enum import Enum, unique
+from typing import Deque, List, Tuple
+from skans.core.rng import (
+    BufferedRandomNumberGenerator,
+    RandomNumberGenerator,
+    SimpleRng,
+)
 import numpy as np
+import numpy.typing as npt
+
+
+@unique
+class PathConstruction(str, Enum):
+    """How standard normals are turned into Brownian paths."""
+
+    STANDARD = "STANDARD"
+    BROWNIAN_BRIDGE = "BROWNIAN_BRIDGE"
+
+
+@unique
+class VarianceReduction(str, Enum):
+    """Variance-reduction scheme applied to the driving normals."""
+
+    NONE = "NONE"
+    ANTITHETIC = "ANTITHETIC"
+    MOMENT_MATCHING = "MOMENT_MATCHING"
+
+
+def _fill(rng: RandomNumberGenerator, out: np.ndarray) -> None:
+    if isinstance(rng, BufferedRandomNumberGenerator):
+        rng.fill(out)
+    else:
+        width = int(np.prod(out.shape[1:], dtype=np.int64))
+        out[...] = rng.generate(out.shape[0], width).reshape(out.shape)
+
+
+def fill_normals(
+    rng: RandomNumberGenerator,
+    out: np.ndarray,
+    variance_reduction: VarianceReduction = VarianceReduction.NONE,
+) -> None:
+    """
+    Writes standard normals into out (n_paths, ...) with optional variance reduction.
+
+    ANTITHETIC draws only ceil(n_paths / 2) rows and mirrors them, so path
+    i + ceil(n_paths / 2) is the negation of path i. MOMENT_MATCHING rescales
+    every column to exactly zero sample mean and unit sample variance.
+    Buffered generators write straight into out; others go through one
+    temporary matrix.
+    """
+    n_paths = out.shape[0]
+
+    if variance_reduction is VarianceReduction.ANTITHETIC:
+        half = (n_paths + 1) // 2
+        _fill(rng, out[:half])
+        np.negative(out[: n_paths - half], out=out[half:])
+        return
+
+    _fill(rng, out)
+
+    if variance_reduction is VarianceReduction.MOMENT_MATCHING and n_paths > 1:
+        out -= out.mean(axis=0)
+        # Sum of squares without a full-size temporary
+        out /= np.sqrt(np.einsum("i...,i...->...", out, out) / n_paths)
+
+
+def draw_normals(
+    rng: RandomNumberGenerator,
+    n_paths: int,
+    n_steps: int,
+    variance_reduction: VarianceReduction = VarianceReduction.NONE,
+) -> np.ndarray:
+    """
+    Draws a (n_paths, n_steps) matrix of normals with optional variance reduction.
+    """
+    Z = np.empty((n_paths, n_steps))
+    fill_normals(rng, Z, variance_reduction)
+    return Z
+
+
+def _bridge_schedule(n_steps: int) -> List[Tuple[int, int, int]]:
+    """
+    Construction order of a Brownian bridge over grid points 0..n_steps.
+
+    Returns (point, left, right) triples: the terminal point first (conditioned
+    on W(0) = 0 only, flagged by right == point), then midpoints breadth-first.
+    """
+    schedule = [(n_steps, 0, n_steps)]
+    intervals: Deque[Tuple[int, int]] = deque([(0, n_steps)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        schedule.append((mid, left, right))
+        intervals.append((left, mid))
+        intervals.append((mid, right))
+    return schedule
+
+
+def _brownian_bridge_inplace(W: np.ndarray, times: np.ndarray) -> None:
+    """
+    Turns the normals held in W[:, 1:] into Brownian levels, in place.
+
+    The normals are first permuted, one column at a time along the cycles of
+    the bridge order, so that the k-th normal sits at the column of the k-th
+    constructed point. Every point can then be built over its own normal.
+    """
+    schedule = _bridge_schedule(W.shape[1] - 1)
+
+    # source[point] is the column currently holding that point's normal
+    source = {point: k + 1 for k, (point, _, _) in enumerate(schedule)}
+    visited = set()
+    for start in source:
+        if start in visited or source[start] == start:
+            continue
+        held = W[:, start].copy()
+        column = start
+        while True:
+            visited.add(column)
+            if source[column] == start:
+                W[:, column] = held
+                break
+            W[:, column] = W[:, source[column]]
+            column = source[column]
+
+    W[:, 0] = 0.0
+    for point, left, right in schedule:
+        if right == point:
+            # Terminal point, conditioned on the origin only
+            W[:, point] *= float(np.sqrt(times[point] - times[left]))
+            continue
+
+        t_l, t_m, t_r = times[left], times[point], times[right]
+        span = t_r - t_l
+        W[:, point] *= float(np.sqrt((t_m - t_l) * (t_r - t_m) / span))
+        W[:, point] += float((t_r - t_m) / span) * W[:, left]
+        W[:, point] += float((t_m - t_l) / span) * W[:, right]
+
+
+def brownian_bridge(
+    Z: np.ndarray, times: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Brownian bridge path construction.
+
+    Column k of Z drives the k-th point in bridge order: the terminal value
+    first, then successive midpoints. With quasi-random inputs this assigns the
+    best-distributed coordinates to the largest-scale path features.
+
+    Parameters
+    ----------
+    Z : np.ndarray
+        Standard normals (n_paths, n_steps, ...).
+    times : np.ndarray
+        Time grid (n_steps + 1,) starting at 0.
+    out : np.ndarray | None
+        Preallocated output of shape (n_paths, n_steps + 1, ...).
+
+    Returns
+    -------
+    np.ndarray
+        Brownian levels W(t) (n_paths, n_steps + 1, ...) with W(0) = 0
+    """
+    n_steps = Z.shape[1]
+    shape = (Z.shape[0], n_steps + 1) + Z.shape[2:]
+    if out is None:
+        out = np.empty(shape, dtype=Z.dtype)
+    elif out.shape != shape:
+        raise ValueError(f"Output must have shape {shape}, got {out.shape}.")
+
+    out[:, 1:] = Z
+    _brownian_bridge_inplace(out, times)
+    return out
+
+
+def _brownian_levels(
+    out: np.ndarray,
+    times: np.ndarray,
+    rng: RandomNumberGenerator,
+    construction: PathConstruction,
+    variance_reduction: VarianceReduction,
+) -> None:
+    """Fills out (n_paths, len(times), ...) with standard Brownian levels W(t)"""
+    increments = out[:, 1:]
+    fill_normals(rng, increments, variance_reduction)
+
+    if construction is PathConstruction.BROWNIAN_BRIDGE:
+        _brownian_bridge_inplace(out, times)
+        return
+
+    # dW = sqrt(dt) * Z, accumulated in place; t=0 is written directly
+    sqrt_dt = np.sqrt(np.diff(times)).astype(out.dtype)
+    increments *= sqrt_dt.reshape((-1,) + (1,) * (out.ndim - 2))
+    np.cumsum(increments, axis=1, out=increments)
+    out[:, 0] = 0.0
+
+
+def _time_grid(T: float, n_steps: int, times: npt.ArrayLike | None) -> np.ndarray:
+    """The uniform grid over [0, T], or the validated explicit grid"""
+    if times is None:
+        return (T / n_steps) * np.arange(n_steps + 1)
+
+    grid = np.asarray(times, dtype=np.float64)
+    if grid.shape != (n_steps + 1,):
+        raise ValueError(
+            f"Time grid must have n_steps + 1 = {n_steps + 1} points, "
+            f"got shape {grid.shape}."
+        )
+    if grid[0] != 0.0 or np.any(np.diff(grid) <= 0.0):
+        raise ValueError("Time grid must start at 0 and be strictly increasing.")
+    if not np.isclose(grid[-1], T):
+        raise ValueError(f"Time grid ends at {grid[-1]}, expected T = {T}.")
+    return grid
+
+
+# Path-steps (matrix rows) in one correlation tile. Small enough that a run
+# of a few paths does not pay for a large padded tile, large enough to keep
+# the BLAS calls efficient at any factor count
+_CORRELATION_TILE_ROWS = 4096
+
+
+def _correlate_inplace(W: np.ndarray, cholesky: np.ndarray) -> None:
+    """
+    Applies the Cholesky factor across the factor axis of W[:, 1:, :], in place.
+
+    Paths are processed in tiles copied into a zero-padded scratch matrix of
+    fixed height, about _CORRELATION_TILE_ROWS rows whatever the number of
+    paths. Every BLAS call therefore has the same shape, which keeps
+    each path's result independent of how many paths share the call. Chunked
+    and sharded runs stay bit-identical to a single-shot run.
+    """
+    n_paths, n_points, n_factors = W.shape
+    n_steps = n_points - 1
+    paths_per_tile = max(1, _CORRELATION_TILE_ROWS // n_steps)
+
+    cholesky_t = cholesky.T.astype(W.dtype)
+    scratch = np.zeros((paths_per_tile, n_steps, n_factors), dtype=W.dtype)
+    result = np.empty((paths_per_tile * n_steps, n_factors), dtype=W.dtype)
+    flat = scratch.reshape(-1, n_factors)
+
+    for start in range(0, n_paths, paths_per_tile):
+        stop = min(start + paths_per_tile, n_paths)
+        scratch[: stop - start] = W[start:stop, 1:, :]
+        scratch[stop - start :] = 0.0
+        np.matmul(flat, cholesky_t, out=result)
+        W[start:stop, 1:, :] = result.reshape(scratch.shape)[: stop - start]
 
 
 def geometric_brownian_motion(
@@ -11,10 +256,18 @@ def geometric_brownian_motion(
     n_steps: int,
     n_paths: int,
     rng: RandomNumberGenerator | None = None,
+    construction: PathConstruction = PathConstruction.STANDARD,
+    variance_reduction: VarianceReduction = VarianceReduction.NONE,
+    out: np.ndarray | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    times: npt.ArrayLike | None = None,
 ) -> np.ndarray:
     """
     Geometric Brownian Motion Simulator.
 
+    The simulation runs entirely inside one (n_paths, n_steps + 1) buffer: the
+    normals are written into it, accumulated and exponentiated in place.
+
     Parameters
     ----------
     S0 : float
@@ -31,32 +284,146 @@ def geometric_brownian_motion(
         Number of paths.
     rng : RandomNumberGenerator | None
         Random number generator.
+    construction : PathConstruction
+        Incremental (STANDARD) or Brownian bridge path construction.
+    variance_reduction : VarianceReduction
+        Antithetic variates or moment matching of the driving normals.
+    out : np.ndarray | None
+        Preallocated output of shape (n_paths, n_steps + 1); its dtype wins.
+    dtype : npt.DTypeLike
+        Floating point type of the result, e.g. np.float32 to halve memory.
+    times : npt.ArrayLike | None
+        Explicit, possibly non-uniform time grid (n_steps + 1,) from 0 to T.
+        Each step uses the exact GBM transition for its own length. Defaults
+        to the uniform grid.
 
     Returns
     -------
     np.ndarray
         Simulated paths (n_paths, n_steps + 1)
     """
-    dt = T / n_steps
+    shape = (n_paths, n_steps + 1)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f"Output must have shape {shape}, got {out.shape}.")
 
     if rng is None:
         rng = SimpleRng()
 
-    # Generate random normal variables
-    Z = rng.generate(n_paths, n_steps)
+    times = _time_grid(T, n_steps, times)
 
     # Geometric Brownian Motion formula
     # S(t) = S0 * exp((mu - 0.5 * sigma^2) * t + sigma * W(t))
+    _brownian_levels(out, times, rng, construction, variance_reduction)
+    out *= sigma
+    out += ((mu - 0.5 * sigma**2) * times).astype(out.dtype)
+    np.exp(out, out=out)
+    out *= S0
+
+    return out
+
+
+def correlated_geometric_brownian_motion(
+    S0: np.ndarray,
+    mu: np.ndarray,
+    sigma: np.ndarray,
+    correlation: np.ndarray,
+    T: float,
+    n_steps: int,
+    n_paths: int,
+    rng: RandomNumberGenerator | None = None,
+    out: np.ndarray | None = None,
+    construction: PathConstruction = PathConstruction.STANDARD,
+    variance_reduction: VarianceReduction = VarianceReduction.NONE,
+    dtype: npt.DTypeLike = np.float64,
+    times: npt.ArrayLike | None = None,
+) -> np.ndarray:
+    """
+    Correlated multi-factor Geometric Brownian Motion Simulator.
+
+    All factors are simulated in a single vectorized pass directly into one
+    (n_paths, n_steps + 1, n_factors) tensor, so no per-factor arrays are
+    created and no final stack is required. Correlation is applied tile by
+    tile, so the scratch space is bounded whatever the number of paths.
+
+    Parameters
+    ----------
+    S0 : np.ndarray
+        Initial levels, one per factor.
+    mu : np.ndarray
+        Drift rates, one per factor.
+    sigma : np.ndarray
+        Volatilities, one per factor.
+    correlation : np.ndarray
+        Correlation matrix of the driving Brownian motions (n_factors, n_factors).
+    T : float
+        Time horizon.
+    n_steps : int
+        Number of steps.
+    n_paths : int
+        Number of paths.
+    rng : RandomNumberGenerator | None
+        Random number generator.
+    out : np.ndarray | None
+        Preallocated output tensor of shape (n_paths, n_steps + 1, n_factors).
+    construction : PathConstruction
+        Incremental (STANDARD) or Brownian bridge path construction.
+    variance_reduction : VarianceReduction
+        Antithetic variates or moment matching of the driving normals.
+    dtype : npt.DTypeLike
+        Floating point type of the result when out is not supplied.
+    times : npt.ArrayLike | None
+        Explicit, possibly non-uniform time grid (n_steps + 1,) from 0 to T.
+        Defaults to the uniform grid.
+
+    Returns
+    -------
+    np.ndarray
+        Simulated paths (n_paths, n_steps + 1, n_factors)
+    """
+    S0 = np.asarray(S0, dtype=np.float64)
+    mu = np.asarray(mu, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    correlation = np.asarray(correlation, dtype=np.float64)
+
+    n_factors = S0.shape[0]
+    if mu.shape != (n_factors,) or sigma.shape != (n_factors,):
+        raise ValueError("S0, mu and sigma must be vectors of equal length.")
+    if correlation.shape != (n_factors, n_factors):
+        raise ValueError(
+            f"Correlation matrix must have shape ({n_factors}, {n_factors}), "
+            f"got {correlation.shape}."
+        )
+
+    try:
+        cholesky = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix must be positive definite.")
+
+    shape = (n_paths, n_steps + 1, n_factors)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f"Output tensor must have shape {shape}, got {out.shape}.")
+
+    if rng is None:
+        rng = SimpleRng()
 
-    # Calculate the exponent
-    exponent = (mu - 0.5 * sigma**2) * dt + sigma * Z * np.sqrt(dt)
+    times = _time_grid(T, n_steps, times)
 
-    # Accumulate the exponent
-    accumulated_exponent = np.cumsum(exponent, axis=1)
+    # Independent Brownian levels, laid out path-major as (paths, steps, factors).
+    # The bridge acts along time and the Cholesky factor across factors, so
+    # building the paths first and correlating afterwards is equivalent.
+    _brownian_levels(out, times, rng, construction, variance_reduction)
 
-    # Prepend zero to the accumulated exponent to account for S0 at t=0
-    accumulated_exponent = np.hstack((np.zeros((n_paths, 1)), accumulated_exponent))
+    if not np.array_equal(cholesky, np.eye(n_factors)):
+        _correlate_inplace(out, cholesky)
 
-    paths = S0 * np.exp(accumulated_exponent)
+    # log S(t) = (mu - 0.5 * sigma^2) * t + sigma * W(t)
+    out *= sigma.astype(out.dtype)
+    out += np.outer(times, mu - 0.5 * sigma**2).astype(out.dtype)
+    np.exp(out, out=out)
+    out *= S0.astype(out.dtype)
 
-    return cast(np.ndarray, paths)
+    return out
@@ -1,3 +1,4 @@
 from .portfolio import Position, Trade, Portfolio, NettingSet
+from .table import TradeTable
 
-__all__ = ["Position", "Trade", "Portfolio", "NettingSet"]
+__all__ = ["Position", "Trade", "Portfolio", "NettingSet", "TradeTable"]
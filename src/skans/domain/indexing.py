@@ -0,0 +1,80 @@
+"""
+Array-backed grouping helpers shared by the trade containers.
+"""
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from skans.domain.portfolio import NettingSet
+
+NO_ROWS = np.empty(0, dtype=np.int64)
+NO_ROWS.flags.writeable = False
+
+
+def factorize(keys: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes keys as int32 codes in order of first appearance.
+
+    Returns (codes, categories) with categories[codes] reproducing the keys.
+    """
+    lookup: dict[str, int] = {}
+    codes = np.fromiter(
+        (lookup.setdefault(k, len(lookup)) for k in keys), dtype=np.int32
+    )
+    categories = np.empty(len(lookup), dtype=object)
+    categories[:] = list(lookup)
+    return codes, categories
+
+
+def group_rows(codes: np.ndarray, n_groups: int) -> List[np.ndarray]:
+    """
+    Groups row numbers by code: element g holds the ascending int64 rows with
+    code g.
+
+    Every group is a read-only view into one shared, stably sorted row array,
+    so the whole index costs a single integer per row.
+    """
+    order = np.argsort(codes, kind="stable").astype(np.int64, copy=False)
+    order.flags.writeable = False
+    bounds = np.cumsum(np.bincount(codes, minlength=n_groups))[:-1]
+    return np.split(order, bounds)
+
+
+def netting_set_index(
+    netting_sets: Iterable["NettingSet"], row_of: Callable[[str], int]
+) -> Dict[str, np.ndarray]:
+    """
+    Maps each netting set to the ascending, read-only int64 rows of its
+    trades; row_of returns a trade's row, or -1 if it is not held.
+
+    Raises:
+        KeyError: If a netting set refers to a trade that is not held.
+    """
+    index: Dict[str, np.ndarray] = {}
+    for ns in netting_sets:
+        rows = []
+        for trade_id in ns.trade_ids:
+            row = row_of(trade_id)
+            if row < 0:
+                raise KeyError(
+                    f"Trade '{trade_id}' of netting set '{ns.netting_set_id}' "
+                    "not found."
+                )
+            rows.append(row)
+        index[ns.netting_set_id] = np.sort(np.array(rows, dtype=np.int64))
+        index[ns.netting_set_id].flags.writeable = False
+    return index
+
+
+def netting_set_lookup(index: Dict[str, np.ndarray], netting_set_id: str) -> np.ndarray:
+    """
+    Rows of one netting set in a netting_set_index.
+
+    Raises:
+        KeyError: If the netting set is unknown.
+    """
+    try:
+        return index[netting_set_id]
+    except KeyError:
+        raise KeyError(f"Netting set '{netting_set_id}' not found.")
@@ -1,7 +1,15 @@
 from dataclasses import dataclass
-from typing import Tuple, Dict, Union
+from typing import Tuple, Dict, Iterable, Union
 from functools import cached_property
-
+import numpy as np
+
+from skans.domain.indexing import (
+    NO_ROWS,
+    factorize,
+    group_rows,
+    netting_set_index,
+    netting_set_lookup,
+)
 from skans.domain.types.aliases import Quantity
 from skans.domain.types.enums import LongShort
 from skans.domain.instruments import EquityForward, EquityOption, FXForward, FXOption
@@ -29,21 +37,76 @@ class Trade:
     direction: LongShort
 
 
+def _group_rows(keys: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Groups row numbers by key: {key: ascending int64 rows having that key}."""
+    codes, categories = factorize(keys)
+    return dict(zip(categories.tolist(), group_rows(codes, len(categories))))
+
+
 @dataclass(frozen=True)
 class Portfolio:
+    """
+    An ordered collection of Trades, optionally grouped into NettingSets.
+
+    Lookups by counterparty, position and netting set return NumPy arrays of
+    row numbers into `trades`, built lazily on first use and cached, so they
+    can index trade-aligned arrays (e.g. an MTM cube) directly.
+    """
+
     portfolio_id: str
     trades: Tuple[Trade, ...]
+    netting_sets: Tuple["NettingSet", ...] = ()
 
     @cached_property
     def _trade_index(self) -> Dict[str, Trade]:
         return {t.trade_id: t for t in self.trades}
 
+    @cached_property
+    def _row_index(self) -> Dict[str, int]:
+        return {t.trade_id: row for row, t in enumerate(self.trades)}
+
+    @cached_property
+    def _counterparty_rows(self) -> Dict[str, np.ndarray]:
+        return _group_rows(t.counterparty_id for t in self.trades)
+
+    @cached_property
+    def _position_rows(self) -> Dict[str, np.ndarray]:
+        return _group_rows(t.position_id for t in self.trades)
+
+    @cached_property
+    def _netting_set_rows(self) -> Dict[str, np.ndarray]:
+        return netting_set_index(
+            self.netting_sets, lambda trade_id: self._row_index.get(trade_id, -1)
+        )
+
     def get_trade(self, trade_id: str) -> Trade:
         try:
             return self._trade_index[trade_id]
         except KeyError:
             raise KeyError(f"Trade '{trade_id}' not found.")
 
+    def counterparty_rows(self, counterparty_id: str) -> np.ndarray:
+        """Rows of the trades facing a counterparty (empty if there are none)."""
+        return self._counterparty_rows.get(counterparty_id, NO_ROWS)
+
+    def position_rows(self, position_id: str) -> np.ndarray:
+        """Rows of the trades on a position (empty if there are none)."""
+        return self._position_rows.get(position_id, NO_ROWS)
+
+    def netting_set_rows(self, netting_set_id: str) -> np.ndarray:
+        """
+        Rows of the trades in a netting set.
+
+        Raises:
+            KeyError: If the netting set is unknown, or a netting set refers to
+                a trade that is not in the portfolio.
+        """
+        return netting_set_lookup(self._netting_set_rows, netting_set_id)
+
+    def select(self, rows: np.ndarray) -> Tuple[Trade, ...]:
+        """The trades at the given rows."""
+        return tuple(self.trades[row] for row in rows.tolist())
+
     def __len__(self) -> int:
         return len(self.trades)
 
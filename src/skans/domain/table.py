@@ -0,0 +1,287 @@
+"""
+Columnar Trade storage.
+
+A TradeTable holds a book of trades as typed NumPy columns: fixed-width UTF-8
+trade IDs, int32 categorical codes for positions and counterparties, float64
+quantities and int8 directions. It exposes the Portfolio API and hands out
+Trade objects only when individual trades are accessed, so pricing and
+aggregation can read the columns directly.
+"""
+
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, overload
+import numpy as np
+
+from skans.domain.indexing import (
+    NO_ROWS,
+    factorize,
+    group_rows,
+    netting_set_index,
+    netting_set_lookup,
+)
+from skans.domain.portfolio import NettingSet, Portfolio, Trade
+from skans.domain.types.enums import LongShort
+
+DIRECTION_CODES: Dict[LongShort, int] = {LongShort.LONG: 1, LongShort.SHORT: -1}
+_DIRECTIONS: Dict[int, LongShort] = {v: k for k, v in DIRECTION_CODES.items()}
+
+
+@dataclass(frozen=True)
+class TradeTable(Sequence[Trade]):
+    """
+    Trades as struct-of-arrays columns, behaving as a read-only Sequence[Trade]
+    with the lookups of a Portfolio.
+
+    Build instances with from_columns, from_trades or from_portfolio.
+
+    Attributes:
+        trade_key: Trade identifiers as fixed-width UTF-8 bytes (one byte per
+            ASCII character, a quarter of NumPy's UCS-4 strings).
+        position_codes: int32 index of each trade's position in
+            position_categories.
+        position_categories: The distinct position identifiers.
+        counterparty_codes: int32 index of each trade's counterparty in
+            counterparty_categories.
+        counterparty_categories: The distinct counterparty identifiers.
+        quantity: Unsigned trade quantity (float64).
+        direction: +1 for LONG and -1 for SHORT (int8).
+        portfolio_id: The portfolio identifier.
+        netting_sets: Netting sets over the table's trades.
+    """
+
+    trade_key: np.ndarray
+    position_codes: np.ndarray
+    position_categories: np.ndarray
+    counterparty_codes: np.ndarray
+    counterparty_categories: np.ndarray
+    quantity: np.ndarray
+    direction: np.ndarray
+    portfolio_id: str = ""
+    netting_sets: Tuple[NettingSet, ...] = ()
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: If the per-trade columns differ in length.
+        """
+        per_trade = (
+            self.trade_key,
+            self.position_codes,
+            self.counterparty_codes,
+            self.quantity,
+            self.direction,
+        )
+        lengths = {len(column) for column in per_trade}
+        if len(lengths) > 1:
+            raise ValueError(f"Trade columns differ in length: {sorted(lengths)}.")
+        for column in self._arrays():
+            column.flags.writeable = False
+
+    @classmethod
+    def from_columns(
+        cls,
+        trade_id: Iterable[str],
+        position_id: Iterable[str],
+        counterparty_id: Iterable[str],
+        quantity: np.ndarray,
+        direction: np.ndarray,
+        portfolio_id: str = "",
+        netting_sets: Tuple[NettingSet, ...] = (),
+    ) -> "TradeTable":
+        """
+        Encodes plain columns; direction holds +1 (LONG) / -1 (SHORT) codes.
+        """
+        position_codes, position_categories = factorize(position_id)
+        counterparty_codes, counterparty_categories = factorize(counterparty_id)
+        return cls(
+            trade_key=np.char.encode(np.asarray(list(trade_id), dtype=str), "utf-8"),
+            position_codes=position_codes,
+            position_categories=position_categories,
+            counterparty_codes=counterparty_codes,
+            counterparty_categories=counterparty_categories,
+            quantity=np.asarray(quantity, dtype=np.float64),
+            direction=np.asarray(direction, dtype=np.int8),
+            portfolio_id=portfolio_id,
+            netting_sets=netting_sets,
+        )
+
+    @classmethod
+    def from_trades(
+        cls,
+        trades: Sequence[Trade],
+        portfolio_id: str = "",
+        netting_sets: Tuple[NettingSet, ...] = (),
+    ) -> "TradeTable":
+        return cls.from_columns(
+            trade_id=[t.trade_id for t in trades],
+            position_id=[t.position_id for t in trades],
+            counterparty_id=[t.counterparty_id for t in trades],
+            quantity=np.array([t.quantity for t in trades], dtype=np.float64),
+            direction=np.array(
+                [DIRECTION_CODES[t.direction] for t in trades], dtype=np.int8
+            ),
+            portfolio_id=portfolio_id,
+            netting_sets=netting_sets,
+        )
+
+    @classmethod
+    def from_portfolio(cls, portfolio: Portfolio) -> "TradeTable":
+        return cls.from_trades(
+            portfolio.trades, portfolio.portfolio_id, portfolio.netting_sets
+        )
+
+    def _arrays(self) -> List[np.ndarray]:
+        return [
+            getattr(self, f.name)
+            for f in fields(self)
+            if isinstance(getattr(self, f.name), np.ndarray)
+        ]
+
+    @property
+    def trades(self) -> "TradeTable":
+        """The table itself, standing in for Portfolio.trades."""
+        return self
+
+    @property
+    def trade_id(self) -> np.ndarray:
+        """Decoded trade identifiers (allocates a unicode array)."""
+        decoded: np.ndarray = np.char.decode(self.trade_key, "utf-8")
+        return decoded
+
+    @property
+    def position_id(self) -> np.ndarray:
+        """Decoded position identifier per trade (allocates an object array)."""
+        decoded: np.ndarray = self.position_categories[self.position_codes]
+        return decoded
+
+    @property
+    def counterparty_id(self) -> np.ndarray:
+        """Decoded counterparty identifier per trade (allocates an object array)."""
+        decoded: np.ndarray = self.counterparty_categories[self.counterparty_codes]
+        return decoded
+
+    @property
+    def signed_quantity(self) -> np.ndarray:
+        """quantity * direction, i.e. the Position multiplier of each trade."""
+        signed: np.ndarray = self.quantity * self.direction
+        return signed
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy buffers (category strings not included)."""
+        return sum(column.nbytes for column in self._arrays())
+
+    @cached_property
+    def _trade_order(self) -> np.ndarray:
+        # Sort permutation of the trade keys: get_trade is a binary search
+        # costing one integer per trade instead of a dictionary entry
+        return np.argsort(self.trade_key, kind="stable")
+
+    @cached_property
+    def _counterparty_rows(self) -> List[np.ndarray]:
+        return group_rows(self.counterparty_codes, len(self.counterparty_categories))
+
+    @cached_property
+    def _position_rows(self) -> List[np.ndarray]:
+        return group_rows(self.position_codes, len(self.position_categories))
+
+    @cached_property
+    def _counterparty_lookup(self) -> Dict[str, int]:
+        return {c: i for i, c in enumerate(self.counterparty_categories.tolist())}
+
+    @cached_property
+    def _position_lookup(self) -> Dict[str, int]:
+        return {p: i for i, p in enumerate(self.position_categories.tolist())}
+
+    @cached_property
+    def _netting_set_rows(self) -> Dict[str, np.ndarray]:
+        return netting_set_index(self.netting_sets, self._row_of)
+
+    def _row_of(self, trade_id: str) -> int:
+        key = trade_id.encode("utf-8")
+        order = self._trade_order
+        i = int(np.searchsorted(self.trade_key, key, sorter=order))
+        if i < len(order) and self.trade_key[order[i]] == key:
+            return int(order[i])
+        return -1
+
+    def get_trade(self, trade_id: str) -> Trade:
+        row = self._row_of(trade_id)
+        if row < 0:
+            raise KeyError(f"Trade '{trade_id}' not found.")
+        return self[row]
+
+    def counterparty_rows(self, counterparty_id: str) -> np.ndarray:
+        """Rows of the trades facing a counterparty (empty if there are none)."""
+        code = self._counterparty_lookup.get(counterparty_id)
+        return NO_ROWS if code is None else self._counterparty_rows[code]
+
+    def position_rows(self, position_id: str) -> np.ndarray:
+        """Rows of the trades on a position (empty if there are none)."""
+        code = self._position_lookup.get(position_id)
+        return NO_ROWS if code is None else self._position_rows[code]
+
+    def netting_set_rows(self, netting_set_id: str) -> np.ndarray:
+        """
+        Rows of the trades in a netting set.
+
+        Raises:
+            KeyError: If the netting set is unknown, or a netting set refers to
+                a trade that is not in the table.
+        """
+        return netting_set_lookup(self._netting_set_rows, netting_set_id)
+
+    def select(self, rows: np.ndarray) -> "TradeTable":
+        """The trades at the given rows, as a TradeTable sharing categories."""
+        return TradeTable(
+            trade_key=self.trade_key[rows],
+            position_codes=self.position_codes[rows],
+            position_categories=self.position_categories,
+            counterparty_codes=self.counterparty_codes[rows],
+            counterparty_categories=self.counterparty_categories,
+            quantity=self.quantity[rows],
+            direction=self.direction[rows],
+            portfolio_id=self.portfolio_id,
+        )
+
+    def __len__(self) -> int:
+        return len(self.trade_key)
+
+    @overload
+    def __getitem__(self, index: int) -> Trade: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TradeTable": ...
+
+    def __getitem__(self, index: int | slice) -> "Trade | TradeTable":
+        if isinstance(index, slice):
+            return self.select(np.arange(len(self))[index])
+        return Trade(
+            trade_id=self.trade_key[index].decode("utf-8"),
+            position_id=self.position_categories[self.position_codes[index]],
+            counterparty_id=self.counterparty_categories[
+                self.counterparty_codes[index]
+            ],
+            quantity=float(self.quantity[index]),
+            direction=_DIRECTIONS[int(self.direction[index])],
+        )
+
+    def __iter__(self) -> Iterator[Trade]:
+        # Convert each column to Python objects once rather than per element
+        positions = self.position_categories.tolist()
+        counterparties = self.counterparty_categories.tolist()
+        for trade_id, position, counterparty, quantity, direction in zip(
+            np.char.decode(self.trade_key, "utf-8").tolist(),
+            self.position_codes.tolist(),
+            self.counterparty_codes.tolist(),
+            self.quantity.tolist(),
+            self.direction.tolist(),
+        ):
+            yield Trade(
+                trade_id,
+                positions[position],
+                counterparties[counterparty],
+                quantity,
+                _DIRECTIONS[direction],
+            )
@@ -0,0 +1,20 @@
+"""
+Exposure Module: Aggregates trade values into netting-set exposure profiles.
+"""
+
+from .allocation import trade_matrix, trade_values
+from .engine import (
+    ExposureAccumulator,
+    ExposureEngine,
+    ExposureProfiles,
+    netting_matrix,
+)
+
+__all__ = [
+    "ExposureAccumulator",
+    "ExposureEngine",
+    "ExposureProfiles",
+    "netting_matrix",
+    "trade_matrix",
+    "trade_values",
+]
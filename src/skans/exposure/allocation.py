@@ -0,0 +1,75 @@
+"""
+Position-to-Trade allocation.
+
+Positions are priced once; every Trade is a signed multiple of one Position's
+value (+quantity when LONG, -quantity when SHORT). The mapping is a sparse
+(Trades, Positions) matrix, so trades sharing a position reuse its row of the
+MTM cube instead of being repriced.
+"""
+
+from typing import Dict, Sequence
+import numpy as np
+from scipy import sparse
+
+from skans.domain.portfolio import Trade
+from skans.domain.table import TradeTable
+from skans.domain.types.enums import LongShort
+
+DIRECTION_SIGNS: Dict[LongShort, float] = {LongShort.LONG: 1.0, LongShort.SHORT: -1.0}
+
+
+def trade_matrix(
+    trades: Sequence[Trade], position_ids: Sequence[str]
+) -> sparse.csr_matrix:
+    """
+    Builds the sparse (Trades, Positions) matrix holding each trade's signed
+    quantity in the column of its position.
+
+    Raises:
+        KeyError: If a trade refers to a position that is not in position_ids.
+    """
+    columns = {position_id: col for col, position_id in enumerate(position_ids)}
+    try:
+        if isinstance(trades, TradeTable):
+            # Look up each distinct position once and gather through the codes;
+            # no Trade objects are created
+            category_cols = np.array(
+                [columns[p] for p in trades.position_categories.tolist()],
+                dtype=np.intp,
+            )
+            cols = category_cols[trades.position_codes]
+            data = trades.signed_quantity
+        else:
+            cols = np.array([columns[t.position_id] for t in trades], dtype=np.intp)
+            data = np.array([DIRECTION_SIGNS[t.direction] * t.quantity for t in trades])
+    except KeyError as exc:
+        raise KeyError(f"Position {exc} referenced by a trade is not in the cube.")
+
+    rows = np.arange(len(trades))
+    return sparse.csr_matrix(
+        (data, (rows, cols)), shape=(len(trades), len(position_ids))
+    )
+
+
+def trade_values(
+    cube: np.ndarray, position_ids: Sequence[str], trades: Sequence[Trade]
+) -> np.ndarray:
+    """
+    Expands a (Positions, Paths, Timesteps + 1) cube into the trade-level cube
+    of shape (Trades, Paths, Timesteps + 1).
+
+    Only needed when trade-level values are reported; the ExposureEngine nets
+    straight from the position cube.
+
+    Raises:
+        KeyError: If a trade refers to a position that is not in position_ids.
+        ValueError: If position_ids does not match the cube's first axis.
+    """
+    if cube.ndim != 3 or cube.shape[0] != len(position_ids):
+        raise ValueError(
+            f"Cube of shape {cube.shape} does not match "
+            f"{len(position_ids)} positions."
+        )
+    matrix = trade_matrix(trades, position_ids).astype(cube.dtype)
+    values: np.ndarray = matrix @ cube.reshape(cube.shape[0], -1)
+    return values.reshape((len(trades),) + cube.shape[1:])
@@ -0,0 +1,452 @@
+"""
+Exposure Engine for the Skans Risk Engine.
+Nets a trade-level MTM cube into NettingSet exposure profiles.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+
+from skans.core.instrumentation import stage
+from skans.domain.portfolio import NettingSet, Trade
+from skans.domain.table import TradeTable
+from skans.domain.types.enums import Currency
+from skans.exposure.allocation import trade_matrix
+
+
+@dataclass(frozen=True)
+class ExposureProfiles:
+    """
+    Exposure statistics per netting set on the simulation time grid.
+
+    Attributes:
+        netting_set_ids: Netting set identifiers in row order.
+        times: Simulation times in years, shape (Timesteps + 1,).
+        quantiles: The PFE confidence levels, in the order of `pfe`.
+        ee: Expected exposure E[max(V, 0)], shape (NettingSets, Timesteps + 1).
+        eee: Effective EE (running maximum of EE), same shape as `ee`.
+        epe: Time-averaged EE over the horizon, shape (NettingSets,).
+        eepe: Time-averaged effective EE over the horizon, shape (NettingSets,).
+        pfe: Potential future exposure, shape (Quantiles, NettingSets,
+            Timesteps + 1).
+    """
+
+    netting_set_ids: Tuple[str, ...]
+    times: np.ndarray
+    quantiles: Tuple[float, ...]
+    ee: np.ndarray
+    eee: np.ndarray
+    epe: np.ndarray
+    eepe: np.ndarray
+    pfe: np.ndarray
+
+    def pfe_at(self, quantile: float) -> np.ndarray:
+        """PFE profile at one of the configured quantiles."""
+        try:
+            index = self.quantiles.index(quantile)
+        except ValueError:
+            raise KeyError(f"PFE quantile {quantile} was not computed.")
+        profile: np.ndarray = self.pfe[index]
+        return profile
+
+
+def netting_matrix(
+    trade_ids: Sequence[str], netting_sets: Iterable[NettingSet]
+) -> sparse.csr_matrix:
+    """
+    Builds the sparse (NettingSets, Trades) membership matrix, with a 1 where
+    a trade belongs to a netting set. Columns follow the order of trade_ids.
+
+    Raises:
+        KeyError: If a netting set refers to a trade that is not in trade_ids.
+    """
+    columns = {trade_id: col for col, trade_id in enumerate(trade_ids)}
+
+    rows = []
+    cols = []
+    n_sets = 0
+    for ns in netting_sets:
+        for trade_id in ns.trade_ids:
+            try:
+                cols.append(columns[trade_id])
+            except KeyError:
+                raise KeyError(
+                    f"Trade '{trade_id}' of netting set '{ns.netting_set_id}' "
+                    "is not in the cube."
+                )
+            rows.append(n_sets)
+        n_sets += 1
+
+    data = np.ones(len(rows))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n_sets, len(columns)))
+
+
+class ExposureEngine:
+    """
+    Aggregates trade values at NettingSet level and summarises the exposure.
+
+    Netting is a single sparse (NettingSets x Trades) product over the cube
+    flattened to (Trades, Paths * (Timesteps + 1)), so the cost scales with the
+    number of trade memberships rather than with a Python loop per set. The cube
+    must be in a single reporting currency.
+    """
+
+    def __init__(
+        self, quantiles: Sequence[float] = (0.95,), horizon: float | None = 1.0
+    ) -> None:
+        """
+        Args:
+            quantiles: PFE confidence levels, each in (0, 1).
+            horizon: Averaging horizon in years for EPE and EEPE (the Basel
+                convention is one year). None averages over the whole grid.
+
+        Raises:
+            ValueError: If a quantile is outside (0, 1) or the horizon is not
+                positive.
+        """
+        if any(not 0.0 < q < 1.0 for q in quantiles):
+            raise ValueError(f"PFE quantiles must lie in (0, 1), got {quantiles}.")
+        if horizon is not None and horizon <= 0.0:
+            raise ValueError(f"Averaging horizon must be positive, got {horizon}.")
+        self.quantiles = tuple(quantiles)
+        self.horizon = horizon
+
+    def net(
+        self,
+        cube: np.ndarray,
+        trade_ids: Sequence[str],
+        netting_sets: Sequence[NettingSet],
+    ) -> np.ndarray:
+        """
+        Nets a trade-level cube, returning shape (NettingSets, Paths,
+        Timesteps + 1).
+
+        Raises:
+            KeyError: If a netting set refers to a trade that is not in the cube.
+            ValueError: If trade_ids does not match the cube's first axis.
+        """
+        _check_rows(cube, len(trade_ids), "trades")
+        return _apply(netting_matrix(trade_ids, netting_sets), cube)
+
+    def net_positions(
+        self,
+        cube: np.ndarray,
+        position_ids: Sequence[str],
+        trades: Sequence[Trade],
+        netting_sets: Sequence[NettingSet],
+    ) -> np.ndarray:
+        """
+        Nets a position-level cube straight into netting sets.
+
+        The netting and trade matrices are multiplied first into one sparse
+        (NettingSets, Positions) matrix, so the trade-level cube is never
+        materialised.
+
+        Raises:
+            KeyError: If a trade or netting set reference cannot be resolved.
+            ValueError: If position_ids does not match the cube's first axis.
+        """
+        _check_rows(cube, len(position_ids), "positions")
+        trade_ids = (
+            trades.trade_id.tolist()
+            if isinstance(trades, TradeTable)
+            else [t.trade_id for t in trades]
+        )
+        matrix = netting_matrix(trade_ids, netting_sets) @ (
+            trade_matrix(trades, position_ids)
+        )
+        return _apply(matrix, cube)
+
+    def profiles(
+        self,
+        cube: np.ndarray,
+        trade_ids: Sequence[str],
+        netting_sets: Sequence[NettingSet],
+        times: np.ndarray,
+    ) -> ExposureProfiles:
+        """
+        Nets the (Trades, Paths, Timesteps + 1) cube and computes EE, EEE, EPE,
+        EEPE and PFE for every netting set.
+
+        Raises:
+            KeyError: If a netting set refers to a trade that is not in the cube.
+            ValueError: If the cube does not match trade_ids or times.
+        """
+        _check_times(cube.shape[-1], times)
+        return self._summarise(
+            self.net(cube, trade_ids, netting_sets), netting_sets, times
+        )
+
+    def position_profiles(
+        self,
+        cube: np.ndarray,
+        position_ids: Sequence[str],
+        trades: Sequence[Trade],
+        netting_sets: Sequence[NettingSet],
+        times: np.ndarray,
+    ) -> ExposureProfiles:
+        """
+        Same as profiles, but starting from a (Positions, Paths, Timesteps + 1)
+        cube in which each position was priced once (see net_positions).
+
+        Raises:
+            KeyError: If a trade or netting set reference cannot be resolved.
+            ValueError: If the cube does not match position_ids or times.
+        """
+        _check_times(cube.shape[-1], times)
+        netted = self.net_positions(cube, position_ids, trades, netting_sets)
+        return self._summarise(netted, netting_sets, times)
+
+    def accumulator(
+        self,
+        position_ids: Sequence[str],
+        trades: Sequence[Trade],
+        netting_sets: Sequence[NettingSet],
+        n_paths: int,
+        n_points: int,
+        dtype: npt.DTypeLike = np.float64,
+        spill_dir: "str | os.PathLike[str] | None" = None,
+        currencies: Sequence[Currency] | None = None,
+    ) -> "ExposureAccumulator":
+        """
+        Returns an accumulator that nets position-level cubes arriving in path
+        chunks, for streaming runs that never hold the full position cube.
+
+        Args:
+            position_ids: Position order of the cubes' first axis.
+            trades: The trades on those positions.
+            netting_sets: The netting sets to report.
+            n_paths: Total paths that will be added.
+            n_points: Time points per path.
+            dtype: Storage type of the per-path exposures kept for PFE.
+            spill_dir: Keep those exposures in a temporary file in this
+                directory instead of in memory.
+            currencies: Currency of each position's values. If given, netting
+                sets whose positions are in more than one currency are
+                rejected instead of netted.
+
+        Raises:
+            KeyError: If a trade or netting set reference cannot be resolved.
+            ValueError: If a netting set mixes currencies.
+        """
+        trade_ids = (
+            trades.trade_id.tolist()
+            if isinstance(trades, TradeTable)
+            else [t.trade_id for t in trades]
+        )
+        matrix = netting_matrix(trade_ids, netting_sets) @ (
+            trade_matrix(trades, position_ids)
+        )
+        if currencies is not None:
+            _check_currencies(matrix, netting_sets, currencies)
+        return ExposureAccumulator(
+            self,
+            matrix,
+            tuple(netting_sets),
+            len(position_ids),
+            n_paths,
+            n_points,
+            dtype,
+            spill_dir,
+        )
+
+    def _summarise(
+        self,
+        netted: np.ndarray,
+        netting_sets: Sequence[NettingSet],
+        times: np.ndarray,
+    ) -> ExposureProfiles:
+        with stage("summarise") as probe:
+            exposure = np.maximum(netted, 0.0)
+            ee = exposure.mean(axis=1)
+            pfe = np.quantile(exposure, self.quantiles, axis=1)
+            probe.array("netted", netted)
+        return self._profiles(ee, pfe, netting_sets, times)
+
+    def _profiles(
+        self,
+        ee: np.ndarray,
+        pfe: np.ndarray,
+        netting_sets: Sequence[NettingSet],
+        times: np.ndarray,
+    ) -> ExposureProfiles:
+        """Completes the profiles from EE and PFE"""
+        eee = np.maximum.accumulate(ee, axis=1)
+        weights = _averaging_weights(np.asarray(times, dtype=np.float64), self.horizon)
+        return ExposureProfiles(
+            netting_set_ids=tuple(ns.netting_set_id for ns in netting_sets),
+            times=np.asarray(times),
+            quantiles=self.quantiles,
+            ee=ee,
+            eee=eee,
+            epe=ee @ weights,
+            eepe=eee @ weights,
+            pfe=pfe,
+        )
+
+
+# Elements of the exposure buffer read per quantile pass, bounding the copy
+# np.quantile makes when the buffer is spilled to disk
+_QUANTILE_BLOCK_ELEMENTS = 1 << 22
+
+
+class ExposureAccumulator:
+    """
+    Nets path chunks of a position-level cube into netting-set statistics.
+
+    EE and everything derived from it (EEE, EPE, EEPE) come from a running
+    float64 sum of the positive exposure, so they need no per-path storage.
+    PFE quantiles need every path: their exposures are kept in a
+    (NettingSets, Paths, Timesteps + 1) buffer of the given dtype, in memory
+    or, with spill_dir, in a temporary file. An engine without quantiles
+    keeps no paths at all. Chunks must arrive in path order. Build one with
+    ExposureEngine.accumulator.
+    """
+
+    def __init__(
+        self,
+        engine: ExposureEngine,
+        matrix: sparse.csr_matrix,
+        netting_sets: Tuple[NettingSet, ...],
+        n_positions: int,
+        n_paths: int,
+        n_points: int,
+        dtype: npt.DTypeLike = np.float64,
+        spill_dir: "str | os.PathLike[str] | None" = None,
+    ) -> None:
+        self.engine = engine
+        self.netting_sets = netting_sets
+        self.n_positions = n_positions
+        self.n_paths = n_paths
+        self.n_points = n_points
+        self._matrix = matrix
+        self._exposure_sum = np.zeros((len(netting_sets), n_points))
+        self._filled = 0
+
+        self._exposure: np.ndarray | None = None
+        shape = (len(netting_sets), n_paths, n_points)
+        if engine.quantiles and spill_dir is not None:
+            # The anonymous file is removed as soon as the buffer is released
+            backing = tempfile.TemporaryFile(dir=spill_dir)
+            self._exposure = np.memmap(backing, dtype=dtype, mode="w+", shape=shape)
+        elif engine.quantiles:
+            self._exposure = np.empty(shape, dtype=dtype)
+
+    @property
+    def n_filled(self) -> int:
+        """Number of paths accumulated so far."""
+        return self._filled
+
+    def add(self, cube: np.ndarray) -> None:
+        """
+        Nets the next (Positions, Paths, Timesteps + 1) chunk.
+
+        Raises:
+            ValueError: If the chunk does not match the positions, time grid or
+                remaining paths.
+        """
+        _check_rows(cube, self.n_positions, "positions")
+        if cube.shape[-1] != self.n_points:
+            raise ValueError(
+                f"Chunk has {cube.shape[-1]} time points, expected {self.n_points}."
+            )
+        start, stop = self._filled, self._filled + cube.shape[1]
+        if stop > self.n_paths:
+            raise ValueError(
+                f"Chunk of {cube.shape[1]} paths overflows the declared "
+                f"{self.n_paths} paths."
+            )
+        exposure = np.maximum(_apply(self._matrix, cube), 0.0)
+        self._exposure_sum += exposure.sum(axis=1, dtype=np.float64)
+        if self._exposure is not None:
+            self._exposure[:, start:stop] = exposure
+        self._filled = stop
+
+    def profiles(self, times: np.ndarray) -> ExposureProfiles:
+        """
+        Summarises the accumulated paths, as position_profiles would on the
+        concatenated cube (EE up to summation order).
+
+        Raises:
+            ValueError: If some declared paths have not been accumulated.
+        """
+        if self._filled != self.n_paths:
+            raise ValueError(f"Accumulated {self._filled} of {self.n_paths} paths.")
+        _check_times(self.n_points, times)
+
+        quantiles = self.engine.quantiles
+        with stage("summarise") as probe:
+            ee = self._exposure_sum / self.n_paths
+            pfe = np.empty((len(quantiles), len(self.netting_sets), self.n_points))
+            if self._exposure is not None:
+                probe.array("exposure", self._exposure)
+                block = max(
+                    1, _QUANTILE_BLOCK_ELEMENTS // max(self.n_paths * self.n_points, 1)
+                )
+                for lo in range(0, len(self.netting_sets), block):
+                    pfe[:, lo : lo + block] = np.quantile(
+                        self._exposure[lo : lo + block], quantiles, axis=1
+                    )
+        return self.engine._profiles(ee, pfe, self.netting_sets, times)
+
+
+def _check_rows(cube: np.ndarray, n_rows: int, label: str) -> None:
+    if cube.ndim != 3 or cube.shape[0] != n_rows:
+        raise ValueError(f"Cube of shape {cube.shape} does not match {n_rows} {label}.")
+
+
+def _check_times(n_points: int, times: np.ndarray) -> None:
+    if n_points != len(times):
+        raise ValueError(
+            f"Cube has {n_points} time points but {len(times)} times given."
+        )
+
+
+def _check_currencies(
+    matrix: sparse.csr_matrix,
+    netting_sets: Sequence[NettingSet],
+    currencies: Sequence[Currency],
+) -> None:
+    labels, codes = np.unique([ccy.value for ccy in currencies], return_inverse=True)
+    for row, ns in enumerate(netting_sets):
+        members = matrix.indices[matrix.indptr[row] : matrix.indptr[row + 1]]
+        used = np.unique(codes[members])
+        if len(used) > 1:
+            raise ValueError(
+                f"Netting set '{ns.netting_set_id}' mixes values in "
+                f"{', '.join(labels[used])}; convert them to one reporting "
+                "currency before netting."
+            )
+
+
+def _apply(matrix: sparse.csr_matrix, cube: np.ndarray) -> np.ndarray:
+    """Sparse (Rows, n) product with a (n, Paths, Timesteps + 1) cube."""
+    with stage("aggregate") as probe:
+        flat = matrix.astype(cube.dtype) @ cube.reshape(cube.shape[0], -1)
+        result: np.ndarray = flat.reshape((matrix.shape[0],) + cube.shape[1:])
+        probe.array("cube", cube)
+        probe.array("netted", result)
+        return result
+
+
+def _averaging_weights(times: np.ndarray, horizon: float | None) -> np.ndarray:
+    """
+    Time-averaging weights over the grid: EE(t_k) is weighted by
+    t_k - t_{k-1} for every t_k within the horizon, normalised to sum to one.
+    """
+    dt = np.diff(times, prepend=times[0])
+    if horizon is not None:
+        dt[times > horizon + 1e-12] = 0.0
+
+    total = dt.sum()
+    if total <= 0.0:
+        # Degenerate grid (a single point): the average is the value at t_0
+        weights = np.zeros_like(times)
+        weights[0] = 1.0
+        return weights
+    result: np.ndarray = dt / total
+    return result
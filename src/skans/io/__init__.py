@@ -0,0 +1,19 @@
+"""
+IO Module: Loads trades, positions and netting sets from pandas, CSV and Parquet.
+"""
+
+from .loaders import (
+    compile_positions,
+    load_netting_sets,
+    load_positions,
+    load_trades,
+    read_table,
+)
+
+__all__ = [
+    "compile_positions",
+    "load_netting_sets",
+    "load_positions",
+    "load_trades",
+    "read_table",
+]
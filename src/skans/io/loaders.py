@@ -0,0 +1,326 @@
+"""
+Vectorized loaders for trades, positions and netting sets.
+
+Sources are DataFrames or CSV/Parquet files with one row per record. Enum
+columns are validated and converted for the whole column at once through a
+hashed pandas Index lookup, and domain objects are built from pre-converted
+columns instead of parsing row by row. For large books, load_trades(lazy=True) and
+compile_positions skip object creation entirely and feed the pricing and
+aggregation layers with NumPy columns.
+"""
+
+import os
+from datetime import date
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Type, TypeAlias, Union
+import numpy as np
+import pandas as pd
+
+from skans.domain.instruments import EquityForward, EquityOption, FXForward, FXOption
+from skans.domain.portfolio import AnyInstrument, NettingSet, Position, Trade
+from skans.domain.table import DIRECTION_CODES, TradeTable
+from skans.domain.types.enums import Currency, LongShort, OptionType
+from skans.market.book import (
+    DAYS_PER_YEAR,
+    NO_CURRENCY,
+    NO_OPTION,
+    OPTION_TYPE_CODES,
+    InstrumentBook,
+    InstrumentColumns,
+)
+from skans.market.environment import RiskFactorSchema
+
+FrameSource: TypeAlias = Union[pd.DataFrame, str, "os.PathLike[str]"]
+
+TRADE_COLUMNS = (
+    "trade_id",
+    "position_id",
+    "counterparty_id",
+    "quantity",
+    "direction",
+)
+POSITION_COLUMNS = ("position_id", "instrument_type", "strike", "maturity_date")
+NETTING_SET_COLUMNS = ("netting_set_id", "counterparty_id", "trade_id")
+
+# Identifier columns, read from CSV as text so that e.g. "007" stays "007"
+ID_COLUMNS = (
+    "trade_id",
+    "position_id",
+    "counterparty_id",
+    "netting_set_id",
+    "underlying_id",
+)
+
+# instrument_type values, by class name
+INSTRUMENT_TYPES: Dict[str, Type[AnyInstrument]] = {
+    t.__name__: t for t in (EquityForward, EquityOption, FXForward, FXOption)
+}
+_EQUITY = (EquityForward, EquityOption)
+_OPTIONS = (EquityOption, FXOption)
+
+
+def read_table(source: FrameSource) -> pd.DataFrame:
+    """
+    Returns source itself if it is a DataFrame, else reads a .csv or .parquet
+    file (Parquet needs pyarrow or fastparquet installed). CSV ID_COLUMNS are
+    read as text rather than type-inferred.
+
+    Raises:
+        ValueError: If the file extension is not recognised.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source
+
+    path = Path(source)
+    if path.suffix == ".csv":
+        return pd.read_csv(path, dtype={column: str for column in ID_COLUMNS})
+    if path.suffix in (".parquet", ".pq"):
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported table format '{path.suffix}' for {path}.")
+
+
+def _require(frame: pd.DataFrame, columns: Sequence[str]) -> None:
+    for column in columns:
+        if column not in frame.columns:
+            raise KeyError(f"Column '{column}' not found in frame.")
+
+
+def _require_complete(frame: pd.DataFrame, columns: Sequence[str]) -> None:
+    """Checks that every column exists and has a value in every row"""
+    _require(frame, columns)
+    incomplete = frame[list(columns)].isna().any()
+    if incomplete.any():
+        column = incomplete.index[incomplete.to_numpy()][0]
+        raise ValueError(f"Column '{column}' has missing values for some rows.")
+
+
+def _enum_codes(values: pd.Series, enum: Type[Enum], column: str) -> np.ndarray:
+    """
+    Validates a column against an Enum's values in one pass, returning the
+    position of each value in list(enum) as int8.
+    """
+    codes = pd.Index([m.value for m in enum]).get_indexer(values)
+    invalid = codes < 0
+    if invalid.any():
+        bad = pd.unique(values[invalid].astype(str))[:5]
+        raise ValueError(
+            f"Invalid {enum.__name__} value(s) in column '{column}': {list(bad)}."
+        )
+    return np.asarray(codes, dtype=np.int8)
+
+
+def _text(values: pd.Series) -> np.ndarray:
+    return np.asarray(values.astype(str).to_numpy(dtype=object))
+
+
+def _trade_columns(frame: pd.DataFrame) -> TradeTable:
+    _require_complete(frame, TRADE_COLUMNS)
+    direction_codes = np.array([DIRECTION_CODES[d] for d in LongShort], np.int8)
+    return TradeTable.from_columns(
+        trade_id=_text(frame["trade_id"]).tolist(),
+        position_id=_text(frame["position_id"]).tolist(),
+        counterparty_id=_text(frame["counterparty_id"]).tolist(),
+        quantity=frame["quantity"].to_numpy(dtype=np.float64),
+        direction=direction_codes[
+            _enum_codes(frame["direction"], LongShort, "direction")
+        ],
+    )
+
+
+def load_trades(source: FrameSource, lazy: bool = False) -> Sequence[Trade]:
+    """
+    Loads trades from a frame with the TRADE_COLUMNS columns.
+
+    Returns a tuple of Trades, or with lazy=True a TradeTable that only builds
+    a Trade when one is accessed.
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If a required value is missing or the direction column
+            holds an unknown value.
+    """
+    table = _trade_columns(read_table(source))
+    if lazy:
+        return table
+    return tuple(table)
+
+
+def load_netting_sets(source: FrameSource) -> Tuple[NettingSet, ...]:
+    """
+    Loads netting sets from a frame with one (netting_set_id, counterparty_id,
+    trade_id) row per member trade.
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If a required value is missing or a netting set lists more
+            than one counterparty.
+    """
+    frame = read_table(source)
+    _require_complete(frame, NETTING_SET_COLUMNS)
+    frame = frame.astype({c: str for c in NETTING_SET_COLUMNS})
+
+    netting_sets = []
+    for netting_set_id, group in frame.groupby("netting_set_id", sort=False):
+        counterparties = group["counterparty_id"].unique()
+        if len(counterparties) != 1:
+            raise ValueError(
+                f"Netting set '{netting_set_id}' has several counterparties: "
+                f"{list(counterparties)}."
+            )
+        netting_sets.append(
+            NettingSet(
+                netting_set_id=str(netting_set_id),
+                counterparty_id=counterparties[0],
+                trade_ids=frozenset(group["trade_id"]),
+            )
+        )
+    return tuple(netting_sets)
+
+
+class _PositionColumns:
+    """Validated position columns, with row groups per instrument type."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        _require_complete(frame, POSITION_COLUMNS)
+        type_names = list(INSTRUMENT_TYPES)
+        type_codes = pd.Index(type_names).get_indexer(frame["instrument_type"])
+        if (type_codes < 0).any():
+            bad = pd.unique(frame["instrument_type"][type_codes < 0].astype(str))
+            raise ValueError(f"Unsupported instrument type(s): {list(bad[:5])}.")
+
+        self.frame = frame
+        self.position_ids = _text(frame["position_id"])
+        self.strike = frame["strike"].to_numpy(dtype=np.float64)
+        self.maturity = pd.to_datetime(frame["maturity_date"]).to_numpy(
+            dtype="datetime64[D]"
+        )
+        self.rows: Dict[Type[AnyInstrument], np.ndarray] = {}
+        for code, name in enumerate(type_names):
+            rows = np.flatnonzero(type_codes == code)
+            if rows.size:
+                self.rows[INSTRUMENT_TYPES[name]] = rows
+
+    def column(self, name: str, rows: np.ndarray) -> pd.Series:
+        _require(self.frame, [name])
+        values = self.frame[name].iloc[rows]
+        if values.isna().any():
+            raise ValueError(f"Column '{name}' has missing values for some rows.")
+        return values
+
+    def codes(self, name: str, enum: Type[Enum], rows: np.ndarray) -> np.ndarray:
+        return _enum_codes(self.column(name, rows), enum, name)
+
+
+def load_positions(source: FrameSource) -> Tuple[Position, ...]:
+    """
+    Loads Positions from a frame with the POSITION_COLUMNS columns plus, per
+    instrument_type: underlying_id and currency (equities), base_currency and
+    quote_currency (FX), and option_type (options).
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If an enum column holds an unknown value, a required value
+            is missing, or an instrument type is not supported.
+    """
+    cols = _PositionColumns(read_table(source))
+    currencies = np.array(list(Currency), dtype=object)
+    option_types = np.array(list(OptionType), dtype=object)
+    maturities = cols.maturity.tolist()
+    strikes = cols.strike.tolist()
+
+    instruments: List[AnyInstrument | None] = [None] * len(cols.position_ids)
+    for inst_type, rows in cols.rows.items():
+        if inst_type in _EQUITY:
+            fields = [
+                _text(cols.column("underlying_id", rows)).tolist(),
+                [strikes[i] for i in rows],
+                [maturities[i] for i in rows],
+                currencies[cols.codes("currency", Currency, rows)].tolist(),
+            ]
+        else:
+            fields = [
+                currencies[cols.codes("base_currency", Currency, rows)].tolist(),
+                currencies[cols.codes("quote_currency", Currency, rows)].tolist(),
+                [strikes[i] for i in rows],
+                [maturities[i] for i in rows],
+            ]
+        if inst_type in _OPTIONS:
+            fields.append(
+                option_types[cols.codes("option_type", OptionType, rows)].tolist()
+            )
+
+        for row, args in zip(rows.tolist(), zip(*fields)):
+            instruments[row] = inst_type(*args)
+
+    return tuple(
+        Position(position_id=pid, instrument=inst)  # type: ignore[arg-type]
+        for pid, inst in zip(cols.position_ids.tolist(), instruments)
+    )
+
+
+def compile_positions(
+    source: FrameSource, schema: RiskFactorSchema, valuation_date: date
+) -> InstrumentBook:
+    """
+    Compiles a position frame straight into an InstrumentBook, equal to
+    BookCompiler().compile(load_positions(source), ...) but without creating
+    any Position objects.
+
+    Raises:
+        KeyError: If a required column or a risk factor is missing.
+        ValueError: As for load_positions.
+    """
+    cols = _PositionColumns(read_table(source))
+    currency_codes = np.arange(len(Currency), dtype=np.int8)
+    option_codes = np.array([OPTION_TYPE_CODES[o] for o in OptionType], np.int8)
+    pair_names = np.array(
+        [b.value + q.value for b in Currency for q in Currency], dtype=object
+    )
+    maturity = (cols.maturity - np.datetime64(valuation_date, "D")).astype(
+        np.float64
+    ) / DAYS_PER_YEAR
+
+    columns: Dict[Type[AnyInstrument], InstrumentColumns] = {}
+    for inst_type, rows in cols.rows.items():
+        if inst_type in _EQUITY:
+            factors = _text(cols.column("underlying_id", rows))
+            currency = currency_codes[cols.codes("currency", Currency, rows)]
+            base_currency = np.full(len(rows), NO_CURRENCY, dtype=np.int8)
+        else:
+            base_currency = cols.codes("base_currency", Currency, rows)
+            currency = cols.codes("quote_currency", Currency, rows)
+            factors = pair_names[
+                base_currency.astype(np.intp) * len(Currency) + currency
+            ]
+
+        if inst_type in _OPTIONS:
+            option_type = option_codes[cols.codes("option_type", OptionType, rows)]
+        else:
+            option_type = np.full(len(rows), NO_OPTION, dtype=np.int8)
+
+        columns[inst_type] = InstrumentColumns(
+            rows=rows.astype(np.int64),
+            factor_index=_factor_indices(factors, schema),
+            strike=cols.strike[rows],
+            maturity=maturity[rows],
+            option_type=option_type,
+            currency=currency,
+            base_currency=base_currency,
+        )
+
+    return InstrumentBook(
+        schema=schema,
+        valuation_date=valuation_date,
+        position_ids=tuple(cols.position_ids.tolist()),
+        columns=columns,
+    )
+
+
+def _factor_indices(factors: np.ndarray, schema: RiskFactorSchema) -> np.ndarray:
+    indices = pd.Series(factors).map(schema.factor_indices)
+    missing = indices.isna().to_numpy()
+    if missing.any():
+        schema.get_index(factors[missing][0])  # raises the schema's KeyError
+    result: np.ndarray = indices.to_numpy(dtype=np.intp)
+    return result
@@ -2,7 +2,41 @@
 Market Module: Responsible for SDE orchestration and state generation.
 """
 
+from .book import BookCompiler, InstrumentBook, InstrumentColumns
 from .environment import MarketEnvironment, RiskFactorSchema
-from .resolver import DependencyResolver
+from .generator import GBMParameters, MarketGenerator
+from .grid import DEFAULT_SEGMENTS, GridSegment, maturity_grid, time_grid
+from .parallel import ParallelMarketGenerator
+from .resolver import DependencyResolver, IncrementalDependencyResolver, SchemaUpdate
+from .shared import (
+    SharedEnvironmentHandle,
+    SharedMarketEnvironment,
+    attach_environment,
+    detach_environment,
+)
+from .storage import load_environment, save_environment, save_environment_chunks
 
-__all__ = ["MarketEnvironment", "RiskFactorSchema", "DependencyResolver"]
+__all__ = [
+    "MarketEnvironment",
+    "RiskFactorSchema",
+    "DependencyResolver",
+    "IncrementalDependencyResolver",
+    "SchemaUpdate",
+    "BookCompiler",
+    "InstrumentBook",
+    "InstrumentColumns",
+    "GBMParameters",
+    "MarketGenerator",
+    "ParallelMarketGenerator",
+    "DEFAULT_SEGMENTS",
+    "GridSegment",
+    "maturity_grid",
+    "time_grid",
+    "load_environment",
+    "save_environment",
+    "save_environment_chunks",
+    "SharedEnvironmentHandle",
+    "SharedMarketEnvironment",
+    "attach_environment",
+    "detach_environment",
+]
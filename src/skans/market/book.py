@@ -0,0 +1,181 @@
+"""
+Columnar Instrument Book for the Skans Risk Engine.
+Compiles Positions into struct-of-arrays NumPy columns per instrument type.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Tuple, Type
+import numpy as np
+
+from skans.domain.portfolio import AnyInstrument, Position
+from skans.domain.instruments.equity import EquityForward, EquityOption
+from skans.domain.instruments.fx import FXForward, FXOption
+from skans.domain.types.enums import Currency, OptionType
+from skans.market.environment import RiskFactorSchema
+from skans.market.resolver import risk_factor_of
+
+DAYS_PER_YEAR = 365.0
+
+# Integer codes used in the compiled columns
+CURRENCY_CODES: Dict[Currency, int] = {ccy: code for code, ccy in enumerate(Currency)}
+OPTION_TYPE_CODES: Dict[OptionType, int] = {OptionType.CALL: 1, OptionType.PUT: -1}
+NO_CURRENCY = -1
+NO_OPTION = 0
+
+INSTRUMENT_TYPES: Tuple[Type[AnyInstrument], ...] = (
+    EquityForward,
+    FXForward,
+    EquityOption,
+    FXOption,
+)
+
+
+@dataclass(frozen=True)
+class InstrumentColumns:
+    """
+    Struct-of-arrays view of all positions of one instrument type.
+
+    Attributes:
+        rows: Index of each position in the compiled position sequence.
+        factor_index: Tensor index of the driving risk factor (RiskFactorSchema).
+        strike: Contractual strike.
+        maturity: Maturity as an ACT/365 year fraction from the valuation date.
+        option_type: +1 for calls, -1 for puts, 0 for forwards.
+        currency: Pricing currency code (the quote currency for FX).
+        base_currency: Base currency code for FX, -1 for equities.
+    """
+
+    rows: np.ndarray
+    factor_index: np.ndarray
+    strike: np.ndarray
+    maturity: np.ndarray
+    option_type: np.ndarray
+    currency: np.ndarray
+    base_currency: np.ndarray
+
+    def __post_init__(self) -> None:
+        """Lock the columns; compiled books are shared and cached."""
+        for column in vars(self).values():
+            column.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in vars(self).values())
+
+
+@dataclass(frozen=True)
+class InstrumentBook:
+    """
+    An immutable, columnar compilation of a position sequence against a schema.
+
+    Compile once and reuse it for every pricing pass over environments that
+    share the schema; nothing in it refers back to the Position objects.
+
+    Attributes:
+        schema: The schema the factor indices refer to.
+        valuation_date: The date maturities are measured from.
+        position_ids: Position identifiers in compiled row order.
+        columns: Columns per instrument type, omitting types with no positions.
+    """
+
+    schema: RiskFactorSchema
+    valuation_date: date
+    position_ids: Tuple[str, ...]
+    columns: Dict[Type[AnyInstrument], InstrumentColumns]
+
+    def __len__(self) -> int:
+        return len(self.position_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(columns.nbytes for columns in self.columns.values())
+
+    @property
+    def currencies(self) -> np.ndarray:
+        """Pricing currency code of each position, in compiled row order."""
+        codes = np.full(len(self), NO_CURRENCY, dtype=np.int8)
+        for columns in self.columns.values():
+            codes[columns.rows] = columns.currency
+        return codes
+
+
+class BookCompiler:
+    """
+    Turns Positions into an InstrumentBook of typed NumPy columns.
+    """
+
+    def compile(
+        self,
+        positions: Iterable[Position],
+        schema: RiskFactorSchema,
+        valuation_date: date,
+    ) -> InstrumentBook:
+        """
+        Walks the positions once, appending each to its instrument type's
+        columns.
+
+        Raises:
+            KeyError: If a position's risk factor is not in the schema.
+            TypeError: If an instrument type is not supported.
+        """
+        rows: Dict[Type[AnyInstrument], List[Tuple[float, ...]]] = {
+            t: [] for t in INSTRUMENT_TYPES
+        }
+        position_ids: List[str] = []
+
+        for row, pos in enumerate(positions):
+            inst = pos.instrument
+            if type(inst) not in rows:
+                raise TypeError(f"Unsupported instrument type in book: {type(inst)}")
+
+            option_type = NO_OPTION
+            if isinstance(inst, (EquityOption, FXOption)):
+                option_type = OPTION_TYPE_CODES[inst.option_type]
+
+            if isinstance(inst, (EquityForward, EquityOption)):
+                currency, base_currency = CURRENCY_CODES[inst.currency], NO_CURRENCY
+            else:
+                currency = CURRENCY_CODES[inst.quote_currency]
+                base_currency = CURRENCY_CODES[inst.base_currency]
+
+            rows[type(inst)].append(
+                (
+                    row,
+                    schema.get_index(risk_factor_of(inst)),
+                    inst.strike,
+                    (inst.maturity_date - valuation_date).days / DAYS_PER_YEAR,
+                    option_type,
+                    currency,
+                    base_currency,
+                )
+            )
+            position_ids.append(pos.position_id)
+
+        columns = {
+            inst_type: self._to_columns(data)
+            for inst_type, data in rows.items()
+            if data
+        }
+        return InstrumentBook(
+            schema=schema,
+            valuation_date=valuation_date,
+            position_ids=tuple(position_ids),
+            columns=columns,
+        )
+
+    @staticmethod
+    def _to_columns(data: List[Tuple[float, ...]]) -> InstrumentColumns:
+        table = np.array(data, dtype=np.float64).T
+        return InstrumentColumns(
+            rows=table[0].astype(np.int64),
+            factor_index=table[1].astype(np.intp),
+            strike=table[2],
+            maturity=table[3],
+            option_type=table[4].astype(np.int8),
+            currency=table[5].astype(np.int8),
+            base_currency=table[6].astype(np.int8),
+        )
@@ -3,10 +3,17 @@ Market Environment DTOs for the Skans Risk Engine.
 Provides the memory-efficient handoff between the Generator and the Engine.
 """
 
+import hashlib
+import json
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict
 import numpy as np
 
+# Rows of the state tensor hashed per update, bounding the temporary copy
+# made for non-contiguous tensors
+_FINGERPRINT_BLOCK_BYTES = 1 << 24
+
 
 @dataclass(frozen=True)
 class RiskFactorSchema:
@@ -41,16 +48,65 @@ class MarketEnvironment:
     Attributes:
         schema: The index mapping for the tensor's 3rd dimension.
         state_tensor: 3D NumPy array of shape (Paths, Timesteps + 1, RiskFactors).
-        dt: The time step increment (e.g., 1/252 for daily steps).
+        dt: The time step increment (e.g., 1/252 for daily steps); with a
+            time_grid, the average step.
+        time_grid: Optional explicit simulation times in years, shape
+            (Timesteps + 1,), for non-uniform grids. None means uniform steps
+            of dt.
     """
 
     schema: RiskFactorSchema
     state_tensor: np.ndarray
     dt: float
+    time_grid: np.ndarray | None = None
 
     def __post_init__(self) -> None:
         """
         Defensive programming: Lock the tensor to prevent accidental in-place
         mutation by the Valuation Engine.
+
+        Raises:
+            ValueError: If the time grid does not match the tensor's 2nd axis.
         """
         self.state_tensor.flags.writeable = False
+        if self.time_grid is not None:
+            if self.time_grid.shape != (self.state_tensor.shape[1],):
+                raise ValueError(
+                    f"Time grid of shape {self.time_grid.shape} does not match "
+                    f"{self.state_tensor.shape[1]} time points."
+                )
+            self.time_grid.flags.writeable = False
+
+    @property
+    def times(self) -> np.ndarray:
+        """Simulation times in years for each point on the tensor's 2nd axis."""
+        if self.time_grid is not None:
+            return self.time_grid
+        return self.dt * np.arange(self.state_tensor.shape[1])
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Content hash of the environment (schema, time grid, layout and tensor
+        data).
+
+        Computed on first access and cached; this is safe because the tensor
+        is locked read-only. Equal environments have equal fingerprints, so it
+        can key caches of derived results such as MTM cubes.
+        """
+        tensor = self.state_tensor
+        digest = hashlib.blake2b(digest_size=16)
+        header = {
+            "factor_indices": sorted(self.schema.factor_indices.items()),
+            "dt": self.dt,
+            "time_grid": None if self.time_grid is None else self.time_grid.tolist(),
+            "shape": tensor.shape,
+            "dtype": tensor.dtype.str,
+        }
+        digest.update(json.dumps(header).encode())
+
+        row_bytes = max(tensor[:1].nbytes, 1)
+        block = max(_FINGERPRINT_BLOCK_BYTES // row_bytes, 1)
+        for start in range(0, tensor.shape[0], block):
+            digest.update(np.ascontiguousarray(tensor[start : start + block]).data)
+        return digest.hexdigest()
@@ -0,0 +1,227 @@
+"""
+Market Generator for the Skans Risk Engine.
+Simulates every factor of a RiskFactorSchema into a single MarketEnvironment.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Mapping, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from skans.core.instrumentation import stage
+from skans.core.rng import GeneratorRng, RandomNumberGenerator, SimpleRng
+from skans.core.sde import (
+    PathConstruction,
+    VarianceReduction,
+    correlated_geometric_brownian_motion,
+)
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+
+
+@dataclass(frozen=True)
+class GBMParameters:
+    """
+    Per-factor Geometric Brownian Motion parameters.
+
+    Every vector is aligned with the integer indices of a RiskFactorSchema,
+    i.e. element i belongs to the factor whose index is i.
+
+    Attributes:
+        S0: Initial levels, shape (RiskFactors,).
+        mu: Drift rates, shape (RiskFactors,).
+        sigma: Volatilities, shape (RiskFactors,).
+        correlation: Correlation matrix, shape (RiskFactors, RiskFactors).
+    """
+
+    S0: np.ndarray
+    mu: np.ndarray
+    sigma: np.ndarray
+    correlation: np.ndarray
+
+    def __post_init__(self) -> None:
+        n_factors = self.S0.shape[0]
+        if self.mu.shape != (n_factors,) or self.sigma.shape != (n_factors,):
+            raise ValueError("S0, mu and sigma must be vectors of equal length.")
+        if self.correlation.shape != (n_factors, n_factors):
+            raise ValueError(
+                f"Correlation matrix must have shape ({n_factors}, {n_factors}), "
+                f"got {self.correlation.shape}."
+            )
+
+    @property
+    def n_factors(self) -> int:
+        return int(self.S0.shape[0])
+
+    @classmethod
+    def from_schema(
+        cls,
+        schema: RiskFactorSchema,
+        S0: Mapping[str, float],
+        mu: Mapping[str, float],
+        sigma: Mapping[str, float],
+        correlation: np.ndarray | None = None,
+    ) -> "GBMParameters":
+        """
+        Builds schema-aligned parameter vectors from per-factor mappings.
+
+        Raises:
+            KeyError: If a factor in the schema has no parameter.
+        """
+        n_factors = len(schema.factor_indices)
+        vectors = {"S0": S0, "mu": mu, "sigma": sigma}
+        aligned = {name: np.empty(n_factors) for name in vectors}
+
+        for factor, idx in schema.factor_indices.items():
+            for name, values in vectors.items():
+                try:
+                    aligned[name][idx] = values[factor]
+                except KeyError:
+                    raise KeyError(f"Missing {name} for risk factor '{factor}'.")
+
+        if correlation is None:
+            correlation = np.eye(n_factors)
+
+        return cls(
+            S0=aligned["S0"],
+            mu=aligned["mu"],
+            sigma=aligned["sigma"],
+            correlation=np.asarray(correlation, dtype=np.float64),
+        )
+
+
+class MarketGenerator:
+    """
+    Simulates the joint evolution of all risk factors in a schema and
+    wraps the result in an immutable MarketEnvironment.
+    """
+
+    def __init__(
+        self,
+        rng: RandomNumberGenerator | None = None,
+        construction: PathConstruction = PathConstruction.STANDARD,
+        variance_reduction: VarianceReduction = VarianceReduction.NONE,
+        dtype: npt.DTypeLike = np.float64,
+    ) -> None:
+        self.rng = rng if rng is not None else SimpleRng()
+        self.construction = construction
+        self.variance_reduction = variance_reduction
+        self.dtype = np.dtype(dtype)
+
+    def generate(
+        self,
+        schema: RiskFactorSchema,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        n_paths: int,
+        times: npt.ArrayLike | None = None,
+    ) -> MarketEnvironment:
+        """
+        Fills one preallocated (Paths, Timesteps + 1, RiskFactors) tensor with
+        correlated GBM paths in a single vectorized pass.
+
+        An explicit time grid of n_steps + 1 points from 0 to T (see
+        skans.market.grid) replaces the uniform steps of T / n_steps and is
+        carried on the environment.
+
+        Raises:
+            ValueError: If the parameters do not cover every factor in the
+                schema, or the time grid is malformed.
+        """
+        self._validate(schema, params)
+        return self._simulate(schema, params, T, n_steps, n_paths, self.rng, times)
+
+    def generate_chunks(
+        self,
+        schema: RiskFactorSchema,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        n_paths: int,
+        chunk_size: int,
+        times: npt.ArrayLike | None = None,
+    ) -> Iterator[MarketEnvironment]:
+        """
+        Yields MarketEnvironments holding consecutive blocks of at most
+        chunk_size paths, all sharing the same schema.
+
+        The random stream continues from one block to the next, so without
+        variance reduction the blocks concatenate to exactly the tensor that
+        generate() would produce. Antithetic and moment-matching schemes are
+        applied within each block.
+
+        Raises:
+            ValueError: If the parameters do not cover every factor in the
+                schema, or the time grid is malformed.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+        self._validate(schema, params)
+
+        # A GeneratorRng opens a new draw per call; hold one draw open instead
+        rng: RandomNumberGenerator = (
+            self.rng.stream() if isinstance(self.rng, GeneratorRng) else self.rng
+        )
+
+        for start in range(0, n_paths, chunk_size):
+            block = min(chunk_size, n_paths - start)
+            yield self._simulate(schema, params, T, n_steps, block, rng, times)
+
+    def _validate(self, schema: RiskFactorSchema, params: GBMParameters) -> None:
+        n_factors = len(schema.factor_indices)
+        if params.n_factors != n_factors:
+            raise ValueError(
+                f"Parameters cover {params.n_factors} factors but the schema "
+                f"defines {n_factors}."
+            )
+
+    def _simulate(
+        self,
+        schema: RiskFactorSchema,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        n_paths: int,
+        rng: RandomNumberGenerator,
+        times: npt.ArrayLike | None = None,
+    ) -> MarketEnvironment:
+        with stage("simulate") as probe:
+            state_tensor = self._allocate((n_paths, n_steps + 1, params.n_factors))
+            self._fill(state_tensor, params, T, n_steps, rng, times)
+            probe.array("state_tensor", state_tensor)
+
+        return MarketEnvironment(
+            schema=schema,
+            state_tensor=state_tensor,
+            dt=T / n_steps,
+            time_grid=None if times is None else np.array(times, dtype=np.float64),
+        )
+
+    def _allocate(self, shape: Tuple[int, int, int]) -> np.ndarray:
+        """The uninitialised state tensor the environment will hold"""
+        return np.empty(shape, dtype=self.dtype)
+
+    def _fill(
+        self,
+        out: np.ndarray,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        rng: RandomNumberGenerator,
+        times: npt.ArrayLike | None,
+    ) -> None:
+        """Writes correlated GBM paths into out (Paths, Timesteps + 1, RiskFactors)"""
+        correlated_geometric_brownian_motion(
+            params.S0,
+            params.mu,
+            params.sigma,
+            params.correlation,
+            T,
+            n_steps,
+            out.shape[0],
+            rng=rng,
+            out=out,
+            construction=self.construction,
+            variance_reduction=self.variance_reduction,
+            times=times,
+        )
@@ -0,0 +1,126 @@
+"""
+Non-uniform simulation date grids for the Skans Risk Engine.
+
+Exposure profiles need fine resolution early on (margin periods, short-dated
+trades) and only coarse resolution years out, so a uniform daily grid spends
+most of its steps where nothing happens. The builders here return times in
+years for MarketGenerator.generate(..., times=grid): dense in the front,
+sparser further out, with every trade maturity added as an exact grid point
+so settlements fall on the grid.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from skans.domain.portfolio import Position
+from skans.market.book import DAYS_PER_YEAR, InstrumentBook
+
+
+@dataclass(frozen=True)
+class GridSegment:
+    """
+    A stretch of the grid with a constant step.
+
+    Attributes:
+        until_days: Last day (from the valuation date) covered by the segment.
+        step_days: Spacing of grid points within the segment, in days.
+    """
+
+    until_days: int
+    step_days: int
+
+    def __post_init__(self) -> None:
+        if self.until_days < 1 or self.step_days < 1:
+            raise ValueError("Grid segments need positive until_days and step_days.")
+
+
+# Daily for a month, weekly to one year, then monthly
+DEFAULT_SEGMENTS: Tuple[GridSegment, ...] = (
+    GridSegment(until_days=30, step_days=1),
+    GridSegment(until_days=365, step_days=7),
+    GridSegment(until_days=365 * 100, step_days=30),
+)
+
+
+def time_grid(
+    horizon_days: int,
+    segments: Tuple[GridSegment, ...] = DEFAULT_SEGMENTS,
+    extra_days: npt.ArrayLike = (),
+) -> np.ndarray:
+    """
+    Returns the grid of ACT/365 times from 0 to horizon_days, in years.
+
+    Each segment contributes points every step_days from the end of the
+    previous segment; the horizon and any extra_days inside (0, horizon] are
+    always included.
+
+    Raises:
+        ValueError: If the horizon is not positive or the segments do not
+            cover it in increasing order.
+    """
+    if horizon_days < 1:
+        raise ValueError(f"Grid horizon must be positive, got {horizon_days} days.")
+
+    points = [np.array([0, horizon_days])]
+    start = 0
+    for segment in segments:
+        if segment.until_days <= start:
+            raise ValueError("Grid segments must have increasing until_days.")
+        stop = min(segment.until_days, horizon_days)
+        points.append(np.arange(start, stop, segment.step_days))
+        start = segment.until_days
+        if start >= horizon_days:
+            break
+    else:
+        raise ValueError(
+            f"Grid segments end at day {start}, before the {horizon_days}-day horizon."
+        )
+
+    extra = np.asarray(extra_days, dtype=np.int64).ravel()
+    points.append(extra[(extra > 0) & (extra <= horizon_days)])
+
+    days = np.unique(np.concatenate(points))
+    grid: np.ndarray = days / DAYS_PER_YEAR
+    return grid
+
+
+def maturity_grid(
+    positions: InstrumentBook | Iterable[Position],
+    valuation_date: date,
+    segments: Tuple[GridSegment, ...] = DEFAULT_SEGMENTS,
+    horizon_days: int | None = None,
+) -> np.ndarray:
+    """
+    Returns a time_grid in years that includes every position's maturity.
+
+    The horizon defaults to the last maturity. A precompiled InstrumentBook
+    must have been compiled for valuation_date.
+
+    Raises:
+        ValueError: If there is no maturity after the valuation date and no
+            horizon is given, or a book was compiled for another date.
+    """
+    if isinstance(positions, InstrumentBook):
+        if positions.valuation_date != valuation_date:
+            raise ValueError(
+                f"Instrument book valuation date {positions.valuation_date} does "
+                f"not match {valuation_date}."
+            )
+        maturities = [columns.maturity for columns in positions.columns.values()]
+        days = np.rint(np.concatenate([np.empty(0), *maturities]) * DAYS_PER_YEAR)
+    else:
+        days = np.array(
+            [(p.instrument.maturity_date - valuation_date).days for p in positions],
+            dtype=np.float64,
+        )
+
+    days = days.astype(np.int64)
+    if horizon_days is None:
+        if not (days > 0).any():
+            raise ValueError("No position matures after the valuation date.")
+        horizon_days = int(days.max())
+
+    return time_grid(horizon_days, segments, days)
@@ -0,0 +1,284 @@
+"""
+Process-parallel market generation for the Skans Risk Engine.
+
+The path axis is cut into fixed-size shards and every shard is simulated by a
+ProcessPoolExecutor worker straight into the state tensor, which is allocated
+in a shared memory segment and handed to the MarketEnvironment as it is: no
+second copy of the tensor is made.
+Each shard reads its normals from the run's PathStream at its own path
+offset, so the substreams come from SeedSequence spawn keys and never depend
+on which worker runs the shard. With the shard size fixed, the environment is
+bit-identical for any worker count, and without variance reduction it equals
+the single-process MarketGenerator result for the same seed.
+"""
+
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Dict, List, Tuple, Type, cast
+import numpy as np
+import numpy.typing as npt
+
+from skans.core.rng import GeneratorRng, PathStream, RandomNumberGenerator
+from skans.core.sde import (
+    PathConstruction,
+    VarianceReduction,
+    correlated_geometric_brownian_motion,
+)
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market.shared import _open_segment
+
+
+@dataclass(frozen=True)
+class _Shard:
+    """A picklable task: simulate paths [start, stop) of a shared tensor"""
+
+    segment: str
+    shape: Tuple[int, ...]
+    dtype: str
+    start: int
+    stop: int
+    stream: PathStream
+    params: GBMParameters
+    T: float
+    n_steps: int
+    times: np.ndarray | None
+    construction: PathConstruction
+    variance_reduction: VarianceReduction
+
+
+def _simulate_shard(out: np.ndarray, shard: _Shard) -> None:
+    correlated_geometric_brownian_motion(
+        shard.params.S0,
+        shard.params.mu,
+        shard.params.sigma,
+        shard.params.correlation,
+        shard.T,
+        shard.n_steps,
+        out.shape[0],
+        rng=shard.stream,
+        out=out,
+        construction=shard.construction,
+        variance_reduction=shard.variance_reduction,
+        times=shard.times,
+    )
+
+
+def _run_shard(shard: _Shard) -> None:
+    """Worker entry point: maps the output tensor and fills one shard"""
+    segment = _open_segment(shard.segment)
+    tensor = np.frombuffer(
+        cast(memoryview, segment.buf),
+        dtype=np.dtype(shard.dtype),
+        count=int(np.prod(shard.shape)),
+    ).reshape(shard.shape)
+    _simulate_shard(tensor[shard.start : shard.stop], shard)
+    del tensor
+    segment.close()
+
+
+# Segments whose tensors have been dropped. A segment cannot be closed from
+# its tensor's finaliser, which runs before the tensor releases its buffer
+# export, so it is parked here and closed on the next allocation or close()
+_RETIRED: List[SharedMemory] = []
+_RETIRED_LOCK = threading.Lock()
+
+
+def _retire(segment: SharedMemory) -> None:
+    with _RETIRED_LOCK:
+        _RETIRED.append(segment)
+
+
+def _close_retired() -> None:
+    with _RETIRED_LOCK:
+        pending = list(_RETIRED)
+        _RETIRED.clear()
+    busy = []
+    for segment in pending:
+        try:
+            segment.close()
+        except BufferError:
+            busy.append(segment)
+    with _RETIRED_LOCK:
+        _RETIRED.extend(busy)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Forking while other threads run (e.g. the ExposurePipeline stages) can
+    # copy held locks into the child, so workers never start by plain fork
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # The server imports the engine once; each worker forks from it ready
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+class ParallelMarketGenerator(MarketGenerator):
+    """
+    A MarketGenerator that simulates fixed-size path shards in worker processes.
+
+    Workers are started on first use (by forkserver, or spawn where that is
+    unavailable) and kept for later calls, including every block of
+    generate_chunks. Use as a context manager, or call close(), to shut them
+    down. Antithetic and moment-matching schemes are applied within each
+    shard.
+
+    A state tensor with more than one shard lives in a shared memory segment
+    that is unlinked as soon as the workers are done; its mapping is released
+    once the environment and every view of the tensor are gone.
+    """
+
+    def __init__(
+        self,
+        rng: GeneratorRng | None = None,
+        construction: PathConstruction = PathConstruction.STANDARD,
+        variance_reduction: VarianceReduction = VarianceReduction.NONE,
+        dtype: npt.DTypeLike = np.float64,
+        n_workers: int | None = None,
+        shard_size: int = 4096,
+    ) -> None:
+        """
+        Args:
+            rng: The seeded generator; shards draw from its SeedSequence
+                substreams. Defaults to an unseeded GeneratorRng.
+            construction: Path construction used within each shard.
+            variance_reduction: Scheme applied within each shard.
+            dtype: Floating point type of the state tensor.
+            n_workers: Worker processes; defaults to os.cpu_count(). With one
+                worker the shards run in this process.
+            shard_size: Paths per shard. Results depend on it (through
+                variance reduction) but never on n_workers.
+
+        Raises:
+            ValueError: If n_workers or shard_size is not positive.
+        """
+        super().__init__(
+            rng if rng is not None else GeneratorRng(),
+            construction,
+            variance_reduction,
+            dtype,
+        )
+        self.n_workers = n_workers if n_workers is not None else os.cpu_count() or 1
+        if self.n_workers < 1 or shard_size < 1:
+            raise ValueError("n_workers and shard_size must be positive.")
+        self.shard_size = shard_size
+        self._pool: ProcessPoolExecutor | None = None
+        # Shared segments of the tensors allocated here, by data address
+        self._segments: Dict[int, SharedMemory] = {}
+
+    def close(self) -> None:
+        """Shuts the worker processes down; they restart on the next call"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        _close_retired()
+
+    def __enter__(self) -> "ParallelMarketGenerator":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _allocate(self, shape: Tuple[int, int, int]) -> np.ndarray:
+        _close_retired()
+        if self.n_workers == 1 or shape[0] <= self.shard_size:
+            return super()._allocate(shape)
+
+        size = int(np.prod(shape)) * self.dtype.itemsize
+        segment = SharedMemory(create=True, size=max(size, 1))
+        flat = np.frombuffer(
+            cast(memoryview, segment.buf), dtype=self.dtype, count=int(np.prod(shape))
+        )
+        address = flat.ctypes.data
+        self._segments[address] = segment
+        # Every view of the tensor keeps flat alive, so this runs last
+        weakref.finalize(flat, _retire, segment)
+        weakref.finalize(flat, self._segments.pop, address, None)
+        return flat.reshape(shape)
+
+    def _fill(
+        self,
+        out: np.ndarray,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        rng: RandomNumberGenerator,
+        times: npt.ArrayLike | None,
+    ) -> None:
+        """
+        Raises:
+            TypeError: If the generator is not a GeneratorRng.
+        """
+        segment = self._segments.get(out.ctypes.data)
+        try:
+            self._run_shards(out, segment, params, T, n_steps, rng, times)
+        finally:
+            if segment is not None:
+                # The mapping outlives the name; no other process needs it now
+                segment.unlink()
+
+    def _run_shards(
+        self,
+        out: np.ndarray,
+        segment: SharedMemory | None,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        rng: RandomNumberGenerator,
+        times: npt.ArrayLike | None,
+    ) -> None:
+        stream = rng.stream() if isinstance(rng, GeneratorRng) else rng
+        if not isinstance(stream, PathStream):
+            raise TypeError(
+                f"Parallel generation needs a GeneratorRng, got {type(rng).__name__}."
+            )
+
+        # Shard k reads the stream from its own first path; the caller's
+        # stream moves past the whole block as a sequential fill would
+        offset = stream.position
+        stream.seek(offset + out.shape[0])
+
+        shards = [
+            _Shard(
+                segment="" if segment is None else segment.name,
+                shape=out.shape,
+                dtype=out.dtype.str,
+                start=start,
+                stop=min(start + self.shard_size, out.shape[0]),
+                stream=PathStream(
+                    stream.seed_sequence,
+                    stream.bit_generator,
+                    stream.block_size,
+                    path_offset=offset + start,
+                ),
+                params=params,
+                T=T,
+                n_steps=n_steps,
+                times=None if times is None else np.asarray(times, np.float64),
+                construction=self.construction,
+                variance_reduction=self.variance_reduction,
+            )
+            for start in range(0, out.shape[0], self.shard_size)
+        ]
+
+        if segment is None:
+            for shard in shards:
+                _simulate_shard(out[shard.start : shard.stop], shard)
+            return
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers, mp_context=_pool_context()
+            )
+        list(self._pool.map(_run_shard, shards))
@@ -1,10 +1,79 @@
-from typing import Iterable, Set, Dict
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Set, Tuple
+from typing import Union, cast
+import numpy as np
 
-from skans.domain.portfolio import Position
+from skans.core.instrumentation import stage
+from skans.domain.portfolio import AnyInstrument, Position
 from skans.domain.instruments.equity import EquityForward, EquityOption
 from skans.domain.instruments.fx import FXForward, FXOption
+from skans.domain.types.enums import Currency
 from skans.market.environment import RiskFactorSchema
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@lru_cache(maxsize=None)
+def fx_pair_name(base: Currency | str, quote: Currency | str) -> str:
+    """
+    Returns the interned risk factor name of an FX pair, e.g. "USDZAR".
+
+    Cached per (base, quote), so a book with millions of FX positions builds
+    each pair name once instead of once per position.
+
+    Raises:
+        ValueError: If either currency code is unknown.
+    """
+    return sys.intern(f"{Currency(base).value}{Currency(quote).value}")
+
+
+def _equity_factor(inst: AnyInstrument) -> str:
+    return cast(Union[EquityForward, EquityOption], inst).underlying_id
+
+
+def _fx_factor(inst: AnyInstrument) -> str:
+    fx = cast(Union[FXForward, FXOption], inst)
+    return fx_pair_name(fx.base_currency, fx.quote_currency)
+
+
+# Type-keyed dispatch: one dictionary lookup per position instead of an
+# isinstance chain
+_FACTOR_OF: Dict[type, Callable[[AnyInstrument], str]] = {
+    EquityForward: _equity_factor,
+    EquityOption: _equity_factor,
+    FXForward: _fx_factor,
+    FXOption: _fx_factor,
+}
+
+
+def risk_factor_of(inst: AnyInstrument) -> str:
+    """
+    Returns the name of the simulated risk factor that drives an instrument.
+
+    Raises:
+        TypeError: If the instrument type is not supported.
+    """
+    try:
+        factor_of = _FACTOR_OF[type(inst)]
+    except KeyError:
+        # Catches new instruments not yet supported
+        raise TypeError(f"Unsupported instrument type in resolver: {type(inst)}")
+    return factor_of(inst)
+
+
+def _schema_from(factors: Iterable[str]) -> RiskFactorSchema:
+    # Sort the factors alphabetically.
+    # This guarantees that index assignment is completely deterministic
+    # across different runs and operating systems.
+    factor_indices: Dict[str, int] = {
+        factor: idx for idx, factor in enumerate(sorted(factors))
+    }
+    return RiskFactorSchema(factor_indices=factor_indices)
+
 
 class DependencyResolver:
     """
@@ -17,33 +86,202 @@ class DependencyResolver:
         Iterates over the position set to extract and deduplicate
         required risk factors, assigning them deterministic integer indices.
         """
-        unique_factors: Set[str] = set()
+        with stage("resolve") as probe:
+            unique_factors: Set[str] = {
+                risk_factor_of(pos.instrument) for pos in positions
+            }
+            probe.shape("factors", (len(unique_factors),))
+            return _schema_from(unique_factors)
 
-        for pos in positions:
-            inst = pos.instrument
-
-            # Pattern matching on the Algebraic Data Type (Union)
-            if isinstance(inst, (EquityForward, EquityOption)):
-                unique_factors.add(inst.underlying_id)
+    def resolve_columns(
+        self,
+        underlying_ids: Iterable[str] = (),
+        base_currencies: Iterable[Currency | str] = (),
+        quote_currencies: Iterable[Currency | str] = (),
+    ) -> RiskFactorSchema:
+        """
+        Bulk resolution straight from columns, without Position objects.
 
-            elif isinstance(inst, (FXForward, FXOption)):
-                # Concatenate the string Enum values for FX pairs
-                factor = f"{inst.base_currency.value}{inst.quote_currency.value}"
-                unique_factors.add(factor)
+        underlying_ids holds the underlying of every equity position;
+        base_currencies and quote_currencies hold the pair of every FX
+        position, element by element. Columns are deduplicated first, so FX
+        pair names are built once per distinct pair. The schema equals the
+        one resolve would produce for the same positions.
 
-            else:
-                # Catches new instruments not yet supported
-                raise TypeError(
-                    f"Unsupported instrument type in resolver: {type(inst)}"
+        Raises:
+            ValueError: If the FX columns differ in length or hold an unknown
+                currency code.
+        """
+        with stage("resolve") as probe:
+            bases = _as_list(base_currencies)
+            quotes = _as_list(quote_currencies)
+            if len(bases) != len(quotes):
+                raise ValueError(
+                    f"FX columns differ in length: {len(bases)} base vs "
+                    f"{len(quotes)} quote currencies."
                 )
 
-        # Sort the factors alphabetically.
-        # This guarantees that index assignment is completely deterministic
-        # across different runs and operating systems.
-        sorted_factors = sorted(list(unique_factors))
+            underlyings = _as_list(underlying_ids)
+            unique_factors: Set[str] = set(underlyings)
+            unique_factors.update(
+                fx_pair_name(base, quote) for base, quote in set(zip(bases, quotes))
+            )
+            probe.shape("positions", (len(underlyings) + len(bases),))
+            probe.shape("factors", (len(unique_factors),))
+            return _schema_from(unique_factors)
+
+    def resolve_frame(
+        self,
+        frame: "pd.DataFrame",
+        underlying_column: str = "underlying_id",
+        base_column: str = "base_currency",
+        quote_column: str = "quote_currency",
+    ) -> RiskFactorSchema:
+        """
+        Bulk resolution from a DataFrame with one row per position.
+
+        Rows with an underlying ID are equity positions; the remaining rows
+        are FX positions and must carry both currencies.
+
+        Raises:
+            KeyError: If a required column is missing.
+            ValueError: If an FX row lacks a currency or holds an unknown code.
+        """
+        for column in (underlying_column, base_column, quote_column):
+            if column not in frame.columns:
+                raise KeyError(f"Column '{column}' not found in frame.")
+
+        is_equity = frame[underlying_column].notna().to_numpy()
+        fx = frame.loc[~is_equity, [base_column, quote_column]]
+        if fx.isna().to_numpy().any():
+            raise ValueError("FX rows must have both a base and a quote currency.")
+
+        return self.resolve_columns(
+            underlying_ids=frame[underlying_column].to_numpy()[is_equity],
+            base_currencies=fx[base_column].to_numpy(),
+            quote_currencies=fx[quote_column].to_numpy(),
+        )
+
 
-        factor_indices: Dict[str, int] = {
-            factor: idx for idx, factor in enumerate(sorted_factors)
+def _as_list(column: Iterable[Any]) -> List[Any]:
+    # ndarray.tolist yields Python scalars in one C loop, far cheaper to hash
+    # than iterating the array element by element
+    if isinstance(column, np.ndarray):
+        return cast(List[Any], column.tolist())
+    return list(column)
+
+
+@dataclass(frozen=True)
+class SchemaUpdate:
+    """
+    The outcome of applying position changes to an IncrementalDependencyResolver.
+
+    Attributes:
+        schema: The schema after the change.
+        added: Factors given a new index by this change, in index order. Only
+            these need simulating to extend an existing tensor.
+        retired: Factors no longer referenced by any position. They keep their
+            index so existing tensors stay valid.
+    """
+
+    schema: RiskFactorSchema
+    added: Tuple[str, ...]
+    retired: Tuple[str, ...]
+
+
+class IncrementalDependencyResolver:
+    """
+    Tracks the risk factors of a changing position set with stable indices.
+
+    Indices are append-only: a factor keeps its index for the life of the
+    resolver, and new factors are appended after the existing ones (sorted
+    within each batch, so the numbering stays deterministic). A cached tensor
+    therefore only needs columns for the factors reported as added.
+    """
+
+    def __init__(self, schema: RiskFactorSchema | None = None) -> None:
+        """
+        Args:
+            schema: An existing schema to extend, e.g. one produced by
+                DependencyResolver for a tensor already simulated. Its factors
+                count as inactive until positions referencing them are added.
+
+        Raises:
+            ValueError: If the schema's indices are not 0..n-1.
+        """
+        self._factor_indices: Dict[str, int] = dict(
+            schema.factor_indices if schema is not None else {}
+        )
+        if sorted(self._factor_indices.values()) != list(
+            range(len(self._factor_indices))
+        ):
+            raise ValueError("Schema indices must be contiguous from 0.")
+
+        self._position_factors: Dict[str, str] = {}
+        self._references: Counter[str] = Counter()
+
+    @property
+    def schema(self) -> RiskFactorSchema:
+        return RiskFactorSchema(factor_indices=dict(self._factor_indices))
+
+    @property
+    def active_factors(self) -> Tuple[str, ...]:
+        """Factors referenced by at least one tracked position, in index order."""
+        return tuple(
+            factor for factor in self._factor_indices if self._references[factor] > 0
+        )
+
+    def add(self, positions: Iterable[Position]) -> SchemaUpdate:
+        """
+        Starts tracking positions, appending indices for unseen factors.
+
+        Re-adding a tracked position_id replaces it.
+
+        Raises:
+            TypeError: If an instrument type is not supported.
+        """
+        # Resolve everything first so a bad position leaves the state untouched
+        incoming = {
+            pos.position_id: risk_factor_of(pos.instrument) for pos in positions
         }
 
-        return RiskFactorSchema(factor_indices=factor_indices)
+        released = self._release(
+            position_id
+            for position_id in incoming
+            if position_id in self._position_factors
+        )
+        for position_id, factor in incoming.items():
+            self._position_factors[position_id] = factor
+            self._references[factor] += 1
+
+        added = sorted(set(incoming.values()) - self._factor_indices.keys())
+        for factor in added:
+            self._factor_indices[factor] = len(self._factor_indices)
+
+        retired = tuple(f for f in released if self._references[f] == 0)
+        return SchemaUpdate(schema=self.schema, added=tuple(added), retired=retired)
+
+    def remove(self, position_ids: Iterable[str]) -> SchemaUpdate:
+        """
+        Stops tracking positions. Factor indices are never reused.
+
+        Raises:
+            KeyError: If a position_id is not tracked.
+        """
+        ids = list(dict.fromkeys(position_ids))
+        for position_id in ids:
+            if position_id not in self._position_factors:
+                raise KeyError(f"Position '{position_id}' is not tracked.")
+
+        released = self._release(ids)
+        retired = tuple(f for f in released if self._references[f] == 0)
+        return SchemaUpdate(schema=self.schema, added=(), retired=retired)
+
+    def _release(self, position_ids: Iterable[str]) -> Tuple[str, ...]:
+        """Drops positions, returning the factors they referenced in index order."""
+        released: Set[str] = set()
+        for position_id in position_ids:
+            factor = self._position_factors.pop(position_id)
+            self._references[factor] -= 1
+            released.add(factor)
+        return tuple(sorted(released, key=self._factor_indices.__getitem__))
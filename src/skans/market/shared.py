@@ -0,0 +1,140 @@
+"""
+Shared-memory handoff of MarketEnvironments to process-pool workers.
+
+The parent publishes the state tensor once into a multiprocessing.shared_memory
+segment and sends workers only a small picklable handle. Each worker maps the
+segment and sees a read-only ndarray view, so the tensor is never pickled and
+physical memory is shared rather than multiplied by the worker count.
+"""
+
+import sys
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any, Dict, Tuple, Type, cast
+import numpy as np
+
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+
+
+@dataclass(frozen=True)
+class SharedEnvironmentHandle:
+    """
+    Picklable reference to a MarketEnvironment published in shared memory.
+
+    Attributes:
+        name: The shared memory segment name.
+        shape: Shape of the state tensor.
+        dtype: NumPy dtype string of the state tensor.
+        schema: The environment's risk factor schema.
+        dt: The environment's time step.
+        time_grid: The environment's explicit simulation times, if any.
+    """
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    schema: RiskFactorSchema
+    dt: float
+    time_grid: Tuple[float, ...] | None = None
+
+
+def _open_segment(name: str) -> SharedMemory:
+    # Workers only borrow the segment; its lifetime belongs to the publisher
+    kwargs: Dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+    return SharedMemory(name=name, **kwargs)
+
+
+class SharedMarketEnvironment:
+    """
+    Owns a shared memory segment holding a copy of an environment's tensor.
+
+    Use as a context manager in the parent process; the segment is released
+    and unlinked on exit. Pass `handle` to workers and call
+    attach_environment there.
+    """
+
+    def __init__(self, env: MarketEnvironment) -> None:
+        tensor = env.state_tensor
+        self._segment = SharedMemory(create=True, size=max(tensor.nbytes, 1))
+
+        view = np.frombuffer(
+            cast(memoryview, self._segment.buf), dtype=tensor.dtype, count=tensor.size
+        )
+        view.reshape(tensor.shape)[...] = tensor
+        del view
+
+        self.handle = SharedEnvironmentHandle(
+            name=self._segment.name,
+            shape=tensor.shape,
+            dtype=tensor.dtype.str,
+            schema=env.schema,
+            dt=env.dt,
+            time_grid=None if env.time_grid is None else tuple(env.time_grid),
+        )
+
+    def close(self) -> None:
+        """Releases and unlinks the segment; attached workers must be done"""
+        self._segment.close()
+        self._segment.unlink()
+
+    def __enter__(self) -> "SharedMarketEnvironment":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+# Segments mapped by this process, kept open so repeated tasks reuse the view
+_ATTACHED: Dict[str, Tuple[SharedMemory, MarketEnvironment]] = {}
+
+
+def _wrap(segment: SharedMemory, handle: SharedEnvironmentHandle) -> MarketEnvironment:
+    # frombuffer holds a buffer export, so the segment cannot be unmapped
+    # underneath a live view (closing raises BufferError instead)
+    state_tensor = np.frombuffer(
+        cast(memoryview, segment.buf),
+        dtype=np.dtype(handle.dtype),
+        count=int(np.prod(handle.shape)),
+    ).reshape(handle.shape)
+    time_grid = None if handle.time_grid is None else np.array(handle.time_grid)
+    return MarketEnvironment(
+        schema=handle.schema,
+        state_tensor=state_tensor,
+        dt=handle.dt,
+        time_grid=time_grid,
+    )
+
+
+def attach_environment(handle: SharedEnvironmentHandle) -> MarketEnvironment:
+    """
+    Maps a published environment into this process as a read-only view.
+
+    The mapping is cached per segment for the life of the process, so calling
+    this once per task costs a dictionary lookup after the first call.
+    """
+    if handle.name not in _ATTACHED:
+        segment = _open_segment(handle.name)
+        _ATTACHED[handle.name] = (segment, _wrap(segment, handle))
+
+    return _ATTACHED[handle.name][1]
+
+
+def detach_environment(handle: SharedEnvironmentHandle) -> None:
+    """
+    Drops this process's mapping of a published environment.
+
+    Views taken from the attached environment must be released first. Because
+    they hold a buffer export the mapping is never pulled from under them;
+    detaching early raises BufferError instead.
+    """
+    entry = _ATTACHED.pop(handle.name, None)
+    if entry is not None:
+        segment = entry[0]
+        del entry
+        segment.close()
@@ -0,0 +1,157 @@
+"""
+Persistence for MarketEnvironments.
+
+An environment is stored as a raw .npy tensor plus a small JSON sidecar with
+the schema and time grid. Reopening maps the tensor read-only through
+np.memmap, so loads are zero-copy, pages are read lazily and concurrent jobs
+share the operating system's page cache.
+"""
+
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+import numpy as np
+
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+
+FORMAT_VERSION = 1
+
+
+def _paths(path: str | os.PathLike[str]) -> Tuple[Path, Path]:
+    base = Path(path)
+    if base.suffix in (".npy", ".json"):
+        base = base.with_suffix("")
+    return base.with_name(base.name + ".npy"), base.with_name(base.name + ".json")
+
+
+def _write_sidecar(
+    sidecar: Path,
+    schema: RiskFactorSchema,
+    dt: float,
+    shape: Tuple[int, ...],
+    dtype: np.dtype,
+    time_grid: np.ndarray | None = None,
+) -> None:
+    metadata: Dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "factor_indices": schema.factor_indices,
+        "dt": dt,
+        "time_grid": None if time_grid is None else time_grid.tolist(),
+        "shape": list(shape),
+        "dtype": dtype.str,
+    }
+    sidecar.write_text(json.dumps(metadata, indent=2))
+
+
+def save_environment(env: MarketEnvironment, path: str | os.PathLike[str]) -> None:
+    """
+    Writes the environment to <path>.npy and <path>.json.
+    """
+    tensor_path, sidecar = _paths(path)
+    np.save(tensor_path, env.state_tensor, allow_pickle=False)
+    _write_sidecar(
+        sidecar,
+        env.schema,
+        env.dt,
+        env.state_tensor.shape,
+        env.state_tensor.dtype,
+        env.time_grid,
+    )
+
+
+def save_environment_chunks(
+    chunks: Iterable[MarketEnvironment],
+    path: str | os.PathLike[str],
+    n_paths: int,
+) -> None:
+    """
+    Writes a stream of path-block environments (see
+    MarketGenerator.generate_chunks) into a single on-disk tensor, holding at
+    most one block in memory.
+
+    Raises:
+        ValueError: If the blocks disagree on schema or layout, or do not add
+            up to n_paths paths.
+    """
+    tensor_path, sidecar = _paths(path)
+    blocks = iter(chunks)
+    first = next(blocks, None)
+    if first is None:
+        raise ValueError(f"Chunks hold 0 paths, expected {n_paths}.")
+
+    tensor = np.lib.format.open_memmap(
+        tensor_path,
+        mode="w+",
+        dtype=first.state_tensor.dtype,
+        shape=(n_paths,) + first.state_tensor.shape[1:],
+    )
+
+    offset = 0
+    for env in itertools.chain([first], blocks):
+        block = env.state_tensor
+        if (
+            env.schema != first.schema
+            or block.shape[1:] != tensor.shape[1:]
+            or not np.array_equal(env.times, first.times)
+        ):
+            raise ValueError(
+                "All chunks must share the same schema, layout and time grid."
+            )
+        if offset + block.shape[0] > n_paths:
+            raise ValueError(f"Chunks hold more than the declared {n_paths} paths.")
+
+        tensor[offset : offset + block.shape[0]] = block
+        offset += block.shape[0]
+
+    if offset != n_paths:
+        raise ValueError(f"Chunks hold {offset} paths, expected {n_paths}.")
+
+    tensor.flush()
+    _write_sidecar(
+        sidecar, first.schema, first.dt, tensor.shape, tensor.dtype, first.time_grid
+    )
+
+
+def load_environment(
+    path: str | os.PathLike[str], mmap: bool = True
+) -> MarketEnvironment:
+    """
+    Reopens an environment written by save_environment.
+
+    With mmap=True (the default) the state tensor is a read-only np.memmap
+    over the .npy file; nothing is read until it is sliced.
+
+    Raises:
+        ValueError: If the tensor does not match its sidecar.
+    """
+    tensor_path, sidecar = _paths(path)
+    metadata = json.loads(sidecar.read_text())
+
+    if metadata.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported environment format version {metadata.get('format_version')}."
+        )
+
+    state_tensor = np.load(
+        tensor_path, mmap_mode="r" if mmap else None, allow_pickle=False
+    )
+    expected_dtype = np.dtype(metadata["dtype"])
+    if list(state_tensor.shape) != metadata["shape"] or (
+        state_tensor.dtype != expected_dtype
+    ):
+        raise ValueError(
+            f"Tensor {tensor_path} does not match its sidecar: "
+            f"{state_tensor.shape}/{state_tensor.dtype} vs "
+            f"{tuple(metadata['shape'])}/{metadata['dtype']}."
+        )
+
+    schema = RiskFactorSchema(factor_indices=dict(metadata["factor_indices"]))
+    time_grid = metadata.get("time_grid")
+    return MarketEnvironment(
+        schema=schema,
+        state_tensor=state_tensor,
+        dt=metadata["dt"],
+        time_grid=None if time_grid is None else np.array(time_grid),
+    )
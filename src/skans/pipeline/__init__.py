@@ -0,0 +1,9 @@
+"""
+Pipeline Module: Orchestrates simulation, valuation and aggregation runs.
+"""
+
+from .runner import ExposurePipeline
+
+__all__ = [
+    "ExposurePipeline",
+]
@@ -0,0 +1,213 @@
+"""
+Pipelined exposure runs for the Skans Risk Engine.
+
+Market generation, valuation and netting-set aggregation run as three stages
+joined by bounded queues of path chunks: while chunk k + 1 is simulated,
+chunk k is priced and chunk k - 1 netted. The stages are threads; NumPy and
+SciPy release the GIL inside their kernels, so the stages overlap in
+practice. At most a few position-level chunks are alive at once, never the
+full (Positions, Paths, Timesteps + 1) cube. Beyond the chunks, only the
+per-path netting-set exposures needed for PFE grow with the path count, and
+those can be spilled to disk.
+"""
+
+import os
+import queue
+import threading
+from typing import Any, Callable, List, Sequence
+import numpy as np
+import numpy.typing as npt
+
+from skans.domain.portfolio import NettingSet, Position, Trade
+from skans.domain.types.enums import Currency
+from skans.exposure.engine import ExposureEngine, ExposureProfiles
+from skans.market.book import CURRENCY_CODES, BookCompiler, InstrumentBook
+from skans.market.environment import RiskFactorSchema
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.valuation.engine import ValuationEngine
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+# Seconds between checks for a failed stage while blocked on a queue
+_POLL_INTERVAL = 0.05
+
+
+def _put(channel: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Blocks until item is queued; False if the run was stopped meanwhile"""
+    while not stop.is_set():
+        try:
+            channel.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(channel: "queue.Queue[Any]", stop: threading.Event) -> Any:
+    """Blocks for the next item; _DONE at the end or once the run is stopped"""
+    while not stop.is_set():
+        try:
+            return channel.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+class ExposurePipeline:
+    """
+    Runs simulate -> value -> aggregate over path chunks with overlapping
+    stages.
+
+    Without variance reduction the chunks concatenate to the single-shot
+    simulation (see MarketGenerator.generate_chunks), so the profiles equal
+    those of ExposureEngine.position_profiles on the full cube.
+
+    Positions are valued in their pricing currency (the quote currency for FX).
+    With a reporting currency, each chunk is converted with the simulated FX
+    factors before netting; without one, every netting set must hold positions
+    of a single pricing currency.
+    """
+
+    def __init__(
+        self,
+        generator: MarketGenerator,
+        valuation: ValuationEngine,
+        exposure: ExposureEngine,
+        chunk_size: int = 4096,
+        queue_size: int = 2,
+        spill_dir: "str | os.PathLike[str] | None" = None,
+        reporting_currency: Currency | None = None,
+    ) -> None:
+        """
+        Args:
+            generator: Simulates each chunk of paths.
+            valuation: Prices each simulated chunk.
+            exposure: Nets the priced chunks and summarises the profiles.
+            chunk_size: Paths per chunk.
+            queue_size: Chunks that may wait between two stages.
+            spill_dir: Keep the per-path exposures for PFE in a temporary
+                file in this directory (see ExposureEngine.accumulator).
+            reporting_currency: Convert every position's values into this
+                currency before netting (see ValuationEngine.to_currency).
+
+        Raises:
+            ValueError: If chunk_size or queue_size is not positive.
+        """
+        if chunk_size < 1 or queue_size < 1:
+            raise ValueError("chunk_size and queue_size must be positive.")
+        self.generator = generator
+        self.valuation = valuation
+        self.exposure = exposure
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.spill_dir = spill_dir
+        self.reporting_currency = reporting_currency
+
+    def run(
+        self,
+        positions: InstrumentBook | Sequence[Position],
+        trades: Sequence[Trade],
+        netting_sets: Sequence[NettingSet],
+        schema: RiskFactorSchema,
+        params: GBMParameters,
+        T: float,
+        n_steps: int,
+        n_paths: int,
+        times: npt.ArrayLike | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> ExposureProfiles:
+        """
+        Simulates, prices and nets n_paths paths chunk by chunk and returns the
+        netting-set exposure profiles.
+
+        progress, if given, is called as progress(paths_done, n_paths) from
+        this thread after each chunk is netted. The first error raised by any
+        stage stops the other stages and is re-raised here.
+
+        Raises:
+            KeyError: If a risk factor, rate, trade or netting set reference
+                cannot be resolved, or an FX factor needed for the reporting
+                currency is not simulated.
+            ValueError: If the parameters, time grid or book do not match, or
+                a netting set mixes pricing currencies without a reporting
+                currency.
+        """
+        book = (
+            positions
+            if isinstance(positions, InstrumentBook)
+            else BookCompiler().compile(
+                positions, schema, self.valuation.params.valuation_date
+            )
+        )
+        currencies = None
+        if self.reporting_currency is None:
+            decode = list(CURRENCY_CODES)
+            currencies = [decode[code] for code in book.currencies.tolist()]
+        accumulator = self.exposure.accumulator(
+            book.position_ids,
+            trades,
+            netting_sets,
+            n_paths,
+            n_steps + 1,
+            dtype=np.result_type(self.generator.dtype, np.float32),
+            spill_dir=self.spill_dir,
+            currencies=currencies,
+        )
+
+        environments: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        cubes: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def stage(body: Callable[[], None], output: "queue.Queue[Any]") -> None:
+            try:
+                body()
+            except BaseException as exc:
+                errors.append(exc)
+                stop.set()
+            finally:
+                _put(output, _DONE, stop)
+
+        def simulate() -> None:
+            chunks = self.generator.generate_chunks(
+                schema, params, T, n_steps, n_paths, self.chunk_size, times
+            )
+            for env in chunks:
+                if not _put(environments, env, stop):
+                    return
+
+        def value() -> None:
+            while (env := _get(environments, stop)) is not _DONE:
+                cube = self.valuation.value(book, env)
+                if self.reporting_currency is not None:
+                    self.valuation.to_currency(cube, book, env, self.reporting_currency)
+                if not _put(cubes, (cube, env.times), stop):
+                    return
+
+        threads = [
+            threading.Thread(
+                target=stage, args=(simulate, environments), name="skans-simulate"
+            ),
+            threading.Thread(target=stage, args=(value, cubes), name="skans-value"),
+        ]
+        for thread in threads:
+            thread.start()
+
+        grid = np.empty(0)
+        try:
+            while (item := _get(cubes, stop)) is not _DONE:
+                cube, grid = item
+                accumulator.add(cube)
+                if progress is not None:
+                    progress(accumulator.n_filled, n_paths)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+        return accumulator.profiles(grid)
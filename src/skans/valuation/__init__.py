@@ -0,0 +1,16 @@
+"""
+Valuation Module: Prices positions against simulated market environments.
+"""
+
+from .cache import ValuationCache
+from .engine import ValuationEngine, ValuationParameters
+from .greeks import Greeks, GreeksEngine, GreeksMethod
+
+__all__ = [
+    "ValuationCache",
+    "ValuationEngine",
+    "ValuationParameters",
+    "Greeks",
+    "GreeksEngine",
+    "GreeksMethod",
+]
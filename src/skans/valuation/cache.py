@@ -0,0 +1,85 @@
+"""
+Revaluation cache for the Skans Risk Engine.
+
+Stores per-instrument MTM arrays of shape (Paths, Timesteps + 1) keyed by
+(instrument, environment fingerprint, parameters fingerprint). Instruments are
+frozen and hashable, so an unchanged instrument on an unchanged environment is
+never priced twice; intraday changes only reprice new or amended positions.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Tuple
+import numpy as np
+
+CacheKey = Tuple[Hashable, str, str]
+
+
+class ValuationCache:
+    """
+    A least-recently-used store of MTM arrays bounded by a memory budget.
+
+    Arrays are copied on insertion and locked read-only, so cached values never
+    pin a larger cube in memory and cannot be modified through a caller's view.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Raises:
+            ValueError: If max_bytes is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Memory budget must be non-negative, got {max_bytes}.")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently held by cached arrays."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: CacheKey) -> np.ndarray | None:
+        """Returns the cached array, marking it most recently used."""
+        values = self._entries.get(key)
+        if values is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return values
+
+    def put(self, key: CacheKey, values: np.ndarray) -> None:
+        """
+        Stores a copy of values, evicting least recently used entries until the
+        cache fits its budget. Arrays larger than the whole budget are skipped.
+        """
+        if values.nbytes > self.max_bytes:
+            return
+        self.discard(key)
+
+        stored = values.copy()
+        stored.flags.writeable = False
+        self._entries[key] = stored
+        self._nbytes += stored.nbytes
+
+        while self._nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def discard(self, key: CacheKey) -> None:
+        """Drops an entry if present."""
+        values = self._entries.pop(key, None)
+        if values is not None:
+            self._nbytes -= values.nbytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._nbytes = 0
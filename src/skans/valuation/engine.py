@@ -0,0 +1,310 @@
+"""
+Valuation Engine for the Skans Risk Engine.
+Turns a MarketEnvironment into a (Positions, Paths, Timesteps + 1) MTM cube.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
+from typing import Dict, List, Sequence, Tuple, Type
+import numpy as np
+
+from skans.core.instrumentation import stage
+from skans.domain.portfolio import AnyInstrument, Position
+from skans.domain.instruments import EquityForward, EquityOption, FXForward
+from skans.domain.types.enums import Currency
+from skans.market.book import (
+    CURRENCY_CODES,
+    BookCompiler,
+    InstrumentBook,
+    InstrumentColumns,
+)
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+from skans.market.resolver import fx_pair_name
+from skans.valuation.cache import CacheKey, ValuationCache
+from skans.valuation.pricers import (
+    black_scholes_delta,
+    black_scholes_value,
+    forward_delta,
+    forward_value,
+)
+
+
+@dataclass(frozen=True)
+class ValuationParameters:
+    """
+    Static market data used to turn simulated factor levels into prices.
+
+    Attributes:
+        valuation_date: The calendar date of t = 0 on the simulation grid.
+        rates: Continuously compounded risk-free rate per currency.
+        volatilities: Pricing volatility per risk factor (used by options).
+        dividend_yields: Continuous dividend yield per equity underlying.
+    """
+
+    valuation_date: date
+    rates: Dict[Currency, float]
+    volatilities: Dict[str, float] = field(default_factory=dict)
+    dividend_yields: Dict[str, float] = field(default_factory=dict)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Content hash of the parameters, for keying cached valuations."""
+        content = repr(
+            (
+                self.valuation_date.isoformat(),
+                sorted((ccy.value, rate) for ccy, rate in self.rates.items()),
+                sorted(self.volatilities.items()),
+                sorted(self.dividend_yields.items()),
+            )
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def rate(self, currency: Currency) -> float:
+        try:
+            return self.rates[currency]
+        except KeyError:
+            raise KeyError(
+                f"No interest rate supplied for currency '{currency.value}'."
+            )
+
+    def volatility(self, factor_name: str) -> float:
+        try:
+            return self.volatilities[factor_name]
+        except KeyError:
+            raise KeyError(f"No volatility supplied for risk factor '{factor_name}'.")
+
+
+class ValuationEngine:
+    """
+    Prices Positions across every path and time step of a MarketEnvironment.
+
+    Positions are compiled into a columnar InstrumentBook and each instrument
+    type is priced with a single broadcast expression (forwards) or a single
+    vectorized Black-Scholes / Garman-Kohlhagen call (options). Values are per
+    unit of the instrument, in its pricing currency (the equity's currency, or
+    the quote currency of an FX pair).
+
+    With a ValuationCache, positions are looked up by (instrument, environment
+    fingerprint, parameters fingerprint) and only cache misses are priced.
+    """
+
+    def __init__(
+        self, params: ValuationParameters, cache: ValuationCache | None = None
+    ) -> None:
+        self.params = params
+        self.cache = cache
+
+    def value(
+        self,
+        positions: InstrumentBook | Sequence[Position],
+        env: MarketEnvironment,
+    ) -> np.ndarray:
+        """
+        Returns the MTM cube of shape (Positions, Paths, Timesteps + 1), with
+        rows in position (compiled book) order.
+
+        Pass a precompiled InstrumentBook to skip the per-position compile step
+        on repeated pricing passes. Books bypass the cache, which needs the
+        instruments themselves as keys.
+
+        Raises:
+            KeyError: If a risk factor, rate or volatility is missing.
+            TypeError: If an instrument type is not supported.
+            ValueError: If a precompiled book does not match the environment.
+        """
+        with stage("value") as probe:
+            if self.cache is not None and not isinstance(positions, InstrumentBook):
+                cube = self._value_cached(positions, env, self.cache)
+            else:
+                cube = self._value_book(self._book(positions, env), env)
+            probe.array("state_tensor", env.state_tensor)
+            probe.array("cube", cube)
+            return cube
+
+    def _value_cached(
+        self,
+        positions: Sequence[Position],
+        env: MarketEnvironment,
+        cache: ValuationCache,
+    ) -> np.ndarray:
+        n_paths, n_points, _ = env.state_tensor.shape
+        dtype = np.result_type(env.state_tensor.dtype, np.float32)
+        cube = np.empty((len(positions), n_paths, n_points), dtype=dtype)
+
+        def key(inst: AnyInstrument) -> CacheKey:
+            return inst, env.fingerprint, self.params.fingerprint
+
+        # Rows still to price, grouped by instrument so shared ones price once
+        missing: Dict[AnyInstrument, List[int]] = {}
+        for row, pos in enumerate(positions):
+            values = cache.get(key(pos.instrument))
+            if values is None:
+                missing.setdefault(pos.instrument, []).append(row)
+            else:
+                cube[row] = values
+
+        if missing:
+            fresh = [Position(str(i), inst) for i, inst in enumerate(missing)]
+            priced = self._value_book(self._book(fresh, env), env)
+            for values, (inst, rows) in zip(priced, missing.items()):
+                cube[rows] = values
+                cache.put(key(inst), values)
+
+        return cube
+
+    def spot_delta(
+        self,
+        positions: InstrumentBook | Sequence[Position],
+        env: MarketEnvironment,
+    ) -> np.ndarray:
+        """
+        Returns the cube of closed-form spot deltas dV/dS, same layout as value.
+
+        The derivative is taken with respect to each position's own risk
+        factor level at every path and time step.
+
+        Raises:
+            KeyError: If a risk factor, rate or volatility is missing.
+            TypeError: If an instrument type is not supported.
+            ValueError: If a precompiled book does not match the environment.
+        """
+        return self._value_book(self._book(positions, env), env, delta=True)
+
+    def to_currency(
+        self,
+        cube: np.ndarray,
+        book: InstrumentBook,
+        env: MarketEnvironment,
+        currency: Currency,
+    ) -> np.ndarray:
+        """
+        Converts a value cube from each position's pricing currency into
+        currency, in place, and returns it.
+
+        Each row is multiplied by the simulated level of its pricing
+        currency's FX pair against currency, or divided by that of the
+        inverse pair, on the same path and time step as the value.
+
+        Raises:
+            KeyError: If neither FX pair of a pricing currency is simulated.
+            ValueError: If the book or cube does not match the environment.
+        """
+        book = self._book(book, env)
+        if cube.shape[:2] != (len(book), env.state_tensor.shape[0]):
+            raise ValueError(
+                f"Cube of shape {cube.shape} does not match {len(book)} positions "
+                f"on {env.state_tensor.shape[0]} paths."
+            )
+        currencies = list(CURRENCY_CODES)
+        codes = book.currencies
+        factors = env.schema.factor_indices
+        for code in np.unique(codes).tolist():
+            pricing = currencies[code]
+            if pricing is currency:
+                continue
+            rows = np.flatnonzero(codes == code)
+            direct = fx_pair_name(pricing, currency)
+            inverse = fx_pair_name(currency, pricing)
+            if direct in factors:
+                cube[rows] *= env.state_tensor[None, :, :, factors[direct]]
+            elif inverse in factors:
+                cube[rows] /= env.state_tensor[None, :, :, factors[inverse]]
+            else:
+                raise KeyError(
+                    f"Cannot convert {pricing.value} values into {currency.value}: "
+                    f"neither {direct} nor {inverse} is simulated."
+                )
+        return cube
+
+    def _value_book(
+        self, book: InstrumentBook, env: MarketEnvironment, delta: bool = False
+    ) -> np.ndarray:
+        forward = forward_delta if delta else forward_value
+        option = black_scholes_delta if delta else black_scholes_value
+
+        n_paths, n_points, _ = env.state_tensor.shape
+        dtype = np.result_type(env.state_tensor.dtype, np.float32)
+        cube = np.zeros((len(book), n_paths, n_points), dtype=dtype)
+
+        times = env.times
+        for inst_type, columns in book.columns.items():
+            # (n, Paths, Timesteps + 1) view over the gathered factor columns
+            S = np.moveaxis(env.state_tensor[:, :, columns.factor_index], -1, 0)
+            tau = columns.maturity[:, None, None] - times[None, None, :]
+            K = columns.strike[:, None, None]
+            r, q = self._carry(inst_type, columns, book.schema)
+
+            if inst_type in (EquityForward, FXForward):
+                cube[columns.rows] = forward(S, K, tau, r, q)
+            else:
+                sigma = self._volatilities(columns, book.schema)
+                omega = columns.option_type[:, None, None].astype(np.float64)
+                cube[columns.rows] = option(S, K, tau, r, q, sigma, omega)
+
+        return cube
+
+    def _book(
+        self,
+        positions: InstrumentBook | Sequence[Position],
+        env: MarketEnvironment,
+    ) -> InstrumentBook:
+        if not isinstance(positions, InstrumentBook):
+            return BookCompiler().compile(
+                positions, env.schema, self.params.valuation_date
+            )
+
+        if positions.schema != env.schema:
+            raise ValueError(
+                "Instrument book was compiled against a different risk factor schema."
+            )
+        if positions.valuation_date != self.params.valuation_date:
+            raise ValueError(
+                f"Instrument book valuation date {positions.valuation_date} does not "
+                f"match {self.params.valuation_date}."
+            )
+        return positions
+
+    def _rates(self, codes: np.ndarray) -> np.ndarray:
+        currencies = list(CURRENCY_CODES)
+        by_code = np.zeros(len(currencies))
+        for code in np.unique(codes).tolist():
+            by_code[code] = self.params.rate(currencies[code])
+        rates: np.ndarray = by_code[codes]
+        return rates
+
+    def _carry(
+        self,
+        inst_type: Type[AnyInstrument],
+        columns: InstrumentColumns,
+        schema: RiskFactorSchema,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        r = self._rates(columns.currency)
+        if inst_type in (EquityForward, EquityOption):
+            names = _factor_names(schema)
+            yields = np.array(
+                [self.params.dividend_yields.get(name, 0.0) for name in names]
+            )
+            q = yields[columns.factor_index]
+        else:
+            q = self._rates(columns.base_currency)
+        return r[:, None, None], q[:, None, None]
+
+    def _volatilities(
+        self, columns: InstrumentColumns, schema: RiskFactorSchema
+    ) -> np.ndarray:
+        names = _factor_names(schema)
+        by_factor = np.zeros(len(names))
+        for idx in np.unique(columns.factor_index).tolist():
+            by_factor[idx] = self.params.volatility(names[idx])
+        sigma: np.ndarray = by_factor[columns.factor_index]
+        return sigma[:, None, None]
+
+
+def _factor_names(schema: RiskFactorSchema) -> List[str]:
+    """Factor names ordered by tensor index."""
+    names = [""] * len(schema.factor_indices)
+    for name, idx in schema.factor_indices.items():
+        names[idx] = name
+    return names
@@ -0,0 +1,123 @@
+import io
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from skans.core.instrumentation import Instrumentation, StageRecord, stage
+from skans.core.rng import GeneratorRng
+from skans.domain.instruments import EquityForward
+from skans.domain.portfolio import NettingSet, Position, Trade
+from skans.domain.types.enums import Currency, LongShort
+from skans.exposure.engine import ExposureEngine
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market.resolver import DependencyResolver
+from skans.valuation.engine import ValuationEngine, ValuationParameters
+
+
+def test_stage_is_a_shared_no_op_when_disabled() -> None:
+    first = stage("simulate")
+    with first as probe:
+        probe.array("x", np.zeros(3))
+    assert stage("value") is first
+
+
+def test_stage_records_timing_and_arrays() -> None:
+    with Instrumentation() as instrumentation:
+        with stage("simulate") as probe:
+            probe.array("state_tensor", np.zeros((4, 3, 2)))
+            probe.shape("factors", (2,))
+
+    (record,) = instrumentation.records
+    assert record.stage == "simulate"
+    assert record.wall_seconds >= 0.0 and record.cpu_seconds >= 0.0
+    assert record.peak_allocated_bytes is None
+    assert record.shapes == {"state_tensor": (4, 3, 2), "factors": (2,)}
+    assert record.nbytes == {"state_tensor": 192, "factors": 0}
+    assert record.thread == "MainThread"
+
+
+def test_stage_records_on_error() -> None:
+    with Instrumentation() as instrumentation:
+        with pytest.raises(RuntimeError):
+            with stage("value"):
+                raise RuntimeError("pricing failed")
+    assert [r.stage for r in instrumentation.records] == ["value"]
+
+
+def test_trace_memory_measures_peak_allocation() -> None:
+    with Instrumentation(trace_memory=True) as instrumentation:
+        with stage("allocate"):
+            block = np.ones(1_000_000)
+            del block
+
+    peak = instrumentation.records[0].peak_allocated_bytes
+    assert peak is not None and peak >= 8_000_000
+
+
+def test_trace_memory_skips_overlapping_stages() -> None:
+    with Instrumentation(trace_memory=True) as instrumentation:
+        with stage("simulate"):
+            with stage("value"):
+                block = np.ones(100_000)
+                del block
+        with stage("aggregate"):
+            pass
+
+    peaks = {r.stage: r.peak_allocated_bytes for r in instrumentation.records}
+    assert peaks["simulate"] is None and peaks["value"] is None
+    assert peaks["aggregate"] is not None
+
+
+def test_callbacks_and_exports() -> None:
+    received: list[StageRecord] = []
+    with Instrumentation(callbacks=[received.append]) as instrumentation:
+        for _ in range(2):
+            with stage("aggregate") as probe:
+                probe.array("netted", np.zeros((2, 5)))
+
+    assert received == instrumentation.records
+    summary = instrumentation.summary()
+    assert summary["aggregate"]["calls"] == 2
+    assert summary["aggregate"]["max_array_bytes"] == 80
+
+    buffer = io.StringIO()
+    instrumentation.write_jsonl(buffer)
+    lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert lines == instrumentation.to_dicts()
+    assert lines[0]["shapes"] == {"netted": [2, 5]}
+
+
+def test_only_one_instrumentation_is_active() -> None:
+    with Instrumentation():
+        with pytest.raises(RuntimeError, match="already active"):
+            with Instrumentation():
+                pass
+    assert stage("x") is stage("y")
+
+
+def test_pipeline_stages_are_hooked() -> None:
+    positions = [
+        Position("P1", EquityForward("AAPL", 100.0, date(2026, 1, 1), Currency.USD))
+    ]
+    trades = [Trade("T1", "P1", "CP1", 10.0, LongShort.LONG)]
+    netting_sets = [NettingSet("NS1", "CP1", frozenset({"T1"}))]
+
+    with Instrumentation() as instrumentation:
+        schema = DependencyResolver().resolve(positions)
+        params = GBMParameters.from_schema(
+            schema, S0={"AAPL": 100.0}, mu={"AAPL": 0.0}, sigma={"AAPL": 0.2}
+        )
+        env = MarketGenerator(GeneratorRng(seed=1)).generate(schema, params, 1.0, 4, 50)
+        cube = ValuationEngine(
+            ValuationParameters(date(2025, 1, 1), rates={Currency.USD: 0.01})
+        ).value(positions, env)
+        ExposureEngine().position_profiles(
+            cube, ["P1"], trades, netting_sets, env.times
+        )
+
+    stages = [record.stage for record in instrumentation.records]
+    assert stages == ["resolve", "simulate", "value", "aggregate", "summarise"]
+    assert instrumentation.records[1].nbytes["state_tensor"] == env.state_tensor.nbytes
+    assert instrumentation.records[2].shapes["cube"] == (1, 50, 5)
@@ -1,6 +1,17 @@
+import subprocess
+import sys
+
 import numpy as np
+import pytest
 
-from skans.core.rng import SimpleRng, RandomNumberGenerator
+from skans.core.rng import (
+    BufferedRandomNumberGenerator,
+    CommonRandomNumbers,
+    GeneratorRng,
+    RandomNumberGenerator,
+    SimpleRng,
+    SobolRng,
+)
 
 
 def test_simple_rng_protocol_compliance() -> None:
@@ -26,3 +37,137 @@ def test_simple_rng_generate_type() -> None:
     n_steps = 5
     result = rng.generate(n_paths, n_steps)
     assert result.dtype == np.float64 or result.dtype == float
+
+
+def test_generator_rng_protocol_compliance() -> None:
+    rng = GeneratorRng(seed=1)
+    assert isinstance(rng, RandomNumberGenerator)
+    assert isinstance(rng, BufferedRandomNumberGenerator)
+    assert not isinstance(SimpleRng(), BufferedRandomNumberGenerator)
+
+
+def test_generator_rng_reproducible_from_seed() -> None:
+    first = GeneratorRng(seed=42).generate(100, 20)
+    second = GeneratorRng(seed=42).generate(100, 20)
+    assert first.shape == (100, 20)
+    assert np.array_equal(first, second)
+
+
+def test_generator_rng_successive_draws_differ() -> None:
+    rng = GeneratorRng(seed=42)
+    assert not np.array_equal(rng.generate(10, 5), rng.generate(10, 5))
+
+
+@pytest.mark.parametrize("bit_generator", ["PCG64", "Philox"])
+def test_generator_rng_worker_count_invariance(bit_generator: str) -> None:
+    reference = GeneratorRng(
+        seed=7, bit_generator=bit_generator, block_size=64, n_workers=1
+    ).generate(1000, 30)
+
+    for n_workers in (2, 3, 8):
+        rng = GeneratorRng(
+            seed=7, bit_generator=bit_generator, block_size=64, n_workers=n_workers
+        )
+        assert np.array_equal(rng.generate(1000, 30), reference)
+
+
+def test_generator_rng_fill_float32() -> None:
+    out = np.empty((50, 10), dtype=np.float32)
+    GeneratorRng(seed=3).fill(out)
+    assert out.dtype == np.float32
+    assert np.all(np.isfinite(out))
+
+
+def test_path_stream_chunks_match_single_shot() -> None:
+    reference = GeneratorRng(seed=11, block_size=16).generate(100, 8)
+
+    stream = GeneratorRng(seed=11, block_size=16).stream()
+    chunks = [stream.generate(n, 8) for n in (7, 30, 1, 62)]
+    assert np.array_equal(np.vstack(chunks), reference)
+
+
+def test_path_stream_seek() -> None:
+    reference = GeneratorRng(seed=5, block_size=10).generate(40, 4)
+
+    stream = GeneratorRng(seed=5, block_size=10).stream()
+    stream.seek(25)
+    assert np.array_equal(stream.generate(15, 4), reference[25:])
+
+
+def test_path_stream_fill_non_contiguous() -> None:
+    reference = GeneratorRng(seed=9, block_size=8).generate(20, 6)
+
+    buffer = np.zeros((20, 7))
+    GeneratorRng(seed=9, block_size=8).fill(buffer[:, 1:])
+    assert np.array_equal(buffer[:, 1:], reference)
+    assert np.all(buffer[:, 0] == 0.0)
+
+
+def test_generator_rng_unknown_bit_generator() -> None:
+    with pytest.raises(ValueError, match="Unsupported bit generator 'MT'"):
+        GeneratorRng(bit_generator="MT")
+
+
+def test_sobol_rng_protocol_compliance() -> None:
+    assert isinstance(SobolRng(), RandomNumberGenerator)
+
+
+def test_sobol_rng_generate_shape_and_moments() -> None:
+    result = SobolRng(seed=1).generate(4096, 16)
+    assert result.shape == (4096, 16)
+    assert np.all(np.isfinite(result))
+    assert np.allclose(result.mean(axis=0), 0.0, atol=0.01)
+    assert np.allclose(result.std(axis=0), 1.0, atol=0.02)
+
+
+def test_sobol_rng_continues_sequence() -> None:
+    rng = SobolRng(seed=2)
+    chunks = np.vstack([rng.generate(8, 4), rng.generate(8, 4)])
+    assert np.array_equal(chunks, SobolRng(seed=2).generate(16, 4))
+
+
+def test_sobol_rng_unscrambled_is_finite() -> None:
+    result = SobolRng(scramble=False).generate(8, 3)
+    assert np.all(np.isfinite(result))
+
+
+def test_rng_import_defers_scipy_stats() -> None:
+    script = "import sys, skans.core.rng; print('scipy.stats' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_sobol_rng_unscrambled_skips_origin() -> None:
+    result = SobolRng(scramble=False).generate(7, 3)
+    # The first point after the origin is the centre of the unit cube
+    assert np.array_equal(result[0], np.zeros(3))
+    assert np.abs(result).max() < 2.0
+
+
+def test_common_random_numbers_replay_after_rewind() -> None:
+    crn = CommonRandomNumbers(GeneratorRng(seed=3))
+    first = crn.generate(4, 3)
+    out = np.empty((5, 2), dtype=np.float32)
+    crn.fill(out)
+
+    crn.rewind()
+    assert np.array_equal(crn.generate(4, 3), first)
+    replayed = np.empty((5, 2), dtype=np.float32)
+    crn.fill(replayed)
+    assert np.array_equal(replayed, out)
+
+
+def test_common_random_numbers_continues_without_rewind() -> None:
+    crn = CommonRandomNumbers(SimpleRng())
+    assert isinstance(crn, BufferedRandomNumberGenerator)
+    assert not np.array_equal(crn.generate(4, 3), crn.generate(4, 3))
+
+
+def test_common_random_numbers_shape_mismatch() -> None:
+    crn = CommonRandomNumbers(GeneratorRng(seed=3))
+    crn.generate(4, 3)
+    crn.rewind()
+    with pytest.raises(ValueError, match="requested"):
+        crn.generate(3, 4)
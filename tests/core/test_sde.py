@@ -1,7 +1,17 @@
+import tracemalloc
+
 import numpy as np
+import pytest
 
-from skans.core.sde import geometric_brownian_motion
-from skans.core.rng import SimpleRng
+from skans.core.sde import (
+    PathConstruction,
+    VarianceReduction,
+    brownian_bridge,
+    draw_normals,
+    geometric_brownian_motion,
+    correlated_geometric_brownian_motion,
+)
+from skans.core.rng import GeneratorRng, SimpleRng, SobolRng
 
 
 def test_geometric_brownian_motion_default_rng() -> None:
@@ -61,3 +71,352 @@ def test_geometric_brownian_motion_variance_scaling() -> None:
 
     # Check if variance is close to expected value
     assert np.isclose(variance, expected_variance, rtol=0.2)
+
+
+def test_correlated_gbm_shape_and_initial_value() -> None:
+    S0 = np.array([100.0, 50.0, 20.0])
+    mu = np.array([0.05, 0.02, 0.0])
+    sigma = np.array([0.2, 0.3, 0.1])
+    correlation = np.eye(3)
+    n_steps = 10
+    n_paths = 200
+
+    paths = correlated_geometric_brownian_motion(
+        S0, mu, sigma, correlation, 1.0, n_steps, n_paths
+    )
+    assert paths.shape == (n_paths, n_steps + 1, 3)
+    assert np.all(paths[:, 0, :] == S0)
+
+
+def test_correlated_gbm_writes_into_out() -> None:
+    out = np.empty((50, 6, 2))
+    result = correlated_geometric_brownian_motion(
+        np.array([1.0, 2.0]),
+        np.zeros(2),
+        np.array([0.1, 0.2]),
+        np.eye(2),
+        1.0,
+        5,
+        50,
+        out=out,
+    )
+    assert result is out
+
+
+def test_correlated_gbm_correlation() -> None:
+    rho = 0.7
+    correlation = np.array([[1.0, rho], [rho, 1.0]])
+    T = 1.0
+
+    paths = correlated_geometric_brownian_motion(
+        np.array([100.0, 100.0]),
+        np.zeros(2),
+        np.array([0.2, 0.2]),
+        correlation,
+        T,
+        1,
+        20000,
+    )
+    log_returns = np.log(paths[:, -1, :] / 100.0)
+    realised = np.corrcoef(log_returns[:, 0], log_returns[:, 1])[0, 1]
+    assert np.isclose(realised, rho, atol=0.05)
+
+
+def test_correlated_gbm_rejects_invalid_correlation() -> None:
+    with pytest.raises(ValueError, match="positive definite"):
+        correlated_geometric_brownian_motion(
+            np.ones(2),
+            np.zeros(2),
+            np.ones(2),
+            np.array([[1.0, 2.0], [2.0, 1.0]]),
+            1.0,
+            5,
+            10,
+        )
+
+
+def test_brownian_bridge_terminal_and_origin() -> None:
+    Z = np.random.randn(100, 8)
+    times = np.linspace(0.0, 2.0, 9)
+
+    W = brownian_bridge(Z, times)
+    assert W.shape == (100, 9)
+    assert np.all(W[:, 0] == 0.0)
+    # The first normal drives the terminal value
+    assert np.allclose(W[:, -1], np.sqrt(2.0) * Z[:, 0])
+
+
+def test_brownian_bridge_covariance() -> None:
+    n_steps = 7
+    times = np.linspace(0.0, 1.0, n_steps + 1)
+
+    W = brownian_bridge(np.random.randn(50000, n_steps), times)
+    covariance = np.cov(W[:, 1:], rowvar=False)
+    expected = np.minimum.outer(times[1:], times[1:])
+    assert np.allclose(covariance, expected, atol=0.03)
+
+
+def test_geometric_brownian_motion_brownian_bridge() -> None:
+    S0 = 100.0
+    sigma = 0.2
+    T = 1.0
+    n_steps = 64
+    n_paths = 4096
+
+    paths = geometric_brownian_motion(
+        S0,
+        0.05,
+        sigma,
+        T,
+        n_steps,
+        n_paths,
+        rng=SobolRng(seed=3),
+        construction=PathConstruction.BROWNIAN_BRIDGE,
+    )
+    assert paths.shape == (n_paths, n_steps + 1)
+    assert np.all(paths[:, 0] == S0)
+
+    variance = np.var(np.log(paths[:, -1] / S0))
+    assert np.isclose(variance, sigma**2 * T, rtol=0.05)
+
+
+def test_correlated_gbm_brownian_bridge_matches_standard_marginals() -> None:
+    rho = 0.5
+    correlation = np.array([[1.0, rho], [rho, 1.0]])
+
+    paths = correlated_geometric_brownian_motion(
+        np.array([1.0, 1.0]),
+        np.zeros(2),
+        np.array([0.2, 0.3]),
+        correlation,
+        1.0,
+        16,
+        8192,
+        rng=SobolRng(seed=4),
+        construction=PathConstruction.BROWNIAN_BRIDGE,
+    )
+    log_returns = np.log(paths[:, -1, :])
+    assert np.allclose(np.var(log_returns, axis=0), [0.04, 0.09], rtol=0.05)
+    realised = np.corrcoef(log_returns[:, 0], log_returns[:, 1])[0, 1]
+    assert np.isclose(realised, rho, atol=0.03)
+
+
+def test_draw_normals_antithetic_mirrors_half() -> None:
+    Z = draw_normals(GeneratorRng(seed=1), 11, 4, VarianceReduction.ANTITHETIC)
+    assert Z.shape == (11, 4)
+    assert np.array_equal(Z[6:], -Z[:5])
+
+
+def test_draw_normals_antithetic_draws_half(monkeypatch: pytest.MonkeyPatch) -> None:
+    requested = []
+    rng = SimpleRng()
+    original = rng.generate
+
+    def spy(n_paths: int, n_steps: int) -> np.ndarray:
+        requested.append((n_paths, n_steps))
+        return original(n_paths, n_steps)
+
+    monkeypatch.setattr(rng, "generate", spy)
+    draw_normals(rng, 100, 3, VarianceReduction.ANTITHETIC)
+    assert requested == [(50, 3)]
+
+
+def test_draw_normals_moment_matching() -> None:
+    Z = draw_normals(SimpleRng(), 500, 6, VarianceReduction.MOMENT_MATCHING)
+    assert np.allclose(Z.mean(axis=0), 0.0)
+    assert np.allclose(Z.std(axis=0), 1.0)
+
+
+def test_geometric_brownian_motion_antithetic_log_returns_cancel() -> None:
+    mu = 0.05
+    sigma = 0.2
+    paths = geometric_brownian_motion(
+        1.0,
+        mu,
+        sigma,
+        1.0,
+        10,
+        1000,
+        variance_reduction=VarianceReduction.ANTITHETIC,
+    )
+    # Mirrored normals leave only the deterministic drift in the mean log-return
+    log_returns = np.log(paths[:, -1])
+    assert np.isclose(log_returns.mean(), mu - 0.5 * sigma**2)
+
+
+def test_correlated_gbm_moment_matching() -> None:
+    paths = correlated_geometric_brownian_motion(
+        np.array([1.0, 1.0]),
+        np.zeros(2),
+        np.array([0.2, 0.3]),
+        np.eye(2),
+        1.0,
+        1,
+        1000,
+        variance_reduction=VarianceReduction.MOMENT_MATCHING,
+    )
+    log_returns = np.log(paths[:, -1, :])
+    assert np.allclose(np.std(log_returns, axis=0), [0.2, 0.3])
+
+
+def test_geometric_brownian_motion_writes_into_out() -> None:
+    out = np.empty((200, 51))
+    result = geometric_brownian_motion(100.0, 0.05, 0.2, 1.0, 50, 200, out=out)
+    assert result is out
+    assert np.all(out[:, 0] == 100.0)
+
+
+def test_geometric_brownian_motion_out_shape_mismatch() -> None:
+    with pytest.raises(ValueError, match="Output must have shape"):
+        geometric_brownian_motion(
+            100.0, 0.05, 0.2, 1.0, 50, 200, out=np.empty((200, 50))
+        )
+
+
+@pytest.mark.parametrize("construction", list(PathConstruction))
+def test_geometric_brownian_motion_float32(construction: PathConstruction) -> None:
+    sigma = 0.2
+    paths = geometric_brownian_motion(
+        100.0,
+        0.05,
+        sigma,
+        1.0,
+        32,
+        20000,
+        rng=GeneratorRng(seed=8),
+        construction=construction,
+        dtype=np.float32,
+    )
+    assert paths.dtype == np.float32
+    assert np.all(paths[:, 0] == np.float32(100.0))
+    variance = np.var(np.log(paths[:, -1] / 100.0))
+    assert np.isclose(variance, sigma**2, rtol=0.1)
+
+
+@pytest.mark.parametrize("construction", list(PathConstruction))
+def test_geometric_brownian_motion_in_place_memory(
+    construction: PathConstruction,
+) -> None:
+    n_paths, n_steps = 4096, 256
+    out = np.empty((n_paths, n_steps + 1))
+    rng = GeneratorRng(seed=1, block_size=256)
+
+    tracemalloc.start()
+    geometric_brownian_motion(
+        1.0,
+        0.0,
+        0.2,
+        1.0,
+        n_steps,
+        n_paths,
+        rng=rng,
+        out=out,
+        construction=construction,
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Scratch space stays a small fraction of a single (paths x steps) array
+    assert peak < 0.25 * out.nbytes
+
+
+def test_geometric_brownian_motion_seeded_is_reproducible() -> None:
+    first = geometric_brownian_motion(
+        1.0, 0.0, 0.2, 1.0, 10, 100, rng=GeneratorRng(seed=5)
+    )
+    second = geometric_brownian_motion(
+        1.0, 0.0, 0.2, 1.0, 10, 100, rng=GeneratorRng(seed=5)
+    )
+    assert np.array_equal(first, second)
+
+
+def test_correlated_gbm_float32() -> None:
+    paths = correlated_geometric_brownian_motion(
+        np.array([1.0, 2.0]),
+        np.zeros(2),
+        np.array([0.1, 0.2]),
+        np.array([[1.0, 0.5], [0.5, 1.0]]),
+        1.0,
+        8,
+        100,
+        rng=GeneratorRng(seed=2),
+        dtype=np.float32,
+    )
+    assert paths.dtype == np.float32
+    assert np.array_equal(paths[:, 0, :], np.broadcast_to([1.0, 2.0], (100, 2)))
+
+
+def test_geometric_brownian_motion_explicit_uniform_grid() -> None:
+    default = geometric_brownian_motion(
+        1.0, 0.05, 0.2, 1.0, 8, 50, rng=GeneratorRng(seed=3)
+    )
+    explicit = geometric_brownian_motion(
+        1.0, 0.05, 0.2, 1.0, 8, 50, rng=GeneratorRng(seed=3), times=np.linspace(0, 1, 9)
+    )
+    assert np.allclose(default, explicit)
+
+
+@pytest.mark.parametrize("construction", list(PathConstruction))
+def test_geometric_brownian_motion_non_uniform_grid(
+    construction: PathConstruction,
+) -> None:
+    times = np.array([0.0, 1 / 365, 7 / 365, 0.5, 2.0])
+    rng = GeneratorRng(seed=11)
+    paths = geometric_brownian_motion(
+        1.0, 0.0, 0.3, 2.0, 4, 200_000, rng=rng, construction=construction, times=times
+    )
+
+    # Exact transitions: log-level variance is sigma^2 t at every grid point
+    log_var = np.log(paths[:, 1:]).var(axis=0)
+    assert np.allclose(log_var, 0.09 * times[1:], rtol=0.02)
+
+
+@pytest.mark.parametrize(
+    "times, match",
+    [
+        ([0.0, 0.5, 1.0], "n_steps \\+ 1"),
+        ([0.1, 0.2, 0.5, 1.0], "start at 0"),
+        ([0.0, 0.5, 0.5, 1.0], "strictly increasing"),
+        ([0.0, 0.2, 0.5, 0.9], "expected T"),
+    ],
+)
+def test_geometric_brownian_motion_invalid_grid(times: list[float], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        geometric_brownian_motion(1.0, 0.0, 0.2, 1.0, 3, 10, times=times)
+
+
+def test_correlated_gbm_non_uniform_grid() -> None:
+    times = np.array([0.0, 0.01, 0.1, 1.0])
+    paths = correlated_geometric_brownian_motion(
+        np.array([1.0, 1.0]),
+        np.zeros(2),
+        np.array([0.2, 0.2]),
+        np.array([[1.0, 0.5], [0.5, 1.0]]),
+        1.0,
+        3,
+        100_000,
+        rng=GeneratorRng(seed=4),
+        times=times,
+    )
+    log_paths = np.log(paths)
+    assert np.allclose(log_paths[:, 1:, 0].var(axis=0), 0.04 * times[1:], rtol=0.03)
+    corr = np.corrcoef(log_paths[:, 1, 0], log_paths[:, 1, 1])[0, 1]
+    assert corr == pytest.approx(0.5, abs=0.02)
+
+
+def test_correlated_gbm_is_invariant_to_path_blocks() -> None:
+    S0, mu, sigma = np.ones(2), np.zeros(2), np.full(2, 0.2)
+    correlation = np.array([[1.0, 0.6], [0.6, 1.0]])
+
+    # 3000 paths of 4 steps span several correlation tiles
+    full = correlated_geometric_brownian_motion(
+        S0, mu, sigma, correlation, 1.0, 4, 3000, rng=GeneratorRng(seed=4).stream()
+    )
+    stream = GeneratorRng(seed=4).stream()
+    blocks = [
+        correlated_geometric_brownian_motion(
+            S0, mu, sigma, correlation, 1.0, 4, n, rng=stream
+        )
+        for n in (7, 2500, 493)
+    ]
+    assert np.array_equal(full, np.concatenate(blocks))
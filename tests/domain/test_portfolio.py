@@ -1,5 +1,6 @@
 from datetime import date
 import pytest
+import numpy as np
 from skans.domain.portfolio import Position, Trade, Portfolio, NettingSet
 from skans.domain.instruments.equity.forward import EquityForward
 from skans.domain.types.enums import Currency, LongShort
@@ -115,3 +116,71 @@ def test_nettingset_immutability() -> None:
     )
     with pytest.raises(AttributeError):
         ns.netting_set_id = "NS002"  # type: ignore[misc]
+
+
+@pytest.fixture
+def indexed_portfolio() -> Portfolio:
+    trades = (
+        Trade("T1", "P1", "C1", 10.0, LongShort.LONG),
+        Trade("T2", "P2", "C2", 20.0, LongShort.SHORT),
+        Trade("T3", "P1", "C2", 5.0, LongShort.SHORT),
+        Trade("T4", "P3", "C1", 1.0, LongShort.LONG),
+    )
+    netting_sets = (
+        NettingSet("NS1", "C1", frozenset({"T4", "T1"})),
+        NettingSet("NS2", "C2", frozenset({"T2", "T3"})),
+    )
+    return Portfolio("PORT002", trades, netting_sets)
+
+
+def test_portfolio_counterparty_rows(indexed_portfolio: Portfolio) -> None:
+    """Test that counterparty lookups return ascending trade rows."""
+    rows = indexed_portfolio.counterparty_rows("C1")
+    assert rows.dtype == np.int64
+    assert rows.tolist() == [0, 3]
+    assert indexed_portfolio.counterparty_rows("C2").tolist() == [1, 2]
+    assert indexed_portfolio.counterparty_rows("NONE").size == 0
+
+
+def test_portfolio_position_rows(indexed_portfolio: Portfolio) -> None:
+    """Test that position lookups return the rows of trades on a position."""
+    assert indexed_portfolio.position_rows("P1").tolist() == [0, 2]
+    assert indexed_portfolio.position_rows("P3").tolist() == [3]
+
+
+def test_portfolio_netting_set_rows(indexed_portfolio: Portfolio) -> None:
+    """Test that netting set lookups return sorted rows of member trades."""
+    assert indexed_portfolio.netting_set_rows("NS1").tolist() == [0, 3]
+    trades = indexed_portfolio.select(indexed_portfolio.netting_set_rows("NS2"))
+    assert [t.trade_id for t in trades] == ["T2", "T3"]
+
+    with pytest.raises(KeyError, match="Netting set 'NS9' not found."):
+        indexed_portfolio.netting_set_rows("NS9")
+
+
+def test_portfolio_netting_set_unknown_trade() -> None:
+    """Test KeyError when a netting set refers to a trade not in the portfolio."""
+    portfolio = Portfolio(
+        "PORT003",
+        (Trade("T1", "P1", "C1", 10.0, LongShort.LONG),),
+        (NettingSet("NS1", "C1", frozenset({"T1", "T9"})),),
+    )
+    with pytest.raises(KeyError, match="Trade 'T9' of netting set 'NS1' not found."):
+        portfolio.netting_set_rows("NS1")
+
+
+def test_portfolio_indexes_are_cached_and_read_only(
+    indexed_portfolio: Portfolio,
+) -> None:
+    """Test that index arrays are built once and cannot be mutated."""
+    rows = indexed_portfolio.counterparty_rows("C1")
+    assert indexed_portfolio.counterparty_rows("C1") is rows
+    with pytest.raises(ValueError, match="read-only"):
+        rows[0] = 1
+
+
+def test_portfolio_empty_indexes() -> None:
+    """Test lookups on a portfolio without trades."""
+    portfolio = Portfolio("EMPTY", ())
+    assert portfolio.counterparty_rows("C1").size == 0
+    assert portfolio.position_rows("P1").size == 0
@@ -0,0 +1,135 @@
+import pytest
+import numpy as np
+from skans.domain.portfolio import NettingSet, Portfolio, Trade
+from skans.domain.table import TradeTable
+from skans.domain.types.enums import LongShort
+
+
+@pytest.fixture
+def portfolio() -> Portfolio:
+    trades = (
+        Trade("T1", "P1", "C1", 10.0, LongShort.LONG),
+        Trade("T2", "P1", "C2", 20.0, LongShort.SHORT),
+        Trade("T3", "P2", "C1", 5.0, LongShort.LONG),
+    )
+    netting_sets = (NettingSet("NS1", "C1", frozenset({"T3", "T1"})),)
+    return Portfolio("PORT001", trades, netting_sets)
+
+
+@pytest.fixture
+def table(portfolio: Portfolio) -> TradeTable:
+    return TradeTable.from_portfolio(portfolio)
+
+
+def test_table_encodes_categories(table: TradeTable) -> None:
+    """Test that positions and counterparties are stored as int32 codes."""
+    assert table.portfolio_id == "PORT001"
+    assert table.position_codes.dtype == np.int32
+    assert list(table.position_categories) == ["P1", "P2"]
+    assert list(table.counterparty_categories) == ["C1", "C2"]
+    assert list(table.counterparty_id) == ["C1", "C2", "C1"]
+    assert table.direction.dtype == np.int8
+
+
+def test_table_sequence_api(table: TradeTable, portfolio: Portfolio) -> None:
+    """Test that indexing and iteration yield equivalent Trade views."""
+    assert len(table) == len(portfolio)
+    assert table[1] == portfolio.trades[1]
+    assert tuple(table) == portfolio.trades
+    assert table.trades is table
+
+
+def test_table_get_trade(table: TradeTable) -> None:
+    """Test binary-search lookup by trade ID."""
+    assert table.get_trade("T3") == Trade("T3", "P2", "C1", 5.0, LongShort.LONG)
+    with pytest.raises(KeyError, match="Trade 'T9' not found."):
+        table.get_trade("T9")
+
+
+def test_table_row_indexes(table: TradeTable, portfolio: Portfolio) -> None:
+    """Test that row lookups agree with the Portfolio indexes."""
+    for counterparty in ("C1", "C2", "C9"):
+        assert np.array_equal(
+            table.counterparty_rows(counterparty),
+            portfolio.counterparty_rows(counterparty),
+        )
+    assert table.position_rows("P1").tolist() == [0, 1]
+    assert table.netting_set_rows("NS1").tolist() == [0, 2]
+    with pytest.raises(KeyError, match="Netting set 'NS9' not found."):
+        table.netting_set_rows("NS9")
+
+
+def test_table_select_and_slice(table: TradeTable) -> None:
+    """Test that selections return smaller tables sharing the categories."""
+    selected = table.select(table.counterparty_rows("C1"))
+    assert [t.trade_id for t in selected] == ["T1", "T3"]
+    assert selected.position_categories is table.position_categories
+
+    head = table[:2]
+    assert isinstance(head, TradeTable)
+    assert list(head.trade_id) == ["T1", "T2"]
+
+
+def test_table_non_ascii_trade_ids() -> None:
+    """Test that trade IDs round-trip through their UTF-8 encoding."""
+    table = TradeTable.from_columns(
+        trade_id=["TRÄDE-1", "T2"],
+        position_id=["P1", "P1"],
+        counterparty_id=["C1", "C1"],
+        quantity=np.ones(2),
+        direction=np.array([1, -1], dtype=np.int8),
+    )
+    assert table.get_trade("TRÄDE-1").trade_id == "TRÄDE-1"
+    assert [t.trade_id for t in table] == ["TRÄDE-1", "T2"]
+
+
+def test_table_signed_quantity(table: TradeTable) -> None:
+    """Test that signed quantity applies the direction."""
+    assert np.array_equal(table.signed_quantity, [10.0, -20.0, 5.0])
+
+
+def test_table_columns_are_read_only(table: TradeTable) -> None:
+    """Test that columns cannot be mutated."""
+    with pytest.raises(ValueError, match="read-only"):
+        table.quantity[0] = 1.0
+
+
+def test_table_is_compact() -> None:
+    """Test that the per-trade footprint is a few dozen bytes."""
+    n = 10_000
+    table = TradeTable.from_columns(
+        trade_id=[f"TRD{i:07d}" for i in range(n)],
+        position_id=[f"POS{i % 700:05d}" for i in range(n)],
+        counterparty_id=[f"CP{i % 50:03d}" for i in range(n)],
+        quantity=np.ones(n),
+        direction=np.ones(n, dtype=np.int8),
+    )
+    # 10-byte UTF-8 IDs plus 17 bytes of codes and numbers
+    assert table.nbytes <= 30 * n
+
+
+def test_table_length_mismatch() -> None:
+    """Test ValueError when columns differ in length."""
+    with pytest.raises(ValueError, match="differ in length"):
+        TradeTable.from_columns(
+            trade_id=["T1"],
+            position_id=["P1"],
+            counterparty_id=["C1"],
+            quantity=np.array([1.0, 2.0]),
+            direction=np.array([1], dtype=np.int8),
+        )
+
+
+def test_netting_set_errors_match_portfolio(portfolio: Portfolio) -> None:
+    """Test that both containers reject unknown and dangling netting sets alike."""
+    dangling = Portfolio(
+        "PORT002",
+        portfolio.trades,
+        (NettingSet("NS2", "C1", frozenset({"T1", "T9"})),),
+    )
+    for trades in (dangling, TradeTable.from_portfolio(dangling)):
+        with pytest.raises(KeyError, match="Trade 'T9' of netting set 'NS2'"):
+            trades.netting_set_rows("NS2")
+    for trades in (portfolio, TradeTable.from_portfolio(portfolio)):
+        with pytest.raises(KeyError, match="Netting set 'NS9' not found"):
+            trades.netting_set_rows("NS9")
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from skans.domain.portfolio import Trade
+from skans.domain.types.enums import LongShort
+from skans.exposure.allocation import trade_matrix, trade_values
+
+POSITION_IDS = ["P1", "P2"]
+
+
+@pytest.fixture
+def trades() -> list[Trade]:
+    return [
+        Trade("T1", "P1", "CP1", 100.0, LongShort.LONG),
+        Trade("T2", "P1", "CP2", 40.0, LongShort.SHORT),
+        Trade("T3", "P2", "CP1", 5.0, LongShort.LONG),
+    ]
+
+
+def test_trade_matrix_signed_quantities(trades: list[Trade]) -> None:
+    """Test that LONG maps to +quantity and SHORT to -quantity."""
+    matrix = trade_matrix(trades, POSITION_IDS)
+    assert matrix.shape == (3, 2)
+    assert np.array_equal(matrix.toarray(), [[100.0, 0.0], [-40.0, 0.0], [0.0, 5.0]])
+
+
+def test_trade_matrix_unknown_position(trades: list[Trade]) -> None:
+    """Test KeyError when a trade refers to a position that was not priced."""
+    with pytest.raises(KeyError, match="P2"):
+        trade_matrix(trades, ["P1"])
+
+
+def test_trade_values_scale_position_rows(trades: list[Trade]) -> None:
+    """Test that trade values reuse each position's priced row."""
+    cube = np.random.default_rng(1).standard_normal((2, 4, 3))
+    values = trade_values(cube, POSITION_IDS, trades)
+
+    assert values.shape == (3, 4, 3)
+    assert np.allclose(values[0], 100.0 * cube[0])
+    assert np.allclose(values[1], -40.0 * cube[0])
+    assert np.allclose(values[2], 5.0 * cube[1])
+
+
+def test_trade_values_shape_mismatch(trades: list[Trade]) -> None:
+    """Test ValueError when position ids do not match the cube."""
+    with pytest.raises(ValueError, match="does not match 2 positions"):
+        trade_values(np.zeros((3, 4, 3)), POSITION_IDS, trades)
@@ -0,0 +1,245 @@
+from pathlib import Path
+import pytest
+import numpy as np
+from skans.domain.portfolio import NettingSet, Trade
+from skans.domain.types.enums import Currency, LongShort
+from skans.exposure.allocation import trade_values
+from skans.exposure.engine import ExposureEngine, netting_matrix
+
+TRADE_IDS = ["T1", "T2", "T3"]
+
+
+@pytest.fixture
+def netting_sets() -> list[NettingSet]:
+    return [
+        NettingSet("NS1", "CP1", frozenset({"T1", "T2"})),
+        NettingSet("NS2", "CP2", frozenset({"T3"})),
+    ]
+
+
+@pytest.fixture
+def cube() -> np.ndarray:
+    # (trades, paths, steps + 1)
+    rng = np.random.default_rng(7)
+    return rng.standard_normal((3, 200, 5))
+
+
+def test_netting_matrix_membership(netting_sets: list[NettingSet]) -> None:
+    """Test that the sparse matrix maps trades to their netting sets."""
+    matrix = netting_matrix(TRADE_IDS, netting_sets)
+    assert matrix.shape == (2, 3)
+    assert np.array_equal(matrix.toarray(), [[1, 1, 0], [0, 0, 1]])
+
+
+def test_netting_matrix_unknown_trade() -> None:
+    """Test KeyError when a netting set refers to a trade outside the cube."""
+    ns = NettingSet("NS1", "CP1", frozenset({"T9"}))
+    with pytest.raises(KeyError, match="Trade 'T9' of netting set 'NS1'"):
+        netting_matrix(TRADE_IDS, [ns])
+
+
+def test_net_sums_member_trades(
+    cube: np.ndarray, netting_sets: list[NettingSet]
+) -> None:
+    """Test that netting sums trade values within each set."""
+    netted = ExposureEngine().net(cube, TRADE_IDS, netting_sets)
+    assert netted.shape == (2, 200, 5)
+    assert np.allclose(netted[0], cube[0] + cube[1])
+    assert np.allclose(netted[1], cube[2])
+
+
+def test_profiles_statistics(cube: np.ndarray, netting_sets: list[NettingSet]) -> None:
+    """Test EE, EEE, EPE, EEPE and PFE against direct computation."""
+    times = np.array([0.0, 0.25, 0.5, 1.0, 2.0])
+    engine = ExposureEngine(quantiles=(0.9, 0.99), horizon=1.0)
+    profiles = engine.profiles(cube, TRADE_IDS, netting_sets, times)
+
+    exposure = np.maximum(cube[0] + cube[1], 0.0)
+    ee = exposure.mean(axis=0)
+    eee = np.maximum.accumulate(ee)
+    # Right-point weights on (0, 1]: 0.25, 0.25, 0.5; t = 2 is past the horizon
+    weights = np.array([0.0, 0.25, 0.25, 0.5, 0.0])
+
+    assert profiles.netting_set_ids == ("NS1", "NS2")
+    assert np.allclose(profiles.ee[0], ee)
+    assert np.allclose(profiles.eee[0], eee)
+    assert np.isclose(profiles.epe[0], ee @ weights)
+    assert np.isclose(profiles.eepe[0], eee @ weights)
+    assert profiles.pfe.shape == (2, 2, 5)
+    assert np.allclose(profiles.pfe_at(0.99)[0], np.quantile(exposure, 0.99, axis=0))
+
+
+def test_profiles_full_grid_horizon(
+    cube: np.ndarray, netting_sets: list[NettingSet]
+) -> None:
+    """Test that horizon=None averages EE over the whole grid."""
+    times = np.linspace(0.0, 2.0, 5)
+    profiles = ExposureEngine(horizon=None).profiles(
+        cube, TRADE_IDS, netting_sets, times
+    )
+    assert np.allclose(profiles.epe, profiles.ee[:, 1:].mean(axis=1))
+
+
+def test_profiles_exposure_is_non_negative(netting_sets: list[NettingSet]) -> None:
+    """Test that offsetting trades net to zero exposure."""
+    cube = np.ones((3, 10, 3))
+    cube[1] = -1.0
+    profiles = ExposureEngine().profiles(
+        cube, TRADE_IDS, netting_sets, np.array([0.0, 0.5, 1.0])
+    )
+    assert np.all(profiles.ee[0] == 0.0)
+    assert np.all(profiles.ee[1] == 1.0)
+
+
+def test_pfe_at_missing_quantile(
+    cube: np.ndarray, netting_sets: list[NettingSet]
+) -> None:
+    """Test KeyError for a PFE quantile that was not configured."""
+    profiles = ExposureEngine().profiles(
+        cube, TRADE_IDS, netting_sets, np.linspace(0.0, 1.0, 5)
+    )
+    with pytest.raises(KeyError, match="0.5"):
+        profiles.pfe_at(0.5)
+
+
+def test_invalid_configuration() -> None:
+    """Test ValueError for out-of-range quantiles and horizons."""
+    with pytest.raises(ValueError, match="quantiles"):
+        ExposureEngine(quantiles=(1.0,))
+    with pytest.raises(ValueError, match="horizon"):
+        ExposureEngine(horizon=0.0)
+
+
+def test_cube_shape_mismatch(netting_sets: list[NettingSet]) -> None:
+    """Test ValueError when the cube does not match the trade ids or times."""
+    engine = ExposureEngine()
+    with pytest.raises(ValueError, match="does not match 3 trades"):
+        engine.net(np.zeros((2, 4, 3)), TRADE_IDS, netting_sets)
+    with pytest.raises(ValueError, match="time points"):
+        engine.profiles(np.zeros((3, 4, 3)), TRADE_IDS, netting_sets, np.zeros(4))
+
+
+def test_position_profiles_match_trade_profiles(
+    netting_sets: list[NettingSet],
+) -> None:
+    """Test that netting from a position cube equals netting the trade cube."""
+    trades = [
+        Trade("T1", "P1", "CP1", 100.0, LongShort.LONG),
+        Trade("T2", "P2", "CP1", 20.0, LongShort.SHORT),
+        Trade("T3", "P1", "CP2", 30.0, LongShort.SHORT),
+    ]
+    position_cube = np.random.default_rng(3).standard_normal((2, 50, 4))
+    times = np.linspace(0.0, 1.5, 4)
+    engine = ExposureEngine()
+
+    from_positions = engine.position_profiles(
+        position_cube, ["P1", "P2"], trades, netting_sets, times
+    )
+    trade_cube = trade_values(position_cube, ["P1", "P2"], trades)
+    from_trades = engine.profiles(trade_cube, TRADE_IDS, netting_sets, times)
+
+    assert np.allclose(from_positions.ee, from_trades.ee)
+    assert np.allclose(from_positions.pfe, from_trades.pfe)
+    assert np.allclose(from_positions.epe, from_trades.epe)
+
+
+def test_accumulator_matches_position_profiles(
+    netting_sets: list[NettingSet],
+) -> None:
+    """Test that netting path chunks one by one equals netting the full cube."""
+    trades = [
+        Trade("T1", "P1", "CP1", 100.0, LongShort.LONG),
+        Trade("T2", "P2", "CP1", 20.0, LongShort.SHORT),
+        Trade("T3", "P1", "CP2", 30.0, LongShort.SHORT),
+    ]
+    position_cube = np.random.default_rng(4).standard_normal((2, 90, 4))
+    times = np.linspace(0.0, 1.5, 4)
+    engine = ExposureEngine(quantiles=(0.9,))
+
+    accumulator = engine.accumulator(["P1", "P2"], trades, netting_sets, 90, 4)
+    for start in range(0, 90, 40):
+        accumulator.add(position_cube[:, start : start + 40])
+    streamed = accumulator.profiles(times)
+
+    expected = engine.position_profiles(
+        position_cube, ["P1", "P2"], trades, netting_sets, times
+    )
+    assert accumulator.n_filled == 90
+    assert np.allclose(streamed.ee, expected.ee)
+    assert np.allclose(streamed.pfe, expected.pfe)
+    assert np.allclose(streamed.eepe, expected.eepe)
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_accumulator_pfe_storage(
+    netting_sets: list[NettingSet], tmp_path: Path, spill: bool
+) -> None:
+    """Test float32 and spilled PFE buffers, and that EE needs no paths."""
+    trades = [Trade(t, "P1", "CP1", 1.0, LongShort.LONG) for t in TRADE_IDS]
+    position_cube = np.random.default_rng(5).standard_normal((1, 60, 3))
+    times = np.linspace(0.0, 1.0, 3)
+    engine = ExposureEngine(quantiles=(0.5, 0.95))
+    expected = engine.position_profiles(
+        position_cube, ["P1"], trades, netting_sets, times
+    )
+
+    accumulator = engine.accumulator(
+        ["P1"],
+        trades,
+        netting_sets,
+        60,
+        3,
+        dtype=np.float32,
+        spill_dir=tmp_path if spill else None,
+    )
+    for start in range(0, 60, 25):
+        accumulator.add(position_cube[:, start : start + 25])
+    streamed = accumulator.profiles(times)
+    assert np.allclose(streamed.ee, expected.ee)
+    assert np.allclose(streamed.pfe, expected.pfe, rtol=1e-6)
+
+    no_pfe = ExposureEngine(quantiles=()).accumulator(
+        ["P1"], trades, netting_sets, 60, 3
+    )
+    no_pfe.add(position_cube)
+    assert no_pfe._exposure is None
+    assert np.allclose(no_pfe.profiles(times).eepe, expected.eepe)
+
+
+def test_accumulator_path_count_checks(netting_sets: list[NettingSet]) -> None:
+    """Test ValueError for overflowing or incomplete accumulation."""
+    trades = [Trade(t, "P1", "CP1", 1.0, LongShort.LONG) for t in TRADE_IDS]
+    accumulator = ExposureEngine().accumulator(["P1"], trades, netting_sets, 10, 3)
+
+    with pytest.raises(ValueError, match="Accumulated 0 of 10 paths"):
+        accumulator.profiles(np.linspace(0.0, 1.0, 3))
+    with pytest.raises(ValueError, match="overflows the declared 10 paths"):
+        accumulator.add(np.zeros((1, 11, 3)))
+    with pytest.raises(ValueError, match="expected 3"):
+        accumulator.add(np.zeros((1, 5, 4)))
+
+
+def test_accumulator_rejects_mixed_currencies(
+    netting_sets: list[NettingSet],
+) -> None:
+    """Test ValueError for a netting set over positions in two currencies."""
+    trades = [
+        Trade("T1", "P1", "CP1", 1.0, LongShort.LONG),
+        Trade("T2", "P2", "CP1", 1.0, LongShort.LONG),
+        Trade("T3", "P2", "CP2", 1.0, LongShort.LONG),
+    ]
+    engine = ExposureEngine()
+
+    with pytest.raises(ValueError, match="Netting set 'NS1' mixes values in USD, ZAR"):
+        engine.accumulator(
+            ["P1", "P2"],
+            trades,
+            netting_sets,
+            10,
+            3,
+            currencies=[Currency.USD, Currency.ZAR],
+        )
+    accumulator = engine.accumulator(
+        ["P1", "P2"], trades, netting_sets, 10, 3, currencies=[Currency.ZAR] * 2
+    )
+    assert accumulator.netting_sets == tuple(netting_sets)
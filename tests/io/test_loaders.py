@@ -0,0 +1,225 @@
+from datetime import date
+from pathlib import Path
+import pytest
+import numpy as np
+import pandas as pd
+from skans.domain.instruments import EquityForward, EquityOption, FXForward, FXOption
+from skans.domain.portfolio import NettingSet, Position, Trade
+from skans.domain.table import TradeTable
+from skans.domain.types.enums import Currency, LongShort, OptionType
+from skans.exposure.allocation import trade_matrix
+from skans.io.loaders import (
+    compile_positions,
+    load_netting_sets,
+    load_positions,
+    load_trades,
+    read_table,
+)
+from skans.market.book import BookCompiler
+from skans.market.resolver import DependencyResolver
+
+VALUATION_DATE = date(2025, 1, 1)
+
+
+@pytest.fixture
+def trade_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "trade_id": ["T1", "T2", "T3"],
+            "position_id": ["P1", "P1", "P2"],
+            "counterparty_id": ["C1", "C2", "C1"],
+            "quantity": [10.0, 20.0, 5.0],
+            "direction": ["LONG", "SHORT", "LONG"],
+        }
+    )
+
+
+@pytest.fixture
+def position_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "position_id": ["P1", "P2", "P3", "P4"],
+            "instrument_type": [
+                "EquityOption",
+                "FXForward",
+                "EquityForward",
+                "FXOption",
+            ],
+            "strike": [150.0, 18.0, 300.0, 19.0],
+            "maturity_date": ["2026-01-01", "2025-07-02", "2025-04-02", "2026-01-01"],
+            "underlying_id": ["AAPL", None, "MSFT", None],
+            "currency": ["USD", None, "USD", None],
+            "base_currency": [None, "USD", None, "USD"],
+            "quote_currency": [None, "ZAR", None, "ZAR"],
+            "option_type": ["PUT", None, None, "CALL"],
+        }
+    )
+
+
+def test_load_trades(trade_frame: pd.DataFrame) -> None:
+    """Test that eager loading converts the enum column into Trades."""
+    trades = load_trades(trade_frame)
+    assert isinstance(trades, tuple)
+    assert trades[1] == Trade("T2", "P1", "C2", 20.0, LongShort.SHORT)
+
+
+def test_load_trades_lazy(trade_frame: pd.DataFrame) -> None:
+    """Test that lazy loading returns columns equal to the eager Trades."""
+    table = load_trades(trade_frame, lazy=True)
+    assert isinstance(table, TradeTable)
+    assert np.array_equal(table.direction, [1, -1, 1])
+    assert tuple(table) == load_trades(trade_frame)
+
+
+def test_lazy_trades_feed_allocation(trade_frame: pd.DataFrame) -> None:
+    """Test that the trade matrix reads a TradeTable's columns directly."""
+    eager = trade_matrix(load_trades(trade_frame), ["P1", "P2"])
+    lazy = trade_matrix(load_trades(trade_frame, lazy=True), ["P1", "P2"])
+    assert np.array_equal(eager.toarray(), lazy.toarray())
+
+
+def test_load_trades_invalid_direction(trade_frame: pd.DataFrame) -> None:
+    """Test ValueError naming the bad values of an enum column."""
+    trade_frame.loc[2, "direction"] = "FLAT"
+    with pytest.raises(
+        ValueError, match=r"Invalid LongShort .* 'direction': \['FLAT'\]"
+    ):
+        load_trades(trade_frame)
+
+
+def test_load_trades_missing_column(trade_frame: pd.DataFrame) -> None:
+    """Test KeyError when a required column is absent."""
+    with pytest.raises(KeyError, match="Column 'quantity' not found"):
+        load_trades(trade_frame.drop(columns="quantity"))
+
+
+@pytest.mark.parametrize("column", ["trade_id", "quantity"])
+def test_load_trades_missing_values(trade_frame: pd.DataFrame, column: str) -> None:
+    """Test ValueError when a required column has an empty cell."""
+    trade_frame.loc[1, column] = None
+    with pytest.raises(ValueError, match=f"'{column}' has missing values"):
+        load_trades(trade_frame, lazy=True)
+
+
+def test_load_positions(position_frame: pd.DataFrame) -> None:
+    """Test that each instrument type is built from its own columns."""
+    positions = load_positions(position_frame)
+    assert positions == (
+        Position(
+            "P1",
+            EquityOption("AAPL", 150.0, date(2026, 1, 1), Currency.USD, OptionType.PUT),
+        ),
+        Position("P2", FXForward(Currency.USD, Currency.ZAR, 18.0, date(2025, 7, 2))),
+        Position("P3", EquityForward("MSFT", 300.0, date(2025, 4, 2), Currency.USD)),
+        Position(
+            "P4",
+            FXOption(
+                Currency.USD, Currency.ZAR, 19.0, date(2026, 1, 1), OptionType.CALL
+            ),
+        ),
+    )
+
+
+def test_load_positions_errors(position_frame: pd.DataFrame) -> None:
+    """Test rejection of unknown types, bad enums and missing values."""
+    bad_type = position_frame.copy()
+    bad_type.loc[0, "instrument_type"] = "Swap"
+    with pytest.raises(ValueError, match="Unsupported instrument type"):
+        load_positions(bad_type)
+
+    bad_currency = position_frame.copy()
+    bad_currency.loc[1, "quote_currency"] = "EUR"
+    with pytest.raises(ValueError, match="Invalid Currency .* 'quote_currency'"):
+        load_positions(bad_currency)
+
+    missing = position_frame.copy()
+    missing.loc[0, "option_type"] = None
+    with pytest.raises(ValueError, match="'option_type' has missing values"):
+        load_positions(missing)
+
+
+def test_compile_positions_matches_book_compiler(
+    position_frame: pd.DataFrame,
+) -> None:
+    """Test that the column path compiles the same book as Position objects."""
+    positions = load_positions(position_frame)
+    schema = DependencyResolver().resolve(positions)
+    expected = BookCompiler().compile(positions, schema, VALUATION_DATE)
+
+    book = compile_positions(position_frame, schema, VALUATION_DATE)
+    assert book.position_ids == expected.position_ids
+    assert set(book.columns) == set(expected.columns)
+    for inst_type, columns in expected.columns.items():
+        for name, column in vars(columns).items():
+            compiled = getattr(book.columns[inst_type], name)
+            assert compiled.dtype == column.dtype
+            assert np.allclose(compiled, column)
+
+
+@pytest.mark.parametrize("column", ["strike", "maturity_date"])
+def test_positions_missing_required_values(
+    position_frame: pd.DataFrame, column: str
+) -> None:
+    """Test that empty required cells are rejected by both position loaders."""
+    position_frame.loc[2, column] = None
+    schema = DependencyResolver().resolve_frame(position_frame)
+    with pytest.raises(ValueError, match=f"'{column}' has missing values"):
+        load_positions(position_frame)
+    with pytest.raises(ValueError, match=f"'{column}' has missing values"):
+        compile_positions(position_frame, schema, VALUATION_DATE)
+
+
+def test_compile_positions_missing_factor(position_frame: pd.DataFrame) -> None:
+    """Test KeyError when a factor is absent from the schema."""
+    schema = DependencyResolver().resolve_columns(underlying_ids=["AAPL", "MSFT"])
+    with pytest.raises(KeyError, match="Risk factor 'USDZAR'"):
+        compile_positions(position_frame, schema, VALUATION_DATE)
+
+
+def test_load_netting_sets() -> None:
+    """Test that member rows group into NettingSets."""
+    frame = pd.DataFrame(
+        {
+            "netting_set_id": ["NS1", "NS1", "NS2"],
+            "counterparty_id": ["C1", "C1", "C2"],
+            "trade_id": ["T1", "T3", "T2"],
+        }
+    )
+    assert load_netting_sets(frame) == (
+        NettingSet("NS1", "C1", frozenset({"T1", "T3"})),
+        NettingSet("NS2", "C2", frozenset({"T2"})),
+    )
+
+    frame.loc[1, "counterparty_id"] = "C9"
+    with pytest.raises(ValueError, match="several counterparties"):
+        load_netting_sets(frame)
+
+    frame.loc[1, "trade_id"] = None
+    with pytest.raises(ValueError, match="'trade_id' has missing values"):
+        load_netting_sets(frame)
+
+
+def test_read_table_csv(tmp_path: Path, trade_frame: pd.DataFrame) -> None:
+    """Test loading from CSV and rejecting unknown extensions."""
+    path = tmp_path / "trades.csv"
+    trade_frame.to_csv(path, index=False)
+    assert load_trades(path) == load_trades(trade_frame)
+
+    with pytest.raises(ValueError, match="Unsupported table format '.xlsx'"):
+        read_table(tmp_path / "trades.xlsx")
+
+
+def test_read_table_csv_keeps_ids_as_text(tmp_path: Path) -> None:
+    """Test that numeric-looking CSV identifiers are not type-inferred."""
+    trades, netting = tmp_path / "trades.csv", tmp_path / "netting.csv"
+    trades.write_text(
+        "trade_id,position_id,counterparty_id,quantity,direction\n"
+        "0001,1e5,0042,10,LONG\n"
+    )
+    netting.write_text("netting_set_id,counterparty_id,trade_id\n007,0042,0001\n")
+
+    assert load_trades(trades) == (Trade("0001", "1e5", "0042", 10.0, LongShort.LONG),)
+    assert load_netting_sets(netting) == (
+        NettingSet("007", "0042", frozenset({"0001"})),
+    )
+    assert pd.api.types.is_numeric_dtype(read_table(trades)["quantity"])
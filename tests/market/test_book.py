@@ -0,0 +1,94 @@
+from datetime import date
+import pytest
+import numpy as np
+from skans.domain.portfolio import Position
+from skans.domain.instruments import EquityForward, EquityOption, FXForward, FXOption
+from skans.domain.types.enums import Currency, OptionType
+from skans.market.book import CURRENCY_CODES, BookCompiler, InstrumentBook
+from skans.market.resolver import DependencyResolver
+
+VALUATION_DATE = date(2025, 1, 1)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position(
+            "P1",
+            EquityOption("AAPL", 150.0, date(2026, 1, 1), Currency.USD, OptionType.PUT),
+        ),
+        Position("P2", FXForward(Currency.USD, Currency.ZAR, 18.0, date(2025, 7, 2))),
+        Position("P3", EquityForward("MSFT", 300.0, date(2025, 4, 2), Currency.USD)),
+        Position(
+            "P4",
+            EquityOption(
+                "MSFT", 310.0, date(2026, 1, 1), Currency.USD, OptionType.CALL
+            ),
+        ),
+    ]
+
+
+@pytest.fixture
+def book(positions: list[Position]) -> InstrumentBook:
+    schema = DependencyResolver().resolve(positions)
+    return BookCompiler().compile(positions, schema, VALUATION_DATE)
+
+
+def test_compile_groups_by_instrument_type(book: InstrumentBook) -> None:
+    """Test that columns are built per instrument type, skipping empty types."""
+    assert set(book.columns) == {EquityOption, FXForward, EquityForward}
+    assert FXOption not in book.columns
+    assert len(book) == 4
+    assert book.position_ids == ("P1", "P2", "P3", "P4")
+
+
+def test_compile_option_columns(book: InstrumentBook) -> None:
+    """Test the strike, maturity, factor, option-type and currency columns."""
+    options = book.columns[EquityOption]
+
+    assert np.array_equal(options.rows, [0, 3])
+    assert np.array_equal(options.strike, [150.0, 310.0])
+    assert np.allclose(options.maturity, [1.0, 1.0])
+    assert np.array_equal(
+        options.factor_index,
+        [book.schema.get_index("AAPL"), book.schema.get_index("MSFT")],
+    )
+    assert np.array_equal(options.option_type, [-1, 1])
+    assert np.array_equal(options.currency, [CURRENCY_CODES[Currency.USD]] * 2)
+    assert options.option_type.dtype == np.int8
+
+
+def test_compile_fx_currency_columns(book: InstrumentBook) -> None:
+    """Test that FX pairs record quote (pricing) and base currency codes."""
+    fx = book.columns[FXForward]
+
+    assert fx.currency[0] == CURRENCY_CODES[Currency.ZAR]
+    assert fx.base_currency[0] == CURRENCY_CODES[Currency.USD]
+    assert fx.option_type[0] == 0
+    assert np.isclose(fx.maturity[0], 182 / 365)
+
+
+def test_book_pricing_currencies(book: InstrumentBook) -> None:
+    """Test that each row reports its pricing currency code."""
+    fx_rows = book.columns[FXForward].rows
+    assert book.currencies.shape == (len(book),)
+    assert (book.currencies[fx_rows] == CURRENCY_CODES[Currency.ZAR]).all()
+    assert (book.currencies >= 0).all()
+
+
+def test_compiled_columns_are_read_only(book: InstrumentBook) -> None:
+    """Test that compiled columns cannot be mutated."""
+    with pytest.raises(ValueError, match="read-only"):
+        book.columns[EquityForward].strike[0] = 1.0
+
+
+def test_compiled_book_is_compact(book: InstrumentBook) -> None:
+    """Test that the book reports its column memory."""
+    assert 0 < book.nbytes < 4 * 64
+
+
+def test_compile_missing_factor(positions: list[Position]) -> None:
+    """Test KeyError when a position's factor is absent from the schema."""
+    schema = DependencyResolver().resolve(positions[:1])
+    with pytest.raises(KeyError, match="Risk factor 'ZARUSD'|Risk factor 'USDZAR'"):
+        BookCompiler().compile(positions, schema, VALUATION_DATE)
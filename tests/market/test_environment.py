@@ -57,3 +57,71 @@ def test_market_environment_read_only_tensor() -> None:
     # Attempting to modify should raise ValueError
     with pytest.raises(ValueError, match="assignment destination is read-only"):
         env.state_tensor[0, 0, 0] = 1.0
+
+
+def test_market_environment_times() -> None:
+    """Test that times follow the tensor's time axis at dt spacing."""
+    schema = RiskFactorSchema(factor_indices={"Factor1": 0})
+    env = MarketEnvironment(schema=schema, state_tensor=np.zeros((2, 4, 1)), dt=0.25)
+
+    assert np.allclose(env.times, [0.0, 0.25, 0.5, 0.75])
+
+
+def test_market_environment_fingerprint() -> None:
+    """Test that the fingerprint tracks content and is computed once."""
+    schema = RiskFactorSchema(factor_indices={"SPX": 0})
+    tensor = np.arange(12.0).reshape(2, 3, 2)
+    env = MarketEnvironment(schema=schema, state_tensor=tensor, dt=0.5)
+
+    same = MarketEnvironment(schema=schema, state_tensor=tensor.copy(), dt=0.5)
+    assert env.fingerprint == same.fingerprint
+    assert env.fingerprint is env.fingerprint
+
+    other_dt = MarketEnvironment(schema=schema, state_tensor=tensor.copy(), dt=0.25)
+    other_data = MarketEnvironment(schema=schema, state_tensor=tensor + 1.0, dt=0.5)
+    other_dtype = MarketEnvironment(
+        schema=schema, state_tensor=tensor.astype(np.float32), dt=0.5
+    )
+    fingerprints = {
+        env.fingerprint,
+        other_dt.fingerprint,
+        other_data.fingerprint,
+        other_dtype.fingerprint,
+    }
+    assert len(fingerprints) == 4
+
+
+def test_market_environment_fingerprint_non_contiguous() -> None:
+    """Test that a strided view hashes like its contiguous copy."""
+    schema = RiskFactorSchema(factor_indices={"SPX": 0})
+    tensor = np.arange(24.0).reshape(4, 3, 2)[::2]
+    env = MarketEnvironment(schema=schema, state_tensor=tensor, dt=0.5)
+    copy = MarketEnvironment(schema=schema, state_tensor=tensor.copy(), dt=0.5)
+    assert env.fingerprint == copy.fingerprint
+
+
+def test_market_environment_time_grid() -> None:
+    """Test that an explicit time grid replaces dt spacing and is locked."""
+    schema = RiskFactorSchema(factor_indices={"Factor1": 0})
+    grid = np.array([0.0, 0.1, 0.5, 2.0])
+    env = MarketEnvironment(
+        schema=schema, state_tensor=np.zeros((2, 4, 1)), dt=0.5, time_grid=grid
+    )
+
+    assert np.array_equal(env.times, grid)
+    assert env.times.flags.writeable is False
+
+    uniform = MarketEnvironment(schema=schema, state_tensor=np.zeros((2, 4, 1)), dt=0.5)
+    assert env.fingerprint != uniform.fingerprint
+
+
+def test_market_environment_time_grid_length_mismatch() -> None:
+    """Test ValueError when the time grid does not match the time axis."""
+    schema = RiskFactorSchema(factor_indices={"Factor1": 0})
+    with pytest.raises(ValueError, match="does not match 4 time points"):
+        MarketEnvironment(
+            schema=schema,
+            state_tensor=np.zeros((2, 4, 1)),
+            dt=0.5,
+            time_grid=np.array([0.0, 1.0]),
+        )
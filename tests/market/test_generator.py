@@ -0,0 +1,153 @@
+import pytest
+import numpy as np
+from skans.core.rng import GeneratorRng, SimpleRng, SobolRng
+from skans.market.environment import RiskFactorSchema
+from skans.market.generator import GBMParameters, MarketGenerator
+
+
+@pytest.fixture
+def schema() -> RiskFactorSchema:
+    return RiskFactorSchema(factor_indices={"AAPL": 0, "USDZAR": 1})
+
+
+@pytest.fixture
+def params(schema: RiskFactorSchema) -> GBMParameters:
+    return GBMParameters.from_schema(
+        schema,
+        S0={"AAPL": 150.0, "USDZAR": 18.5},
+        mu={"AAPL": 0.05, "USDZAR": 0.03},
+        sigma={"AAPL": 0.25, "USDZAR": 0.15},
+        correlation=np.array([[1.0, -0.3], [-0.3, 1.0]]),
+    )
+
+
+def test_gbm_parameters_from_schema_alignment(params: GBMParameters) -> None:
+    """Test that mapping-based parameters follow the schema indices."""
+    assert np.array_equal(params.S0, [150.0, 18.5])
+    assert np.array_equal(params.sigma, [0.25, 0.15])
+    assert params.n_factors == 2
+
+
+def test_gbm_parameters_missing_factor(schema: RiskFactorSchema) -> None:
+    """Test KeyError when a schema factor has no parameter."""
+    with pytest.raises(KeyError, match="Missing mu for risk factor 'USDZAR'"):
+        GBMParameters.from_schema(
+            schema,
+            S0={"AAPL": 1.0, "USDZAR": 1.0},
+            mu={"AAPL": 0.0},
+            sigma={"AAPL": 0.1, "USDZAR": 0.1},
+        )
+
+
+def test_gbm_parameters_shape_validation() -> None:
+    """Test that mismatched parameter vectors are rejected."""
+    with pytest.raises(ValueError, match="equal length"):
+        GBMParameters(
+            S0=np.ones(2), mu=np.zeros(3), sigma=np.ones(2), correlation=np.eye(2)
+        )
+
+
+def test_market_generator_environment(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that the generator returns a locked, schema-indexed environment."""
+    env = MarketGenerator(SimpleRng()).generate(
+        schema, params, T=1.0, n_steps=12, n_paths=100
+    )
+
+    assert env.schema is schema
+    assert env.state_tensor.shape == (100, 13, 2)
+    assert env.dt == pytest.approx(1.0 / 12)
+    assert env.state_tensor.flags.writeable is False
+    assert np.all(env.state_tensor[:, 0, schema.get_index("USDZAR")] == 18.5)
+
+
+def test_market_generator_schema_mismatch(params: GBMParameters) -> None:
+    """Test ValueError when parameters and schema disagree on factor count."""
+    schema = RiskFactorSchema(factor_indices={"AAPL": 0})
+    with pytest.raises(ValueError, match="Parameters cover 2 factors"):
+        MarketGenerator().generate(schema, params, T=1.0, n_steps=4, n_paths=10)
+
+
+def test_market_generator_float32(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that the generator honours a float32 state tensor."""
+    env = MarketGenerator(dtype=np.float32).generate(
+        schema, params, T=1.0, n_steps=4, n_paths=10
+    )
+    assert env.state_tensor.dtype == np.float32
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 25, 100])
+def test_market_generator_chunks_match_single_shot(
+    schema: RiskFactorSchema, params: GBMParameters, chunk_size: int
+) -> None:
+    """Test that streamed chunks concatenate to the single-shot tensor."""
+    single = MarketGenerator(GeneratorRng(seed=3, block_size=8)).generate(
+        schema, params, T=1.0, n_steps=5, n_paths=60
+    )
+    chunks = list(
+        MarketGenerator(GeneratorRng(seed=3, block_size=8)).generate_chunks(
+            schema, params, T=1.0, n_steps=5, n_paths=60, chunk_size=chunk_size
+        )
+    )
+
+    assert all(env.schema is schema for env in chunks)
+    assert all(env.state_tensor.shape[0] <= chunk_size for env in chunks)
+    stacked = np.concatenate([env.state_tensor for env in chunks], axis=0)
+    assert np.array_equal(stacked, single.state_tensor)
+
+
+def test_market_generator_chunks_continue_sobol(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that quasi-random sequences also continue across chunks."""
+    single = MarketGenerator(SobolRng(seed=1)).generate(
+        schema, params, T=1.0, n_steps=4, n_paths=32
+    )
+    chunks = MarketGenerator(SobolRng(seed=1)).generate_chunks(
+        schema, params, T=1.0, n_steps=4, n_paths=32, chunk_size=8
+    )
+    stacked = np.concatenate([env.state_tensor for env in chunks], axis=0)
+    assert np.array_equal(stacked, single.state_tensor)
+
+
+def test_market_generator_chunks_invalid_size(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test ValueError for a non-positive chunk size."""
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        next(
+            MarketGenerator().generate_chunks(
+                schema, params, T=1.0, n_steps=4, n_paths=10, chunk_size=0
+            )
+        )
+
+
+def test_market_generator_time_grid(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that an explicit time grid is simulated and carried on the env."""
+    times = np.array([0.0, 1 / 365, 30 / 365, 1.0])
+    env = MarketGenerator(GeneratorRng(seed=1)).generate(
+        schema, params, T=1.0, n_steps=3, n_paths=50, times=times
+    )
+
+    assert env.state_tensor.shape == (50, 4, 2)
+    assert np.array_equal(env.times, times)
+
+    chunks = MarketGenerator(GeneratorRng(seed=1)).generate_chunks(
+        schema, params, T=1.0, n_steps=3, n_paths=50, chunk_size=20, times=times
+    )
+    assert all(np.array_equal(chunk.times, times) for chunk in chunks)
+
+
+def test_market_generator_invalid_time_grid(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test ValueError when the time grid does not end at T."""
+    with pytest.raises(ValueError, match="expected T"):
+        MarketGenerator().generate(
+            schema, params, T=1.0, n_steps=2, n_paths=10, times=[0.0, 0.5, 0.75]
+        )
@@ -0,0 +1,79 @@
+from datetime import date
+import pytest
+import numpy as np
+from skans.domain.portfolio import Position
+from skans.domain.instruments import EquityForward, FXForward
+from skans.domain.types.enums import Currency
+from skans.market.book import BookCompiler
+from skans.market.environment import RiskFactorSchema
+from skans.market.grid import GridSegment, maturity_grid, time_grid
+
+VALUATION_DATE = date(2025, 1, 1)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position("P1", EquityForward("AAPL", 150.0, date(2025, 1, 11), Currency.USD)),
+        Position("P2", FXForward(Currency.USD, Currency.ZAR, 18.0, date(2025, 3, 5))),
+        Position("P3", EquityForward("AAPL", 160.0, date(2030, 1, 1), Currency.USD)),
+    ]
+
+
+def test_time_grid_default_segments() -> None:
+    """Test daily, weekly then monthly spacing out to the horizon."""
+    days = time_grid(3650) * 365.0
+
+    assert np.allclose(days[:31], np.arange(31))
+    assert np.allclose(np.diff(days[31:40]), 7.0)
+    assert np.allclose(np.diff(days[-5:-1]), 30.0)
+    assert days[-1] == pytest.approx(3650.0)
+    assert len(days) < 3650 / 15
+
+
+def test_time_grid_extra_days_and_short_horizon() -> None:
+    """Test that extra days inside the horizon become grid points."""
+    segments = (GridSegment(until_days=10, step_days=5),)
+    days = np.rint(time_grid(10, segments, extra_days=[3, 12, -1]) * 365.0)
+    assert list(days) == [0, 3, 5, 10]
+
+
+def test_time_grid_invalid_segments() -> None:
+    """Test ValueError for segments that are unordered or stop too early."""
+    with pytest.raises(ValueError, match="increasing until_days"):
+        time_grid(100, (GridSegment(50, 1), GridSegment(20, 1)))
+    with pytest.raises(ValueError, match="before the 100-day horizon"):
+        time_grid(100, (GridSegment(50, 1),))
+    with pytest.raises(ValueError, match="positive until_days"):
+        GridSegment(0, 1)
+
+
+def test_maturity_grid_contains_maturities(positions: list[Position]) -> None:
+    """Test that every maturity is an exact grid point, ending at the last."""
+    days = np.rint(maturity_grid(positions, VALUATION_DATE) * 365.0)
+
+    maturities = [(p.instrument.maturity_date - VALUATION_DATE).days for p in positions]
+    assert set(maturities) <= set(days)
+    assert days[-1] == max(maturities)
+
+
+def test_maturity_grid_from_book(positions: list[Position]) -> None:
+    """Test that a compiled book yields the same grid as its positions."""
+    schema = RiskFactorSchema(factor_indices={"AAPL": 0, "USDZAR": 1})
+    book = BookCompiler().compile(positions, schema, VALUATION_DATE)
+
+    expected = maturity_grid(positions, VALUATION_DATE)
+    assert np.array_equal(maturity_grid(book, VALUATION_DATE), expected)
+
+    with pytest.raises(ValueError, match="does not match"):
+        maturity_grid(book, date(2024, 1, 1))
+
+
+def test_maturity_grid_without_live_positions() -> None:
+    """Test ValueError when nothing matures after the valuation date."""
+    expired = [
+        Position("P1", EquityForward("AAPL", 1.0, date(2024, 1, 1), Currency.USD))
+    ]
+    with pytest.raises(ValueError, match="No position matures"):
+        maturity_grid(expired, VALUATION_DATE)
+    assert len(maturity_grid(expired, VALUATION_DATE, horizon_days=5)) == 6
@@ -0,0 +1,135 @@
+import gc
+import tracemalloc
+
+import pytest
+import numpy as np
+from skans.core.rng import GeneratorRng, SobolRng
+from skans.core.sde import PathConstruction, VarianceReduction
+from skans.market.environment import RiskFactorSchema
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market import parallel
+from skans.market.parallel import ParallelMarketGenerator
+
+
+@pytest.fixture
+def schema() -> RiskFactorSchema:
+    return RiskFactorSchema(factor_indices={"AAPL": 0, "MSFT": 1, "USDZAR": 2})
+
+
+@pytest.fixture
+def params(schema: RiskFactorSchema) -> GBMParameters:
+    return GBMParameters.from_schema(
+        schema,
+        S0={"AAPL": 150.0, "MSFT": 300.0, "USDZAR": 18.5},
+        mu={"AAPL": 0.05, "MSFT": 0.04, "USDZAR": 0.03},
+        sigma={"AAPL": 0.25, "MSFT": 0.2, "USDZAR": 0.15},
+        correlation=np.array([[1.0, 0.6, -0.3], [0.6, 1.0, -0.2], [-0.3, -0.2, 1.0]]),
+    )
+
+
+@pytest.mark.parametrize("construction", list(PathConstruction))
+def test_parallel_matches_single_process(
+    construction: PathConstruction, schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that sharded workers reproduce the sequential generator exactly."""
+    expected = MarketGenerator(GeneratorRng(seed=7), construction).generate(
+        schema, params, T=1.0, n_steps=6, n_paths=250
+    )
+    with ParallelMarketGenerator(
+        GeneratorRng(seed=7), construction, n_workers=2, shard_size=64
+    ) as generator:
+        env = generator.generate(schema, params, T=1.0, n_steps=6, n_paths=250)
+
+    assert env.schema is schema
+    assert env.state_tensor.flags.writeable is False
+    assert np.array_equal(env.state_tensor, expected.state_tensor)
+
+
+@pytest.mark.parametrize("variance_reduction", list(VarianceReduction))
+def test_parallel_is_invariant_to_worker_count(
+    variance_reduction: VarianceReduction,
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+) -> None:
+    """Test that the environment does not depend on the number of workers."""
+
+    def simulate(n_workers: int) -> np.ndarray:
+        with ParallelMarketGenerator(
+            GeneratorRng(seed=3),
+            variance_reduction=variance_reduction,
+            n_workers=n_workers,
+            shard_size=50,
+        ) as generator:
+            env = generator.generate(
+                schema,
+                params,
+                T=1.0,
+                n_steps=4,
+                n_paths=175,
+                times=[0, 0.1, 0.2, 0.5, 1],
+            )
+            return env.state_tensor
+
+    assert np.array_equal(simulate(1), simulate(3))
+
+
+def test_parallel_chunks_match_single_shot(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that chunked parallel generation continues the same stream."""
+    with ParallelMarketGenerator(
+        GeneratorRng(seed=9), n_workers=2, shard_size=32
+    ) as generator:
+        whole = generator.generate(schema, params, T=1.0, n_steps=3, n_paths=150)
+        generator.rng = GeneratorRng(seed=9)
+        chunks = list(
+            generator.generate_chunks(
+                schema, params, T=1.0, n_steps=3, n_paths=150, chunk_size=70
+            )
+        )
+
+    stacked = np.concatenate([chunk.state_tensor for chunk in chunks])
+    assert np.array_equal(stacked, whole.state_tensor)
+
+
+def test_parallel_tensor_is_not_copied(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test that workers fill the environment's own shared memory tensor."""
+    with ParallelMarketGenerator(
+        GeneratorRng(seed=5), n_workers=2, shard_size=500
+    ) as generator:
+        tracemalloc.start()
+        env = generator.generate(schema, params, T=1.0, n_steps=50, n_paths=2000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # The segment is mapped memory, which tracemalloc does not see
+        assert peak < 0.25 * env.state_tensor.nbytes
+        assert not env.state_tensor.flags.owndata
+        expected = MarketGenerator(GeneratorRng(seed=5)).generate(
+            schema, params, T=1.0, n_steps=50, n_paths=2000
+        )
+        assert np.array_equal(env.state_tensor, expected.state_tensor)
+
+        del env
+        gc.collect()
+    assert parallel._RETIRED == []
+
+
+def test_parallel_requires_generator_rng(
+    schema: RiskFactorSchema, params: GBMParameters
+) -> None:
+    """Test TypeError for generators without SeedSequence substreams."""
+    generator = ParallelMarketGenerator(n_workers=2, shard_size=4)
+    generator.rng = SobolRng(seed=1)
+    with pytest.raises(TypeError, match="needs a GeneratorRng"):
+        generator.generate(schema, params, T=1.0, n_steps=2, n_paths=10)
+
+
+def test_parallel_invalid_options() -> None:
+    """Test ValueError for non-positive worker counts and shard sizes."""
+    with pytest.raises(ValueError, match="must be positive"):
+        ParallelMarketGenerator(n_workers=0)
+    with pytest.raises(ValueError, match="must be positive"):
+        ParallelMarketGenerator(shard_size=0)
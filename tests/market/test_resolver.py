@@ -1,10 +1,17 @@
 import pytest
 from datetime import date
+import numpy as np
+import pandas as pd
 from skans.domain.portfolio import Position
 from skans.domain.instruments.equity import EquityForward, EquityOption
 from skans.domain.instruments.fx import FXForward, FXOption
 from skans.domain.types.enums import Currency, OptionType
-from skans.market.resolver import DependencyResolver
+from skans.market.environment import RiskFactorSchema
+from skans.market.resolver import (
+    DependencyResolver,
+    IncrementalDependencyResolver,
+    fx_pair_name,
+)
 
 
 def test_resolve_empty_positions() -> None:
@@ -108,3 +115,142 @@ def test_resolve_unsupported_instrument() -> None:
 
     with pytest.raises(TypeError, match="Unsupported instrument type in resolver"):
         resolver.resolve([pos])
+
+
+def _equity(position_id: str, underlying_id: str) -> Position:
+    return Position(
+        position_id=position_id,
+        instrument=EquityForward(underlying_id, 100.0, date(2025, 1, 1), Currency.USD),
+    )
+
+
+def test_incremental_add_appends_new_factors() -> None:
+    """Verify new factors are appended without renumbering existing ones."""
+    resolver = IncrementalDependencyResolver()
+    first = resolver.add([_equity("P1", "MSFT"), _equity("P2", "AAPL")])
+    assert first.added == ("AAPL", "MSFT")
+    assert first.schema.factor_indices == {"AAPL": 0, "MSFT": 1}
+
+    # "AMZN" sorts before "MSFT" but must not displace it
+    second = resolver.add([_equity("P3", "AMZN"), _equity("P4", "AAPL")])
+    assert second.added == ("AMZN",)
+    assert second.retired == ()
+    assert second.schema.factor_indices == {"AAPL": 0, "MSFT": 1, "AMZN": 2}
+
+
+def test_incremental_remove_keeps_indices() -> None:
+    """Verify removal retires unreferenced factors but keeps their indices."""
+    resolver = IncrementalDependencyResolver()
+    resolver.add([_equity("P1", "AAPL"), _equity("P2", "MSFT"), _equity("P3", "MSFT")])
+
+    update = resolver.remove(["P2"])
+    assert update.retired == ()
+    update = resolver.remove(["P1", "P3"])
+    assert update.retired == ("AAPL", "MSFT")
+    assert update.schema.factor_indices == {"AAPL": 0, "MSFT": 1}
+    assert len(resolver.active_factors) == 0
+
+    # A retired factor comes back under its original index
+    update = resolver.add([_equity("P5", "MSFT")])
+    assert update.added == ()
+    assert list(resolver.active_factors) == ["MSFT"]
+
+
+def test_incremental_replace_position() -> None:
+    """Verify re-adding a position id moves it to its new factor."""
+    resolver = IncrementalDependencyResolver()
+    resolver.add([_equity("P1", "AAPL")])
+    update = resolver.add([_equity("P1", "MSFT")])
+
+    assert update.added == ("MSFT",)
+    assert update.retired == ("AAPL",)
+    assert resolver.active_factors == ("MSFT",)
+
+
+def test_incremental_extends_existing_schema() -> None:
+    """Verify it continues the numbering of a batch-resolved schema."""
+    positions = [_equity("P1", "MSFT"), _equity("P2", "AAPL")]
+    schema = DependencyResolver().resolve(positions)
+    resolver = IncrementalDependencyResolver(schema)
+
+    assert resolver.add(positions).added == ()
+    update = resolver.add([_equity("P3", "AMZN")])
+    assert update.schema.factor_indices == {"AAPL": 0, "MSFT": 1, "AMZN": 2}
+
+
+def test_incremental_errors() -> None:
+    """Verify bad input is rejected without corrupting the resolver state."""
+    with pytest.raises(ValueError, match="contiguous"):
+        IncrementalDependencyResolver(RiskFactorSchema(factor_indices={"AAPL": 1}))
+
+    resolver = IncrementalDependencyResolver()
+    with pytest.raises(KeyError, match="Position 'P9' is not tracked"):
+        resolver.remove(["P9"])
+
+    bad = Position(position_id="FAIL", instrument=object())  # type: ignore
+    with pytest.raises(TypeError, match="Unsupported instrument type in resolver"):
+        resolver.add([_equity("P1", "AAPL"), bad])
+    assert resolver.schema.factor_indices == {}
+
+
+def test_fx_pair_name_is_cached_and_interned() -> None:
+    """Verify FX pair names are built once and shared across positions."""
+    name = fx_pair_name(Currency.USD, Currency.ZAR)
+    assert name == "USDZAR"
+    assert fx_pair_name("USD", "ZAR") is name
+    with pytest.raises(ValueError):
+        fx_pair_name("USD", "XXX")
+
+
+def test_resolve_columns_matches_positions() -> None:
+    """Verify column resolution gives the same schema as the Position path."""
+    positions = [
+        _equity("P1", "MSFT"),
+        _equity("P2", "AAPL"),
+        Position("P3", FXForward(Currency.USD, Currency.ZAR, 18.0, date(2025, 1, 1))),
+        Position("P4", FXForward(Currency.ZAR, Currency.USD, 0.1, date(2025, 1, 1))),
+    ]
+    resolver = DependencyResolver()
+
+    schema = resolver.resolve_columns(
+        underlying_ids=np.array(["MSFT", "AAPL", "MSFT"], dtype=object),
+        base_currencies=np.array(["USD", "ZAR", "USD"], dtype=object),
+        quote_currencies=[Currency.ZAR, Currency.USD, Currency.ZAR],
+    )
+    assert schema == resolver.resolve(positions)
+
+
+def test_resolve_columns_length_mismatch() -> None:
+    """Verify ValueError when the FX columns differ in length."""
+    with pytest.raises(ValueError, match="FX columns differ in length"):
+        DependencyResolver().resolve_columns(
+            base_currencies=["USD"], quote_currencies=[]
+        )
+
+
+def test_resolve_frame() -> None:
+    """Verify DataFrame rows split into equity and FX legs by the underlying."""
+    frame = pd.DataFrame(
+        {
+            "underlying_id": ["AAPL", None, "MSFT", None],
+            "base_currency": [None, "USD", None, "USD"],
+            "quote_currency": [None, "ZAR", None, "ZAR"],
+        }
+    )
+    schema = DependencyResolver().resolve_frame(frame)
+    assert schema.factor_indices == {"AAPL": 0, "MSFT": 1, "USDZAR": 2}
+
+
+def test_resolve_frame_errors() -> None:
+    """Verify missing columns and incomplete FX rows are rejected."""
+    resolver = DependencyResolver()
+    with pytest.raises(KeyError, match="Column 'quote_currency' not found"):
+        resolver.resolve_frame(
+            pd.DataFrame({"underlying_id": ["AAPL"], "base_currency": [None]})
+        )
+
+    frame = pd.DataFrame(
+        {"underlying_id": [None], "base_currency": ["USD"], "quote_currency": [None]}
+    )
+    with pytest.raises(ValueError, match="both a base and a quote currency"):
+        resolver.resolve_frame(frame)
@@ -0,0 +1,77 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import numpy as np
+from skans.market.environment import RiskFactorSchema, MarketEnvironment
+from skans.market.shared import (
+    SharedEnvironmentHandle,
+    SharedMarketEnvironment,
+    attach_environment,
+    detach_environment,
+)
+
+
+@pytest.fixture
+def env() -> MarketEnvironment:
+    schema = RiskFactorSchema(factor_indices={"SPX": 0, "USDZAR": 1})
+    state = np.arange(60, dtype=np.float64).reshape(5, 6, 2)
+    return MarketEnvironment(schema=schema, state_tensor=state, dt=0.5)
+
+
+def _factor_total(handle: SharedEnvironmentHandle, factor: str) -> float:
+    env = attach_environment(handle)
+    idx = env.schema.get_index(factor)
+    return float(env.state_tensor[:, :, idx].sum())
+
+
+def test_handle_is_small_and_picklable(env: MarketEnvironment) -> None:
+    """Test that the handle pickles without carrying the tensor."""
+    with SharedMarketEnvironment(env) as shared:
+        payload = pickle.dumps(shared.handle)
+        assert pickle.loads(payload) == shared.handle
+        assert len(payload) < env.state_tensor.nbytes
+
+
+def test_attach_returns_read_only_view(env: MarketEnvironment) -> None:
+    """Test that attaching yields an equal, read-only environment."""
+    with SharedMarketEnvironment(env) as shared:
+        attached = attach_environment(shared.handle)
+
+        assert attached.schema == env.schema
+        assert attached.dt == env.dt
+        assert np.array_equal(attached.state_tensor, env.state_tensor)
+        assert attached.state_tensor.flags.writeable is False
+        assert attach_environment(shared.handle) is attached
+
+        del attached
+        detach_environment(shared.handle)
+
+
+def test_process_pool_workers_read_shared_tensor(env: MarketEnvironment) -> None:
+    """Test that process-pool workers value against the published tensor."""
+    with SharedMarketEnvironment(env) as shared:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            totals = list(
+                pool.map(_factor_total, [shared.handle] * 2, ["SPX", "USDZAR"])
+            )
+
+    assert totals == [
+        float(env.state_tensor[:, :, 0].sum()),
+        float(env.state_tensor[:, :, 1].sum()),
+    ]
+
+
+def test_attach_keeps_time_grid() -> None:
+    """Test that a non-uniform time grid travels with the handle."""
+    schema = RiskFactorSchema(factor_indices={"SPX": 0})
+    grid = np.array([0.0, 0.01, 1.0])
+    env = MarketEnvironment(
+        schema=schema, state_tensor=np.ones((2, 3, 1)), dt=0.5, time_grid=grid
+    )
+    with SharedMarketEnvironment(env) as shared:
+        attached = attach_environment(shared.handle)
+        assert np.array_equal(attached.times, grid)
+
+        del attached
+        detach_environment(shared.handle)
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+import pytest
+import numpy as np
+from skans.core.rng import GeneratorRng
+from skans.market.environment import RiskFactorSchema, MarketEnvironment
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market.storage import (
+    load_environment,
+    save_environment,
+    save_environment_chunks,
+)
+
+
+@pytest.fixture
+def env() -> MarketEnvironment:
+    schema = RiskFactorSchema(factor_indices={"SPX": 0, "USDZAR": 1})
+    state = np.random.randn(20, 6, 2)
+    return MarketEnvironment(schema=schema, state_tensor=state, dt=0.25)
+
+
+def test_save_writes_tensor_and_sidecar(env: MarketEnvironment, tmp_path: Path) -> None:
+    """Test that saving produces a .npy tensor and a JSON sidecar."""
+    save_environment(env, tmp_path / "scenario")
+
+    metadata = json.loads((tmp_path / "scenario.json").read_text())
+    assert (tmp_path / "scenario.npy").exists()
+    assert metadata["factor_indices"] == {"SPX": 0, "USDZAR": 1}
+    assert metadata["dt"] == 0.25
+    assert metadata["shape"] == [20, 6, 2]
+
+
+def test_load_round_trip_memmap(env: MarketEnvironment, tmp_path: Path) -> None:
+    """Test that loading returns a read-only memmap with the same contents."""
+    save_environment(env, tmp_path / "scenario")
+    loaded = load_environment(tmp_path / "scenario.npy")
+
+    assert isinstance(loaded.state_tensor, np.memmap)
+    assert loaded.state_tensor.flags.writeable is False
+    assert np.array_equal(loaded.state_tensor, env.state_tensor)
+    assert loaded.schema == env.schema
+    assert loaded.dt == env.dt
+
+    with pytest.raises(ValueError, match="read-only"):
+        loaded.state_tensor[0, 0, 0] = 1.0
+
+
+def test_load_without_mmap(env: MarketEnvironment, tmp_path: Path) -> None:
+    """Test that mmap=False loads the tensor into memory."""
+    save_environment(env, tmp_path / "scenario")
+    loaded = load_environment(tmp_path / "scenario", mmap=False)
+
+    assert not isinstance(loaded.state_tensor, np.memmap)
+    assert np.array_equal(loaded.state_tensor, env.state_tensor)
+
+
+def test_load_detects_mismatched_sidecar(
+    env: MarketEnvironment, tmp_path: Path
+) -> None:
+    """Test ValueError when the tensor and sidecar disagree."""
+    save_environment(env, tmp_path / "scenario")
+    sidecar = tmp_path / "scenario.json"
+    metadata = json.loads(sidecar.read_text())
+    metadata["shape"] = [1, 1, 1]
+    sidecar.write_text(json.dumps(metadata))
+
+    with pytest.raises(ValueError, match="does not match its sidecar"):
+        load_environment(tmp_path / "scenario")
+
+
+def test_save_chunks_matches_single_shot(tmp_path: Path) -> None:
+    """Test that streamed chunks persist to the single-shot tensor."""
+    schema = RiskFactorSchema(factor_indices={"A": 0, "B": 1})
+    params = GBMParameters(
+        S0=np.array([1.0, 2.0]),
+        mu=np.zeros(2),
+        sigma=np.array([0.1, 0.2]),
+        correlation=np.array([[1.0, 0.4], [0.4, 1.0]]),
+    )
+    single = MarketGenerator(GeneratorRng(seed=1)).generate(schema, params, 1.0, 4, 50)
+    chunks = MarketGenerator(GeneratorRng(seed=1)).generate_chunks(
+        schema, params, 1.0, 4, 50, chunk_size=16
+    )
+
+    save_environment_chunks(chunks, tmp_path / "chunked", n_paths=50)
+    loaded = load_environment(tmp_path / "chunked")
+
+    assert np.array_equal(loaded.state_tensor, single.state_tensor)
+    assert loaded.dt == single.dt
+
+
+def test_save_chunks_path_count_mismatch(
+    env: MarketEnvironment, tmp_path: Path
+) -> None:
+    """Test ValueError when the chunks do not cover the declared paths."""
+    with pytest.raises(ValueError, match="Chunks hold 20 paths, expected 30"):
+        save_environment_chunks([env], tmp_path / "short", n_paths=30)
+
+
+def test_load_round_trip_time_grid(tmp_path: Path) -> None:
+    """Test that a non-uniform time grid survives a save and load."""
+    schema = RiskFactorSchema(factor_indices={"SPX": 0})
+    grid = np.array([0.0, 0.01, 0.1, 1.0])
+    env = MarketEnvironment(
+        schema=schema, state_tensor=np.ones((3, 4, 1)), dt=0.25, time_grid=grid
+    )
+    save_environment(env, tmp_path / "scenario")
+    loaded = load_environment(tmp_path / "scenario")
+
+    assert np.array_equal(loaded.times, grid)
+    assert loaded.fingerprint == env.fingerprint
@@ -0,0 +1,243 @@
+from datetime import date
+from typing import Any
+import pytest
+import numpy as np
+from skans.core.rng import GeneratorRng
+from skans.domain.portfolio import NettingSet, Position, Trade
+from skans.domain.instruments import EquityForward, EquityOption, FXForward
+from skans.domain.types.enums import Currency, LongShort, OptionType
+from skans.exposure.engine import ExposureEngine
+from skans.market.environment import RiskFactorSchema
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market.resolver import DependencyResolver
+from skans.pipeline.runner import ExposurePipeline
+from skans.valuation.engine import ValuationEngine, ValuationParameters
+
+VALUATION_DATE = date(2025, 1, 1)
+MATURITY = date(2026, 1, 1)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position(
+            "P1", EquityOption("AAPL", 150.0, MATURITY, Currency.USD, OptionType.CALL)
+        ),
+        Position("P2", EquityForward("AAPL", 140.0, MATURITY, Currency.USD)),
+        Position("P3", FXForward(Currency.USD, Currency.ZAR, 18.0, MATURITY)),
+    ]
+
+
+@pytest.fixture
+def trades() -> list[Trade]:
+    return [
+        Trade("T1", "P1", "CP1", 10.0, LongShort.LONG),
+        Trade("T2", "P2", "CP1", 5.0, LongShort.SHORT),
+        Trade("T3", "P3", "CP2", 1000.0, LongShort.LONG),
+    ]
+
+
+@pytest.fixture
+def netting_sets() -> list[NettingSet]:
+    return [
+        NettingSet("NS1", "CP1", frozenset({"T1", "T2"})),
+        NettingSet("NS2", "CP2", frozenset({"T3"})),
+    ]
+
+
+@pytest.fixture
+def schema(positions: list[Position]) -> RiskFactorSchema:
+    return DependencyResolver().resolve(positions)
+
+
+@pytest.fixture
+def params(schema: RiskFactorSchema) -> GBMParameters:
+    return GBMParameters.from_schema(
+        schema,
+        S0={"AAPL": 150.0, "USDZAR": 18.5},
+        mu={"AAPL": 0.05, "USDZAR": 0.03},
+        sigma={"AAPL": 0.25, "USDZAR": 0.15},
+    )
+
+
+@pytest.fixture
+def valuation() -> ValuationEngine:
+    return ValuationEngine(
+        ValuationParameters(
+            valuation_date=VALUATION_DATE,
+            rates={Currency.USD: 0.05, Currency.ZAR: 0.07},
+            volatilities={"AAPL": 0.25},
+        )
+    )
+
+
+def test_pipeline_matches_batch_run(
+    positions: list[Position],
+    trades: list[Trade],
+    netting_sets: list[NettingSet],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that chunked, overlapped stages reproduce the full-cube profiles."""
+    exposure = ExposureEngine(quantiles=(0.95, 0.99))
+    pipeline = ExposurePipeline(
+        MarketGenerator(GeneratorRng(seed=8)), valuation, exposure, chunk_size=64
+    )
+    profiles = pipeline.run(
+        positions, trades, netting_sets, schema, params, 1.0, 12, 300
+    )
+
+    env = MarketGenerator(GeneratorRng(seed=8)).generate(schema, params, 1.0, 12, 300)
+    cube = valuation.value(positions, env)
+    expected = exposure.position_profiles(
+        cube, ["P1", "P2", "P3"], trades, netting_sets, env.times
+    )
+
+    assert profiles.netting_set_ids == ("NS1", "NS2")
+    assert np.array_equal(profiles.times, env.times)
+    assert np.allclose(profiles.ee, expected.ee)
+    assert np.allclose(profiles.pfe, expected.pfe)
+    assert np.allclose(profiles.epe, expected.epe)
+
+
+def test_pipeline_non_uniform_grid(
+    positions: list[Position],
+    trades: list[Trade],
+    netting_sets: list[NettingSet],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that an explicit time grid flows through to the profiles."""
+    times = np.array([0.0, 0.1, 0.5, 1.0])
+    pipeline = ExposurePipeline(
+        MarketGenerator(GeneratorRng(seed=1)), valuation, ExposureEngine(), 25
+    )
+    profiles = pipeline.run(
+        positions, trades, netting_sets, schema, params, 1.0, 3, 100, times
+    )
+    assert np.array_equal(profiles.times, times)
+
+
+def test_pipeline_reports_progress(
+    positions: list[Position],
+    trades: list[Trade],
+    netting_sets: list[NettingSet],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that progress is reported after every netted chunk."""
+    reports: list[tuple[int, int]] = []
+    pipeline = ExposurePipeline(
+        MarketGenerator(GeneratorRng(seed=1)), valuation, ExposureEngine(), 40
+    )
+    pipeline.run(
+        positions,
+        trades,
+        netting_sets,
+        schema,
+        params,
+        1.0,
+        2,
+        100,
+        progress=lambda done, total: reports.append((done, total)),
+    )
+    assert reports == [(40, 100), (80, 100), (100, 100)]
+
+
+def test_pipeline_mixed_currency_netting_set(
+    positions: list[Position],
+    trades: list[Trade],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that USD and ZAR values are netted only after conversion."""
+    netting_sets = [NettingSet("NS", "CP1", frozenset({"T1", "T2", "T3"}))]
+    exposure = ExposureEngine(quantiles=(0.95,))
+    with pytest.raises(ValueError, match="Netting set 'NS' mixes values in USD, ZAR"):
+        ExposurePipeline(MarketGenerator(), valuation, exposure).run(
+            positions, trades, netting_sets, schema, params, 1.0, 4, 100
+        )
+
+    pipeline = ExposurePipeline(
+        MarketGenerator(GeneratorRng(seed=3)),
+        valuation,
+        exposure,
+        chunk_size=32,
+        reporting_currency=Currency.USD,
+    )
+    profiles = pipeline.run(
+        positions, trades, netting_sets, schema, params, 1.0, 4, 100
+    )
+
+    env = MarketGenerator(GeneratorRng(seed=3)).generate(schema, params, 1.0, 4, 100)
+    cube = valuation.value(positions, env)
+    cube[2] /= env.state_tensor[:, :, schema.get_index("USDZAR")]
+    expected = exposure.position_profiles(
+        cube, ["P1", "P2", "P3"], trades, netting_sets, env.times
+    )
+    assert np.allclose(profiles.ee, expected.ee)
+    assert np.allclose(profiles.pfe, expected.pfe)
+
+
+class _FailingGenerator(MarketGenerator):
+    """Simulates two chunks, then fails."""
+
+    calls = 0
+
+    def _fill(self, *args: Any, **kwargs: Any) -> None:
+        self.calls += 1
+        if self.calls > 2:
+            raise RuntimeError("simulation failed")
+        super()._fill(*args, **kwargs)
+
+
+def test_pipeline_propagates_stage_errors(
+    positions: list[Position],
+    trades: list[Trade],
+    netting_sets: list[NettingSet],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that a failing stage stops the run and re-raises its error."""
+    pipeline = ExposurePipeline(
+        _FailingGenerator(GeneratorRng(seed=1)),
+        valuation,
+        ExposureEngine(),
+        chunk_size=10,
+        queue_size=1,
+    )
+    with pytest.raises(RuntimeError, match="simulation failed"):
+        pipeline.run(positions, trades, netting_sets, schema, params, 1.0, 4, 100)
+
+
+def test_pipeline_missing_rate(
+    positions: list[Position],
+    trades: list[Trade],
+    netting_sets: list[NettingSet],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+) -> None:
+    """Test that valuation errors surface from the value stage."""
+    valuation = ValuationEngine(
+        ValuationParameters(
+            valuation_date=VALUATION_DATE,
+            rates={Currency.USD: 0.05},
+            volatilities={"AAPL": 0.25},
+        )
+    )
+    pipeline = ExposurePipeline(
+        MarketGenerator(GeneratorRng(seed=1)), valuation, ExposureEngine(), 10
+    )
+    with pytest.raises(KeyError, match="No interest rate supplied for currency 'ZAR'"):
+        pipeline.run(positions, trades, netting_sets, schema, params, 1.0, 4, 100)
+
+
+def test_pipeline_invalid_options(valuation: ValuationEngine) -> None:
+    """Test ValueError for non-positive chunk or queue sizes."""
+    with pytest.raises(ValueError, match="must be positive"):
+        ExposurePipeline(MarketGenerator(), valuation, ExposureEngine(), chunk_size=0)
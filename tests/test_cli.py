@@ -0,0 +1,279 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from skans.cli import ModelConfig, main
+
+CONFIG = {
+    "valuation_date": "2025-01-01",
+    "horizon": 1.0,
+    "rates": {"USD": 0.02},
+    "volatilities": {"AAPL": 0.25},
+    "factors": {
+        "AAPL": {"spot": 100.0, "drift": 0.0, "volatility": 0.25},
+        "MSFT": {"spot": 300.0, "drift": 0.0, "volatility": 0.2},
+    },
+    "correlations": [["AAPL", "MSFT", 0.5]],
+    "quantiles": [0.95, 0.99],
+}
+
+
+@pytest.fixture
+def inputs(tmp_path: Path) -> dict[str, Path]:
+    paths = {
+        name: tmp_path / f"{name}.csv" for name in ("positions", "trades", "netting")
+    }
+    pd.DataFrame(
+        {
+            "position_id": ["P1", "P2"],
+            "instrument_type": ["EquityOption", "EquityForward"],
+            "strike": [100.0, 300.0],
+            "maturity_date": ["2025-07-02", "2026-01-01"],
+            "underlying_id": ["AAPL", "MSFT"],
+            "currency": ["USD", "USD"],
+            "base_currency": [None, None],
+            "quote_currency": [None, None],
+            "option_type": ["CALL", None],
+        }
+    ).to_csv(paths["positions"], index=False)
+    pd.DataFrame(
+        {
+            "trade_id": ["T1", "T2"],
+            "position_id": ["P1", "P2"],
+            "counterparty_id": ["C1", "C1"],
+            "quantity": [10.0, 1.0],
+            "direction": ["LONG", "SHORT"],
+        }
+    ).to_csv(paths["trades"], index=False)
+    pd.DataFrame(
+        {
+            "netting_set_id": ["NS1", "NS1", "NS2"],
+            "counterparty_id": ["C1", "C1", "C1"],
+            "trade_id": ["T1", "T2", "T2"],
+        }
+    ).to_csv(paths["netting"], index=False)
+    paths["config"] = tmp_path / "model.json"
+    paths["config"].write_text(json.dumps(CONFIG))
+    return paths
+
+
+def _arguments(inputs: dict[str, Path], output: Path, *extra: str) -> list[str]:
+    return [
+        "run",
+        "--positions",
+        str(inputs["positions"]),
+        "--trades",
+        str(inputs["trades"]),
+        "--netting-sets",
+        str(inputs["netting"]),
+        "--config",
+        str(inputs["config"]),
+        "--output",
+        str(output),
+        "--paths",
+        "300",
+        "--steps",
+        "4",
+        "--chunk-size",
+        "128",
+        "--seed",
+        "7",
+        *extra,
+    ]
+
+
+def test_run_writes_csv_profiles(inputs: dict[str, Path], tmp_path: Path) -> None:
+    """Test that a run writes one row per netting set and time point."""
+    output = tmp_path / "profiles.csv"
+    assert main(_arguments(inputs, output)) == 0
+
+    frame = pd.read_csv(output)
+    assert list(frame.columns) == [
+        "netting_set_id",
+        "time",
+        "ee",
+        "eee",
+        "pfe_0.95",
+        "pfe_0.99",
+        "epe",
+        "eepe",
+    ]
+    assert frame["netting_set_id"].tolist() == ["NS1"] * 5 + ["NS2"] * 5
+    assert frame["time"].tolist()[:5] == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert (frame["eee"] >= frame["ee"]).all()
+    assert (frame["pfe_0.99"] >= frame["pfe_0.95"]).all()
+
+
+def test_run_is_reproducible_across_workers_and_dtypes(
+    inputs: dict[str, Path], tmp_path: Path
+) -> None:
+    """Test that the worker count does not change the seeded profiles."""
+    single, parallel = tmp_path / "single.csv", tmp_path / "parallel.csv"
+    assert main(_arguments(inputs, single)) == 0
+    assert main(_arguments(inputs, parallel, "--workers", "2")) == 0
+    pd.testing.assert_frame_equal(pd.read_csv(single), pd.read_csv(parallel))
+
+    narrow = tmp_path / "narrow.csv"
+    assert main(_arguments(inputs, narrow, "--dtype", "float32")) == 0
+    assert len(pd.read_csv(narrow)) == 10
+
+
+def test_run_on_maturity_grid_with_stage_log(
+    inputs: dict[str, Path], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test the maturity grid, the stage log and progress reporting."""
+    output, stages = tmp_path / "profiles.csv", tmp_path / "stages.jsonl"
+    arguments = _arguments(
+        inputs, output, "--grid", "maturity", "--verbose", "--spill-dir", str(tmp_path)
+    )
+    assert main([*arguments, "--stages", str(stages)]) == 0
+
+    times = pd.read_csv(output)["time"].unique()
+    assert times[-1] == pytest.approx(365 / 365.0)
+    assert pytest.approx(182 / 365.0) in list(times)
+
+    records = [json.loads(line) for line in stages.read_text().splitlines()]
+    assert {"resolve", "simulate", "value", "aggregate"} <= {
+        r["stage"] for r in records
+    }
+    assert "Netted 300/300 paths." in capsys.readouterr().err
+
+
+def test_run_reports_input_errors(
+    inputs: dict[str, Path], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that model errors are reported on stderr with status 1."""
+    config = dict(CONFIG, factors={"AAPL": CONFIG["factors"]["AAPL"]})  # type: ignore
+    inputs["config"].write_text(json.dumps(config))
+
+    assert main(_arguments(inputs, tmp_path / "profiles.csv")) == 1
+    assert "skans: error: Missing S0 for risk factor 'MSFT'." in capsys.readouterr().err
+
+
+def test_run_converts_mixed_currency_netting_sets(
+    inputs: dict[str, Path], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that USD and ZAR trades net only in a reporting currency."""
+    pd.DataFrame(
+        {
+            "position_id": ["P1", "P2"],
+            "instrument_type": ["EquityForward", "FXForward"],
+            "strike": [250.0, 17.0],
+            "maturity_date": ["2026-01-01", "2026-01-01"],
+            "underlying_id": ["MSFT", None],
+            "currency": ["USD", None],
+            "base_currency": [None, "USD"],
+            "quote_currency": [None, "ZAR"],
+            "option_type": [None, None],
+        }
+    ).to_csv(inputs["positions"], index=False)
+    pd.DataFrame(
+        {
+            "trade_id": ["T1", "T2"],
+            "position_id": ["P1", "P2"],
+            "counterparty_id": ["C1", "C1"],
+            "quantity": [1.0, 100.0],
+            "direction": ["LONG", "LONG"],
+        }
+    ).to_csv(inputs["trades"], index=False)
+    netting = pd.DataFrame(
+        {
+            "netting_set_id": ["N", "N", "USD", "ZAR"],
+            "counterparty_id": ["C1"] * 4,
+            "trade_id": ["T1", "T2", "T1", "T2"],
+        }
+    )
+    netting.to_csv(inputs["netting"], index=False)
+    config = dict(
+        CONFIG,
+        rates={"USD": 0.02, "ZAR": 0.07},
+        factors={
+            "MSFT": CONFIG["factors"]["MSFT"],  # type: ignore
+            "USDZAR": {"spot": 18.5, "drift": 0.0, "volatility": 0.15},
+        },
+        correlations=[],
+    )
+    inputs["config"].write_text(json.dumps(config))
+    output = tmp_path / "profiles.csv"
+
+    assert main(_arguments(inputs, output)) == 1
+    assert "Netting set 'N' mixes values in USD, ZAR" in capsys.readouterr().err
+
+    netting[netting["netting_set_id"] != "N"].to_csv(inputs["netting"], index=False)
+    assert main(_arguments(inputs, output)) == 0
+    zar = pd.read_csv(output).query("netting_set_id == 'ZAR'")["ee"].iloc[0]
+
+    netting.to_csv(inputs["netting"], index=False)
+    inputs["config"].write_text(json.dumps(dict(config, reporting_currency="USD")))
+    assert main(_arguments(inputs, output)) == 0
+    ee = pd.read_csv(output).groupby("netting_set_id")["ee"].first()
+    assert ee["ZAR"] == pytest.approx(zar / 18.5)
+    assert ee["N"] == pytest.approx(ee["USD"] + ee["ZAR"])
+
+
+def test_invalid_arguments_exit_with_usage(
+    inputs: dict[str, Path], tmp_path: Path
+) -> None:
+    """Test that argument errors exit through argparse."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(["run", "--positions", "p.csv"])
+    assert exit_info.value.code == 2
+
+    with pytest.raises(SystemExit):
+        main(_arguments(inputs, tmp_path / "profiles.txt"))
+    with pytest.raises(SystemExit):
+        main(_arguments(inputs, tmp_path / "profiles.csv", "--workers", "0"))
+
+
+def test_parquet_output_checks_pyarrow_first(
+    inputs: dict[str, Path],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that a missing pyarrow is reported before any work is done."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(SystemExit):
+        main(_arguments(inputs, tmp_path / "profiles.parquet"))
+    assert "pip install skans[parquet]" in capsys.readouterr().err
+    assert not (tmp_path / "profiles.parquet").exists()
+
+
+def test_model_config_validation() -> None:
+    """Test that missing and malformed config values raise ValueError."""
+    config = ModelConfig.from_dict(CONFIG)
+    assert config.correlations == (("AAPL", "MSFT", 0.5),)
+    assert config.epe_horizon == 1.0
+    assert config.reporting_currency is None
+    assert (
+        ModelConfig.from_dict(dict(CONFIG, reporting_currency="ZAR")).reporting_currency
+        == "ZAR"
+    )
+
+    with pytest.raises(ValueError, match="missing 'rates'"):
+        ModelConfig.from_dict({k: v for k, v in CONFIG.items() if k != "rates"})
+    with pytest.raises(ValueError, match="Malformed"):
+        ModelConfig.from_dict(dict(CONFIG, valuation_date="01/01/2025"))
+
+
+def test_help_does_not_import_numerical_stack() -> None:
+    """Test that the entry point loads without NumPy, pandas or SciPy."""
+    script = (
+        "import sys, skans.cli; "
+        "print(sorted({'numpy', 'pandas', 'scipy'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+    result = subprocess.run(
+        [sys.executable, "-m", "skans", "run", "--help"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0 and "--chunk-size" in result.stdout
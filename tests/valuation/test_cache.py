@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from skans.valuation.cache import ValuationCache
+
+
+def _key(name: str) -> tuple[str, str, str]:
+    return name, "env", "params"
+
+
+def test_cache_get_put_and_stats() -> None:
+    """Test round-trips and hit/miss accounting."""
+    cache = ValuationCache(max_bytes=1024)
+    assert cache.get(_key("A")) is None
+
+    cache.put(_key("A"), np.ones((2, 3)))
+    cached = cache.get(_key("A"))
+    assert cached is not None and np.array_equal(cached, np.ones((2, 3)))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.nbytes == 48
+
+
+def test_cache_stores_read_only_copies() -> None:
+    """Test that cached arrays are detached from and immune to the caller."""
+    cache = ValuationCache(max_bytes=1024)
+    values = np.zeros(4)
+    cache.put(_key("A"), values)
+    values[0] = 1.0
+
+    cached = cache.get(_key("A"))
+    assert cached is not None and cached[0] == 0.0
+    with pytest.raises(ValueError, match="read-only"):
+        cached[0] = 2.0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test LRU eviction once the memory budget is exceeded."""
+    cache = ValuationCache(max_bytes=3 * 80)
+    for name in "ABC":
+        cache.put(_key(name), np.zeros(10))
+    cache.get(_key("A"))
+    cache.put(_key("D"), np.zeros(10))
+
+    assert _key("B") not in cache
+    assert all(_key(name) in cache for name in "ACD")
+    assert cache.nbytes == 240
+
+
+def test_cache_skips_oversized_and_replaces() -> None:
+    """Test that oversized arrays are not stored and re-puts replace entries."""
+    cache = ValuationCache(max_bytes=80)
+    cache.put(_key("A"), np.zeros(11))
+    assert len(cache) == 0
+
+    cache.put(_key("A"), np.zeros(5))
+    cache.put(_key("A"), np.ones(10))
+    assert len(cache) == 1 and cache.nbytes == 80
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_cache_invalid_budget() -> None:
+    """Test ValueError for a negative memory budget."""
+    with pytest.raises(ValueError, match="non-negative"):
+        ValuationCache(max_bytes=-1)
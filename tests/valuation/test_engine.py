@@ -0,0 +1,246 @@
+from datetime import date
+import pytest
+import numpy as np
+from skans.domain.portfolio import Position
+from skans.domain.instruments import EquityForward, EquityOption, FXForward, FXOption
+from skans.domain.types.enums import Currency, OptionType
+from skans.market.book import BookCompiler
+from skans.market.environment import MarketEnvironment, RiskFactorSchema
+from skans.valuation.cache import ValuationCache
+from skans.valuation.engine import ValuationEngine, ValuationParameters
+from skans.valuation.pricers import black_scholes_value, forward_value
+
+VALUATION_DATE = date(2025, 1, 1)
+MATURITY = date(2026, 1, 1)
+
+
+@pytest.fixture
+def params() -> ValuationParameters:
+    return ValuationParameters(
+        valuation_date=VALUATION_DATE,
+        rates={Currency.USD: 0.05, Currency.ZAR: 0.08},
+        volatilities={"AAPL": 0.25, "USDZAR": 0.15},
+        dividend_yields={"AAPL": 0.01},
+    )
+
+
+@pytest.fixture
+def env() -> MarketEnvironment:
+    schema = RiskFactorSchema(factor_indices={"AAPL": 0, "USDZAR": 1})
+    state = np.empty((3, 5, 2))
+    state[:, :, 0] = np.linspace(140.0, 160.0, 15).reshape(3, 5)
+    state[:, :, 1] = np.linspace(17.0, 20.0, 15).reshape(3, 5)
+    return MarketEnvironment(schema=schema, state_tensor=state, dt=0.5)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position(
+            "P1", EquityOption("AAPL", 150.0, MATURITY, Currency.USD, OptionType.PUT)
+        ),
+        Position("P2", FXForward(Currency.USD, Currency.ZAR, 18.0, MATURITY)),
+        Position("P3", EquityForward("AAPL", 145.0, MATURITY, Currency.USD)),
+        Position(
+            "P4", FXOption(Currency.USD, Currency.ZAR, 19.0, MATURITY, OptionType.CALL)
+        ),
+    ]
+
+
+def test_value_cube_shape_and_order(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test that the cube is (positions, paths, steps + 1) in input order."""
+    cube = ValuationEngine(params).value(positions, env)
+    assert cube.shape == (4, 3, 5)
+
+    tau = (MATURITY - VALUATION_DATE).days / 365.0 - env.times
+    S_eq = env.state_tensor[:, :, 0]
+    S_fx = env.state_tensor[:, :, 1]
+
+    expected_put = black_scholes_value(
+        S_eq,
+        np.array(150.0),
+        tau,
+        np.array(0.05),
+        np.array(0.01),
+        np.array(0.25),
+        np.array(-1.0),
+    )
+    expected_fx_fwd = forward_value(
+        S_fx, np.array(18.0), tau, np.array(0.08), np.array(0.05)
+    )
+    expected_eq_fwd = forward_value(
+        S_eq, np.array(145.0), tau, np.array(0.05), np.array(0.01)
+    )
+    expected_fx_call = black_scholes_value(
+        S_fx,
+        np.array(19.0),
+        tau,
+        np.array(0.08),
+        np.array(0.05),
+        np.array(0.15),
+        np.array(1.0),
+    )
+    assert np.allclose(cube[0], expected_put)
+    assert np.allclose(cube[1], expected_fx_fwd)
+    assert np.allclose(cube[2], expected_eq_fwd)
+    assert np.allclose(cube[3], expected_fx_call)
+
+
+def test_value_is_zero_after_maturity(
+    params: ValuationParameters, env: MarketEnvironment
+) -> None:
+    """Test that settled positions contribute nothing after maturity."""
+    position = Position(
+        "P1", EquityForward("AAPL", 145.0, date(2025, 7, 1), Currency.USD)
+    )
+    cube = ValuationEngine(params).value([position], env)
+
+    # Maturity falls between t = 0 and t = 0.5 years
+    assert np.all(cube[0, :, 1:] == 0.0)
+    assert np.all(cube[0, :, 0] != 0.0)
+
+
+def test_value_missing_factor(
+    params: ValuationParameters, env: MarketEnvironment
+) -> None:
+    """Test KeyError when a position's factor was not simulated."""
+    position = Position("P1", EquityForward("MSFT", 300.0, MATURITY, Currency.USD))
+    with pytest.raises(KeyError, match="Risk factor 'MSFT' not present"):
+        ValuationEngine(params).value([position], env)
+
+
+def test_value_missing_volatility(env: MarketEnvironment) -> None:
+    """Test KeyError when an option's factor has no volatility."""
+    params = ValuationParameters(
+        valuation_date=VALUATION_DATE, rates={Currency.USD: 0.05}
+    )
+    position = Position(
+        "P1", EquityOption("AAPL", 150.0, MATURITY, Currency.USD, OptionType.CALL)
+    )
+    with pytest.raises(KeyError, match="No volatility supplied for risk factor 'AAPL'"):
+        ValuationEngine(params).value([position], env)
+
+
+def test_value_unsupported_instrument(
+    params: ValuationParameters, env: MarketEnvironment
+) -> None:
+    """Test TypeError for unknown instrument types."""
+
+    class UnsupportedInstrument:
+        pass
+
+    position = Position("FAIL", UnsupportedInstrument())  # type: ignore
+    with pytest.raises(TypeError, match="Unsupported instrument type"):
+        ValuationEngine(params).value([position], env)
+
+
+def test_value_precompiled_book(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test that a precompiled book prices identically to raw positions."""
+    book = BookCompiler().compile(positions, env.schema, VALUATION_DATE)
+    engine = ValuationEngine(params)
+
+    assert np.array_equal(engine.value(book, env), engine.value(positions, env))
+
+
+def test_value_book_schema_mismatch(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test ValueError when a book was compiled against another schema."""
+    schema = RiskFactorSchema(factor_indices={"USDZAR": 0, "AAPL": 1})
+    book = BookCompiler().compile(positions, schema, VALUATION_DATE)
+
+    with pytest.raises(ValueError, match="different risk factor schema"):
+        ValuationEngine(params).value(book, env)
+
+
+def test_to_currency_converts_with_simulated_fx(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test conversion through the direct and the inverse simulated FX pair."""
+    book = BookCompiler().compile(positions, env.schema, VALUATION_DATE)
+    engine = ValuationEngine(params)
+    cube = engine.value(book, env)
+    usdzar = env.state_tensor[:, :, 1]
+
+    in_usd = engine.to_currency(cube.copy(), book, env, Currency.USD)
+    assert np.array_equal(in_usd[[0, 2]], cube[[0, 2]])
+    assert np.allclose(in_usd[[1, 3]], cube[[1, 3]] / usdzar)
+
+    in_zar = engine.to_currency(cube.copy(), book, env, Currency.ZAR)
+    assert np.allclose(in_zar[[0, 2]], cube[[0, 2]] * usdzar)
+    assert np.array_equal(in_zar[[1, 3]], cube[[1, 3]])
+
+
+def test_to_currency_missing_fx_factor(params: ValuationParameters) -> None:
+    """Test KeyError when no FX pair links a pricing and reporting currency."""
+    schema = RiskFactorSchema(factor_indices={"AAPL": 0})
+    env = MarketEnvironment(schema=schema, state_tensor=np.ones((2, 3, 1)), dt=0.5)
+    position = Position("P1", EquityForward("AAPL", 1.0, MATURITY, Currency.ZAR))
+    book = BookCompiler().compile([position], schema, VALUATION_DATE)
+    engine = ValuationEngine(params)
+
+    with pytest.raises(KeyError, match="neither ZARUSD nor USDZAR is simulated"):
+        engine.to_currency(engine.value(book, env), book, env, Currency.USD)
+    with pytest.raises(ValueError, match="does not match 1 positions"):
+        engine.to_currency(np.ones((2, 2, 3)), book, env, Currency.USD)
+
+
+def test_value_missing_rate(env: MarketEnvironment) -> None:
+    """Test KeyError when a pricing currency has no rate."""
+    params = ValuationParameters(
+        valuation_date=VALUATION_DATE, rates={Currency.USD: 0.05}
+    )
+    position = Position("P1", FXForward(Currency.USD, Currency.ZAR, 18.0, MATURITY))
+    with pytest.raises(KeyError, match="No interest rate supplied for currency 'ZAR'"):
+        ValuationEngine(params).value([position], env)
+
+
+def test_value_with_cache_prices_only_new_instruments(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test that cached runs match uncached ones and reprice only misses."""
+    cache = ValuationCache(max_bytes=1 << 20)
+    engine = ValuationEngine(params, cache=cache)
+    expected = ValuationEngine(params).value(positions, env)
+
+    assert np.array_equal(engine.value(positions, env), expected)
+    assert len(cache) == 4
+
+    amended = positions[:3] + [
+        Position("P5", EquityForward("AAPL", 150.0, MATURITY, Currency.USD))
+    ]
+    hits = cache.hits
+    cube = engine.value(amended, env)
+
+    assert cache.hits - hits == 3
+    assert len(cache) == 5
+    assert np.array_equal(cube[:3], expected[:3])
+    assert np.array_equal(cube[3], ValuationEngine(params).value(amended, env)[3])
+
+
+def test_value_cache_keys_on_environment_and_parameters(
+    params: ValuationParameters, env: MarketEnvironment, positions: list[Position]
+) -> None:
+    """Test that a changed environment or parameter set misses the cache."""
+    cache = ValuationCache(max_bytes=1 << 20)
+    ValuationEngine(params, cache=cache).value(positions, env)
+
+    bumped_env = MarketEnvironment(
+        schema=env.schema, state_tensor=env.state_tensor * 1.01, dt=env.dt
+    )
+    bumped_params = ValuationParameters(
+        valuation_date=VALUATION_DATE,
+        rates={Currency.USD: 0.06, Currency.ZAR: 0.08},
+        volatilities=params.volatilities,
+        dividend_yields=params.dividend_yields,
+    )
+    cube = ValuationEngine(bumped_params, cache=cache).value(positions, bumped_env)
+
+    assert len(cache) == 8
+    assert np.array_equal(
+        cube, ValuationEngine(bumped_params).value(positions, bumped_env)
+    )
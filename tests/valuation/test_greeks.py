@@ -0,0 +1,201 @@
+from datetime import date
+import pytest
+import numpy as np
+from skans.core.rng import GeneratorRng
+from skans.domain.portfolio import Position
+from skans.domain.instruments import EquityForward, EquityOption, FXOption
+from skans.domain.types.enums import Currency, OptionType
+from skans.market.environment import RiskFactorSchema
+from skans.market.generator import GBMParameters, MarketGenerator
+from skans.market.resolver import DependencyResolver
+from skans.valuation.engine import ValuationEngine, ValuationParameters
+from skans.valuation.greeks import GreeksEngine, GreeksMethod
+from skans.valuation.pricers import black_scholes_delta
+
+VALUATION_DATE = date(2025, 1, 1)
+MATURITY = date(2026, 1, 1)
+RATE = 0.05
+N_STEPS = 4
+TIMES = np.linspace(0.0, 1.0, N_STEPS + 1)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position(
+            "P1", EquityOption("AAPL", 100.0, MATURITY, Currency.USD, OptionType.CALL)
+        ),
+        Position("P2", EquityForward("MSFT", 100.0, MATURITY, Currency.USD)),
+        Position(
+            "P3", EquityOption("MSFT", 110.0, MATURITY, Currency.USD, OptionType.PUT)
+        ),
+    ]
+
+
+@pytest.fixture
+def schema(positions: list[Position]) -> RiskFactorSchema:
+    return DependencyResolver().resolve(positions)
+
+
+@pytest.fixture
+def params(schema: RiskFactorSchema) -> GBMParameters:
+    # Risk-neutral drift, so E[V(t)] = V(0) * exp(r t) and so is its delta
+    return GBMParameters.from_schema(
+        schema,
+        S0={"AAPL": 100.0, "MSFT": 100.0},
+        mu={"AAPL": RATE, "MSFT": RATE},
+        sigma={"AAPL": 0.2, "MSFT": 0.3},
+        correlation=np.array([[1.0, 0.5], [0.5, 1.0]]),
+    )
+
+
+@pytest.fixture
+def valuation() -> ValuationEngine:
+    return ValuationEngine(
+        ValuationParameters(
+            valuation_date=VALUATION_DATE,
+            rates={Currency.USD: RATE},
+            volatilities={"AAPL": 0.2, "MSFT": 0.3},
+        )
+    )
+
+
+def _expected_deltas() -> np.ndarray:
+    def delta(K: float, sigma: float, omega: float) -> np.ndarray:
+        return black_scholes_delta(
+            np.array(100.0),
+            np.array(K),
+            np.array(1.0),
+            np.array(RATE),
+            np.array(0.0),
+            np.array(sigma),
+            np.array(omega),
+        )
+
+    at_zero = np.array([delta(100.0, 0.2, 1.0), 1.0, delta(110.0, 0.3, -1.0)])
+    return at_zero[:, None] * np.exp(RATE * TIMES)
+
+
+@pytest.mark.parametrize("method", list(GreeksMethod))
+def test_deltas_match_closed_form(
+    method: GreeksMethod,
+    positions: list[Position],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test every estimator against the risk-neutral closed-form profile."""
+    engine = GreeksEngine(MarketGenerator(GeneratorRng(seed=11)), valuation, method)
+    greeks = engine.compute(positions, schema, params, 1.0, N_STEPS, 50_000)
+
+    assert greeks.position_ids == ("P1", "P2", "P3")
+    assert greeks.delta.shape == (3, N_STEPS + 1)
+    assert np.allclose(greeks.times, TIMES)
+    tolerance = 0.03 if method is GreeksMethod.LIKELIHOOD_RATIO else 0.01
+    assert np.allclose(greeks.delta, _expected_deltas(), atol=tolerance)
+
+
+@pytest.mark.parametrize("method", list(GreeksMethod))
+def test_greeks_on_non_uniform_grid(
+    method: GreeksMethod,
+    positions: list[Position],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that every estimator reports and uses an explicit time grid."""
+    times = np.array([0.0, 1 / 365, 0.25, 1.0])
+    engine = GreeksEngine(MarketGenerator(GeneratorRng(seed=3)), valuation, method)
+    greeks = engine.compute(positions, schema, params, 1.0, 3, 20_000, times)
+
+    assert np.array_equal(greeks.times, times)
+    forward_delta = np.exp(RATE * times)
+    tolerance = 0.05 if method is GreeksMethod.LIKELIHOOD_RATIO else 0.01
+    assert np.allclose(greeks.delta[1], forward_delta, atol=tolerance)
+
+
+def test_pathwise_vega_matches_bump_and_revalue(
+    positions: list[Position],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that pathwise and CRN bump vegas agree on the same normals."""
+
+    def greeks(method: GreeksMethod) -> np.ndarray:
+        engine = GreeksEngine(
+            MarketGenerator(GeneratorRng(seed=5)), valuation, method, bump=1e-4
+        )
+        vega = engine.compute(positions, schema, params, 1.0, N_STEPS, 5_000).vega
+        assert vega is not None
+        return vega
+
+    pathwise = greeks(GreeksMethod.PATHWISE)
+    bumped = greeks(GreeksMethod.BUMP_AND_REVALUE)
+    assert np.allclose(pathwise, bumped, rtol=1e-3, atol=1e-3)
+    assert np.all(pathwise[:, 0] == 0.0)
+
+
+def test_bump_and_revalue_is_noise_free(
+    positions: list[Position],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that common random numbers make the forward delta exact."""
+    engine = GreeksEngine(
+        MarketGenerator(GeneratorRng(seed=5)),
+        valuation,
+        GreeksMethod.BUMP_AND_REVALUE,
+    )
+    greeks = engine.compute(positions, schema, params, 1.0, N_STEPS, 100)
+
+    # The forward is linear in S0: with shared normals the difference is exact
+    path_mean_growth = greeks.value[1] + 100.0 * np.exp(-RATE * (1.0 - TIMES))
+    assert np.allclose(greeks.delta[1], path_mean_growth / 100.0)
+
+
+def test_likelihood_ratio_has_no_vega(
+    positions: list[Position],
+    schema: RiskFactorSchema,
+    params: GBMParameters,
+    valuation: ValuationEngine,
+) -> None:
+    """Test that the likelihood-ratio estimator reports delta only."""
+    engine = GreeksEngine(
+        MarketGenerator(GeneratorRng(seed=1)),
+        valuation,
+        GreeksMethod.LIKELIHOOD_RATIO,
+    )
+    assert engine.compute(positions, schema, params, 1.0, 2, 100).vega is None
+
+
+def test_fx_position_greeks(valuation: ValuationEngine) -> None:
+    """Test that FX options use the pair's own factor for their Greeks."""
+    position = Position(
+        "FX1", FXOption(Currency.USD, Currency.ZAR, 18.0, MATURITY, OptionType.CALL)
+    )
+    schema = RiskFactorSchema(factor_indices={"AAPL": 0, "USDZAR": 1})
+    params = GBMParameters.from_schema(
+        schema,
+        S0={"AAPL": 100.0, "USDZAR": 18.0},
+        mu={"AAPL": 0.0, "USDZAR": 0.0},
+        sigma={"AAPL": 0.2, "USDZAR": 0.15},
+    )
+    fx_valuation = ValuationEngine(
+        ValuationParameters(
+            valuation_date=VALUATION_DATE,
+            rates={Currency.USD: 0.05, Currency.ZAR: 0.05},
+            volatilities={"USDZAR": 0.15},
+        )
+    )
+    engine = GreeksEngine(MarketGenerator(GeneratorRng(seed=2)), fx_valuation)
+    greeks = engine.compute([position], schema, params, 1.0, 2, 20_000)
+    assert 0.0 < greeks.delta[0, 0] < 1.0
+    assert greeks.vega is not None and greeks.vega[0, -1] > 0.0
+
+
+def test_invalid_bump(valuation: ValuationEngine) -> None:
+    """Test ValueError for a non-positive bump size."""
+    with pytest.raises(ValueError, match="Bump size must be positive"):
+        GreeksEngine(MarketGenerator(), valuation, bump=0.0)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from skans.valuation.pricers import (
+    black_scholes_delta,
+    black_scholes_value,
+    forward_delta,
+    forward_value,
+)
+
+
+def test_black_scholes_reference_value() -> None:
+    value = black_scholes_value(
+        np.array(100.0),
+        np.array(100.0),
+        np.array(1.0),
+        np.array(0.05),
+        np.array(0.0),
+        np.array(0.2),
+        np.array(1.0),
+    )
+    assert np.isclose(value, 10.450583572185565)
+
+
+def test_black_scholes_put_call_parity() -> None:
+    S = np.linspace(50.0, 150.0, 11)
+    K, tau, r, q, sigma = 100.0, 0.75, 0.03, 0.01, 0.25
+    args = (np.array(K), np.array(tau), np.array(r), np.array(q), np.array(sigma))
+
+    call = black_scholes_value(S, *args, np.array(1.0))
+    put = black_scholes_value(S, *args, np.array(-1.0))
+    parity = S * np.exp(-q * tau) - K * np.exp(-r * tau)
+    assert np.allclose(call - put, parity)
+
+
+def test_black_scholes_at_and_after_maturity() -> None:
+    tau = np.array([0.0, -0.5])
+    value = black_scholes_value(
+        np.array(120.0),
+        np.array(100.0),
+        tau,
+        np.array(0.05),
+        np.array(0.0),
+        np.array(0.2),
+        np.array(1.0),
+    )
+    assert np.array_equal(value, [20.0, 0.0])
+
+
+def test_forward_value() -> None:
+    tau = np.array([1.0, 0.0, -1.0])
+    value = forward_value(
+        np.array(100.0), np.array(95.0), tau, np.array(0.05), np.array(0.02)
+    )
+    expected = 100.0 * np.exp(-0.02) - 95.0 * np.exp(-0.05)
+    assert np.allclose(value, [expected, 5.0, 0.0])
+
+
+def test_deltas_match_finite_differences() -> None:
+    S = np.linspace(60.0, 140.0, 9)
+    K, tau, r, q, sigma = (np.array(x) for x in (100.0, 0.5, 0.04, 0.02, 0.3))
+    h = 1e-4
+
+    for omega in (np.array(1.0), np.array(-1.0)):
+        bumped = black_scholes_value(S + h, K, tau, r, q, sigma, omega)
+        base = black_scholes_value(S - h, K, tau, r, q, sigma, omega)
+        delta = black_scholes_delta(S, K, tau, r, q, sigma, omega)
+        assert np.allclose(delta, (bumped - base) / (2 * h), atol=1e-6)
+
+    fd = (forward_value(S + h, K, tau, r, q) - forward_value(S - h, K, tau, r, q)) / (
+        2 * h
+    )
+    assert np.allclose(forward_delta(S, K, tau, r, q), fd)
+
+
+def test_deltas_at_and_after_maturity() -> None:
+    S = np.array([90.0, 110.0])
+    args = (np.array(100.0), np.array(0.05), np.array(0.0), np.array(0.2))
+    K, r, q, sigma = args
+
+    at_maturity = black_scholes_delta(S, K, np.array(0.0), r, q, sigma, np.array(1.0))
+    assert np.array_equal(at_maturity, [0.0, 1.0])
+    expired = black_scholes_delta(S, K, np.array(-0.1), r, q, sigma, np.array(-1.0))
+    assert np.array_equal(expired, [0.0, 0.0])
+    assert np.array_equal(forward_delta(S, K, np.array(-0.1), r, q), [0.0, 0.0])